@@ -4,6 +4,10 @@ Script para rodar o servidor Taskni Core.
 Similar ao run_service.py do toolkit, mas específico para o Taskni Core.
 """
 
+import logging
+import logging.handlers
+import queue
+
 import uvicorn
 
 from taskni_core.core.settings import taskni_settings
@@ -13,17 +17,33 @@ def main():
     """Roda o servidor Taskni Core."""
     reload = taskni_settings.is_dev()
 
+    # LOG_LEVEL controla os logs dos agentes (DEBUG mostra o passo a passo).
+    # Os logs passam por uma fila: a escrita no stdout acontece na thread do
+    # QueueListener, sem bloquear o event loop que atende as requisições.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    logging.basicConfig(
+        level=taskni_settings.LOG_LEVEL.upper(),
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+    )
+
     print(f"🚀 Iniciando Taskni Core em {taskni_settings.HOST}:{taskni_settings.PORT}")
     print(f"📝 Modo: {'desenvolvimento' if reload else 'produção'}")
     print(f"🔗 Docs: http://{taskni_settings.HOST}:{taskni_settings.PORT}/docs")
 
-    uvicorn.run(
-        "taskni_core.main:app",
-        host=taskni_settings.HOST,
-        port=taskni_settings.PORT,
-        reload=reload,
-        log_level=taskni_settings.LOG_LEVEL.lower(),
-    )
+    try:
+        uvicorn.run(
+            "taskni_core.main:app",
+            host=taskni_settings.HOST,
+            port=taskni_settings.PORT,
+            reload=reload,
+            log_level=taskni_settings.LOG_LEVEL.lower(),
+        )
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -3,30 +3,171 @@ Followup Agent - Agente de acompanhamento e reativação.
 
 Usa LangGraph para implementar um workflow de:
 1. detect_intent: Detecta a intenção baseado no contexto
-2. generate_message: Gera mensagem personalizada usando LLM
-3. schedule_send: Prepara para envio (simulado por enquanto)
+2. Em paralelo (ambos só dependem da intenção):
+   - generate_message: Gera mensagem personalizada usando LLM
+   - schedule_send: Prepara para envio (simulado por enquanto)
 
 Este é um agente AVANÇADO (usa LangGraph completo).
 """
 
-from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, TypedDict
-
+import asyncio
+import functools
+import hashlib
+import logging
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
+from pydantic import ValidationError
 
-from taskni_core.core.llm_provider import MultiProviderLLM
+from taskni_core.core.llm_batching import BatchedLLMClient, get_shared_batched_llm
+from taskni_core.core.llm_provider import response_text
 from taskni_core.core.settings import taskni_settings
+from taskni_core.schema.agent_inputs import FollowupInput
+from taskni_core.utils.async_utils import run_sync
+from taskni_core.utils.query_cache import QueryCache
 from taskni_core.utils.security import sanitize_prompt_input
 
-if TYPE_CHECKING:
-    from taskni_core.schema.agent_inputs import FollowupInput
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Prompt Templates
+# ============================================================================
+
+# Instruções específicas por intenção (estáticas, montadas uma única vez)
+_INTENT_INSTRUCTIONS: dict[str, str] = {
+    "reativacao": """
+CONTEXTO: Paciente está inativo há algum tempo.
+OBJETIVO: Reativar de forma suave e amigável.
+TOM: Saudoso mas não insistente.
+EXEMPLO: "Oi [nome]! Sentimos sua falta por aqui 😊 Que tal agendar um check-up? Estamos à disposição!"
+""",
+    "pos_consulta": """
+CONTEXTO: Acompanhamento após consulta recente.
+OBJETIVO: Verificar como está e oferecer suporte.
+TOM: Cuidadoso e atencioso.
+EXEMPLO: "Olá [nome]! Como você está se sentindo após a consulta? Qualquer dúvida, estamos aqui! 🩺"
+""",
+    "abandono": """
+CONTEXTO: Paciente iniciou agendamento mas não completou.
+OBJETIVO: Ajudar a concluir o agendamento.
+TOM: Prestativo e facilitador.
+EXEMPLO: "Oi [nome]! Vi que você teve interesse em agendar. Posso ajudar a encontrar um horário? 😊"
+""",
+    "lead_frio": """
+CONTEXTO: Lead antigo que nunca agendou.
+OBJETIVO: Reativar com oferta de valor.
+TOM: Acolhedor e informativo.
+EXEMPLO: "Oi [nome]! Ainda podemos ajudar com seu atendimento. Temos horários disponíveis esta semana!"
+""",
+    "checagem_retorno": """
+CONTEXTO: Paciente precisa de retorno após procedimento.
+OBJETIVO: Lembrar da importância do retorno.
+TOM: Profissional e cuidadoso.
+EXEMPLO: "Olá [nome]! Está na hora de agendar seu retorno. É importante para acompanharmos sua evolução! 🩺"
+""",
+    "agendar_consulta": """
+CONTEXTO: Consulta de rotina está atrasada.
+OBJETIVO: Incentivar check-up preventivo.
+TOM: Amigável e preventivo.
+EXEMPLO: "Oi [nome]! Que tal um check-up? Cuidar da saúde preventivamente é sempre melhor! 😊"
+""",
+}
+
+_DEFAULT_INTENT = "reativacao"
+
+# Intenções que exigem mais raciocínio vão para o modelo maior; as demais
+# (mensagens curtas e bem padronizadas) usam o modelo pequeno
+_COMPLEX_INTENTS = frozenset({"checagem_retorno", "agendar_consulta"})
+
+# Palavras-chave de abandono de agendamento (um único scan em C via regex)
+_ABANDONO_RE = re.compile(r"agendar|consulta|horário|disponibilidade", re.IGNORECASE)
+
+# Regras de agendamento: intent -> (dias a somar, hora do envio, rolar se já passou)
+# "abandono" é tratado à parte (daqui 2 horas)
+_SCHEDULE_RULES: dict[str, tuple[int, int, bool]] = {
+    "pos_consulta": (1, 10, False),  # Próxima manhã às 10h
+    "lead_frio": (1, 16, False),  # Amanhã às 16h
+    "checagem_retorno": (1, 10, False),  # Amanhã às 10h
+    "agendar_consulta": (0, 18, True),  # Hoje às 18h (ou amanhã se já passou)
+    "reativacao": (0, 18, True),  # Hoje às 18h (ou amanhã se já passou)
+}
+
+# Template do prompt do usuário (formatado com str.format)
+_USER_PROMPT_TEMPLATE = """Crie uma mensagem de followup para:
+
+Nome do paciente: {patient_name}
+Dias sem contato: {days_inactive}
+Tipo de estabelecimento: {clinic_type}
+Serviço principal: {service}
+Tom desejado: {tone}
+Intenção: {intent}
+
+Lembre-se: mensagem CURTA (2-3 linhas máximo), natural como WhatsApp, e com call-to-action suave.
+
+Mensagem:"""
+
+
+@functools.lru_cache(maxsize=256)
+def _sanitize_label(text: str, max_length: int) -> str:
+    """
+    Versão memoizada de sanitize_prompt_input, só para rótulos.
+
+    clinic_type, service, tone e intent se repetem muito entre pacientes,
+    então a sanitização vira um lookup de dict no caso comum. Texto livre
+    de alta cardinalidade (nome do paciente) não passa por aqui: o hit rate
+    seria quase zero e o cache guardaria dados pessoais em memória.
+    """
+    return sanitize_prompt_input(text, max_length=max_length)
+
+
+@functools.lru_cache(maxsize=2048)
+def _business_hours_shift(day: date, hour: int) -> tuple[int, bool]:
+    """
+    Calcula o ajuste para horário comercial de um (dia, hora).
+
+    Followups do mesmo lote caem nos mesmos poucos (dia, hora), então a
+    conta de dia da semana roda uma vez por combinação distinta.
+
+    Args:
+        day: Data desejada
+        hour: Hora desejada
+
+    Returns:
+        (dias a somar, se deve mover para 8h em ponto)
+    """
+    days = 0
+
+    # Se for fim de semana, move para segunda-feira
+    weekday = day.weekday()
+    if weekday == 5:  # Sábado
+        days = 2
+    elif weekday == 6:  # Domingo
+        days = 1
+
+    # Ajusta horário
+    if hour < 8:
+        # Antes das 8h → move para 8h
+        return days, True
+    if hour >= 20:
+        # Depois das 20h → move para próximo dia às 8h
+        return days + 1, True
+
+    return days, False
+
 
 # ============================================================================
 # State Definition
 # ============================================================================
 
 
-class FollowupState(TypedDict):
+@dataclass(slots=True)
+class FollowupState:
     """
     Estado do agente de followup.
 
@@ -43,12 +184,58 @@ class FollowupState(TypedDict):
 
     patient_name: str
     days_inactive: int
-    last_message: str
-    context: dict
-    intent: str
-    message: str
-    ready_for_delivery: bool
-    send_at: str
+    last_message: str = ""
+    context: dict = field(default_factory=dict)
+    intent: str = ""
+    message: str = ""
+    ready_for_delivery: bool = False
+    send_at: str = ""
+
+
+# ============================================================================
+# Graph
+# ============================================================================
+# O grafo é compilado uma única vez e compartilhado entre instâncias.
+# Cada node recebe a instância do agente via config["configurable"]["agent"].
+
+
+def _get_agent(config: RunnableConfig) -> "FollowupAgent":
+    """Extrai a instância do agente do config do LangGraph."""
+    return config["configurable"]["agent"]
+
+
+def _detect_intent_node(state: FollowupState, config: RunnableConfig) -> dict[str, Any]:
+    return _get_agent(config)._detect_intent(state)
+
+
+async def _generate_message_node(state: FollowupState, config: RunnableConfig) -> dict[str, Any]:
+    return await _get_agent(config)._generate_message(state, config)
+
+
+def _schedule_send_node(state: FollowupState, config: RunnableConfig) -> dict[str, Any]:
+    return _get_agent(config)._schedule_send(state)
+
+
+def _build_graph() -> CompiledStateGraph:
+    """Constrói e compila o grafo LangGraph do agente."""
+    # Cria workflow
+    workflow = StateGraph(FollowupState)
+
+    # Adiciona nodes
+    workflow.add_node("detect_intent", _detect_intent_node)
+    workflow.add_node("generate_message", _generate_message_node)
+    workflow.add_node("schedule_send", _schedule_send_node)
+
+    # Define edges: geração e agendamento só dependem da intenção, então
+    # rodam em paralelo (mesmo superstep) e o grafo termina quando ambos acabam
+    workflow.set_entry_point("detect_intent")
+    workflow.add_edge("detect_intent", "generate_message")
+    workflow.add_edge("detect_intent", "schedule_send")
+    workflow.add_edge("generate_message", END)
+    workflow.add_edge("schedule_send", END)
+
+    # Compila o grafo
+    return workflow.compile()
 
 
 # ============================================================================
@@ -62,8 +249,8 @@ class FollowupAgent:
 
     Workflow:
     1. detect_intent: Analisa contexto e detecta intenção
-    2. generate_message: Gera mensagem personalizada
-    3. schedule_send: Prepara para envio
+    2a. generate_message: Gera mensagem personalizada (em paralelo com 2b)
+    2b. schedule_send: Prepara para envio
     """
 
     # Metadata do agente (para o registry)
@@ -74,41 +261,58 @@ class FollowupAgent:
         "envia lembretes personalizados baseado no contexto do paciente."
     )
 
-    def __init__(self, enable_streaming: bool = False):
+    # Grafo compilado compartilhado por todas as instâncias (ver _get_compiled_graph)
+    _GRAPH: CompiledStateGraph | None = None
+
+    def __init__(
+        self,
+        enable_streaming: bool = False,
+        message_cache_size: int = 1000,
+        message_cache_ttl_seconds: float | None = 3600,
+    ):
         """
         Inicializa o agente de followup.
 
         Args:
             enable_streaming: Habilitar streaming nas respostas
+            message_cache_size: Tamanho máximo do cache de mensagens
+                (default: 1000; 0 desabilita o cache)
+            message_cache_ttl_seconds: Tempo de vida das mensagens em cache
+                (None = sem expiração)
         """
         self.enable_streaming = enable_streaming
+        self.message_cache_size = message_cache_size
+
+        # Cache de mensagens geradas (LRU + TTL, thread-safe): o grafo roda
+        # concorrente no event loop e em threads (run_sync)
+        # Estrutura: {hash(system_prompt + user_prompt): mensagem}
+        self._msg_cache = (
+            QueryCache(max_size=message_cache_size, ttl_seconds=message_cache_ttl_seconds)
+            if message_cache_size > 0
+            else None
+        )
 
-        # Inicializa LLM multi-provider
-        self.llm = MultiProviderLLM(enable_streaming=enable_streaming)
-
-        # Constrói o grafo LangGraph
-        self.graph = self._build_graph()
-
-    def _build_graph(self) -> StateGraph:
-        """Constrói o grafo LangGraph do agente."""
-        # Cria workflow
-        workflow = StateGraph(FollowupState)
+        # Inicializa LLMs multi-provider (com micro-batching de chamadas concorrentes)
+        # Modelo pequeno para intenções simples, maior para as complexas
+        self.llm = get_shared_batched_llm(enable_streaming=enable_streaming)
+        self.llm_large = get_shared_batched_llm(
+            enable_streaming=enable_streaming, model_tier="large"
+        )
 
-        # Adiciona nodes
-        workflow.add_node("detect_intent", self._detect_intent)
-        workflow.add_node("generate_message", self._generate_message)
-        workflow.add_node("schedule_send", self._schedule_send)
+        # Prompts de sistema pré-computados por intenção
+        self._system_prompts = self._build_system_prompts()
 
-        # Define edges
-        workflow.set_entry_point("detect_intent")
-        workflow.add_edge("detect_intent", "generate_message")
-        workflow.add_edge("generate_message", "schedule_send")
-        workflow.add_edge("schedule_send", END)
+        # Grafo LangGraph (compilado uma vez por processo)
+        self.graph = self._get_compiled_graph()
 
-        # Compila o grafo
-        return workflow.compile() # type: ignore
+    @classmethod
+    def _get_compiled_graph(cls) -> CompiledStateGraph:
+        """Retorna o grafo compilado da classe, compilando na primeira chamada."""
+        if cls._GRAPH is None:
+            cls._GRAPH = _build_graph()
+        return cls._GRAPH
 
-    def _detect_intent(self, state: FollowupState) -> FollowupState:
+    def _detect_intent(self, state: FollowupState) -> dict[str, Any]:
         """
         Node 1: Detecta a intenção baseado no contexto.
 
@@ -124,15 +328,19 @@ class FollowupAgent:
             state: Estado atual
 
         Returns:
-            Estado atualizado com intent detectado
+            Atualização parcial do estado (apenas intent)
         """
-        days_inactive = state["days_inactive"]
-        last_message = state.get("last_message", "").lower()
-        context = state.get("context", {})
-
-        print("🔍 Detectando intenção...")
-        print(f"   - Dias inativo: {days_inactive}")
-        print(f"   - Última mensagem: '{last_message[:50]}...'")
+        days_inactive = state.days_inactive
+        # Sem .lower(): o regex já é case-insensitive
+        last_message = state.last_message
+        context = state.context
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Detectando intenção (dias inativo: %d, última mensagem: '%s...')",
+                days_inactive,
+                last_message[:50],
+            )
 
         # Lógica de detecção de intenção
         intent = "reativacao"  # Default
@@ -142,10 +350,7 @@ class FollowupAgent:
             intent = "pos_consulta"
 
         # Abandono (iniciou mas não completou)
-        elif 3 <= days_inactive <= 7 and any(
-            keyword in last_message
-            for keyword in ["agendar", "consulta", "horário", "disponibilidade"]
-        ):
+        elif 3 <= days_inactive <= 7 and _ABANDONO_RE.search(last_message) is not None:
             intent = "abandono"
 
         # Lead frio (nunca agendou, muito tempo)
@@ -164,31 +369,32 @@ class FollowupAgent:
         elif days_inactive > 30:
             intent = "reativacao"
 
-        print(f"   ✅ Intenção detectada: {intent}")
+        logger.debug("Intenção detectada: %s", intent)
 
-        return {
-            **state,
-            "intent": intent,
-        }
+        return {"intent": intent}
 
-    def _generate_message(self, state: FollowupState) -> FollowupState:
+    async def _generate_message(
+        self, state: FollowupState, config: RunnableConfig
+    ) -> dict[str, Any]:
         """
-        Node 2: Gera mensagem personalizada usando LLM.
+        Node 2a: Gera mensagem personalizada usando LLM.
+
+        Com streaming habilitado, os tokens são consumidos conforme chegam e
+        repassados para a fila `stream_queue` (se fornecida em run()).
 
         Args:
             state: Estado atual
+            config: Config do LangGraph (pode conter "stream_queue")
 
         Returns:
-            Estado atualizado com mensagem gerada
+            Atualização parcial do estado (apenas message)
         """
-        patient_name = state["patient_name"]
-        intent = state["intent"]
-        days_inactive = state["days_inactive"]
-        context = state.get("context", {})
+        patient_name = state.patient_name
+        intent = state.intent
+        days_inactive = state.days_inactive
+        context = state.context
 
-        print("🤖 Gerando mensagem de followup...")
-        print(f"   - Intenção: {intent}")
-        print(f"   - Paciente: {patient_name}")
+        logger.debug("Gerando mensagem de followup (intenção: %s)", intent)
 
         # Constrói prompt baseado na intenção
         system_prompt = self._get_system_prompt(intent)
@@ -205,15 +411,101 @@ class FollowupAgent:
             {"role": "user", "content": user_prompt},
         ]
 
-        # Gera mensagem
-        message = self.llm.invoke_sync(messages)
+        # Tenta o cache antes de chamar o LLM
+        cache_key = self._get_message_cache_key(system_prompt, user_prompt)
+        message = self._get_cached_message(cache_key)
 
-        print(f"   ✅ Mensagem gerada ({len(message)} caracteres)")
+        stream_queue = config.get("configurable", {}).get("stream_queue")
 
-        return {
-            **state,
-            "message": message.strip(),
-        }
+        if message is None:
+            # Roteia por intenção: modelo pequeno para mensagens padronizadas
+            llm = self.llm_large if intent in _COMPLEX_INTENTS else self.llm
+
+            # Gera mensagem
+            if self.enable_streaming:
+                message = await self._stream_message(llm, messages, stream_queue)
+            else:
+                # Mensagens curtas (2-3 linhas): bin de respostas pequenas
+                message = response_text(await llm.ainvoke(messages, max_tokens_hint=80))
+            self._save_cached_message(cache_key, message)
+            logger.debug("Mensagem gerada (%d caracteres)", len(message))
+        else:
+            logger.debug("Mensagem encontrada no cache")
+            if stream_queue is not None:
+                await stream_queue.put(message)
+
+        return {"message": message.strip()}
+
+    async def _stream_message(
+        self,
+        llm: BatchedLLMClient,
+        messages: list[dict[str, str]],
+        stream_queue: asyncio.Queue | None,
+    ) -> str:
+        """
+        Gera a mensagem via streaming, repassando cada chunk para a fila.
+
+        Args:
+            llm: LLM escolhido para a intenção
+            messages: Mensagens para o LLM
+            stream_queue: Fila que recebe os chunks (opcional)
+
+        Returns:
+            Mensagem completa
+        """
+        chunks: list[str] = []
+
+        async for chunk in llm.astream(messages):
+            chunks.append(chunk)
+            if stream_queue is not None:
+                await stream_queue.put(chunk)
+
+        return "".join(chunks)
+
+    def _get_message_cache_key(self, system_prompt: str, user_prompt: str) -> str:
+        """
+        Gera chave de cache para um par de prompts.
+
+        Args:
+            system_prompt: Prompt de sistema
+            user_prompt: Prompt do usuário
+
+        Returns:
+            Digest BLAKE2b (16 bytes, em hex) dos prompts
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(system_prompt.encode())
+        hasher.update(b"\0")
+        hasher.update(user_prompt.encode())
+        return hasher.hexdigest()
+
+    def _get_cached_message(self, cache_key: str) -> str | None:
+        """
+        Busca mensagem no cache (LRU + TTL).
+
+        Só há hit quando os prompts são idênticos: a mensagem inclui o nome do
+        paciente, então reaproveitar respostas "parecidas" trocaria o nome.
+
+        Args:
+            cache_key: Chave gerada por _get_message_cache_key
+
+        Returns:
+            Mensagem em cache, ou None se não encontrada
+        """
+        if self._msg_cache is None:
+            return None
+        return self._msg_cache.get(cache_key)
+
+    def _save_cached_message(self, cache_key: str, message: str):
+        """
+        Salva mensagem no cache, removendo a menos usada se estiver cheio.
+
+        Args:
+            cache_key: Chave gerada por _get_message_cache_key
+            message: Mensagem gerada pelo LLM
+        """
+        if self._msg_cache is not None:
+            self._msg_cache.put(cache_key, message)
 
     def _adjust_to_business_hours(self, dt: datetime) -> datetime:
         """
@@ -225,25 +517,18 @@ class FollowupAgent:
         Returns:
             Data/hora ajustada para horário comercial
         """
-        # Se for fim de semana, move para segunda-feira
-        if dt.weekday() == 5:  # Sábado
-            dt = dt + timedelta(days=2)
-        elif dt.weekday() == 6:  # Domingo
-            dt = dt + timedelta(days=1)
+        days, reset_to_8h = _business_hours_shift(dt.date(), dt.hour)
 
-        # Ajusta horário
-        if dt.hour < 8:
-            # Antes das 8h → move para 8h
+        if days:
+            dt += timedelta(days=days)
+        if reset_to_8h:
             dt = dt.replace(hour=8, minute=0, second=0, microsecond=0)
-        elif dt.hour >= 20:
-            # Depois das 20h → move para próximo dia às 8h
-            dt = (dt + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)
 
         return dt
 
-    def _schedule_send(self, state: FollowupState) -> FollowupState:
+    def _schedule_send(self, state: FollowupState) -> dict[str, Any]:
         """
-        Node 3: Prepara para envio com horários comerciais inteligentes.
+        Node 2b: Prepara para envio com horários comerciais inteligentes.
 
         Regras de agendamento:
         - pos_consulta: Próxima manhã às 10h
@@ -259,43 +544,23 @@ class FollowupAgent:
             state: Estado atual
 
         Returns:
-            Estado atualizado com informações de agendamento
+            Atualização parcial do estado (ready_for_delivery e send_at)
         """
-        intent = state["intent"]
+        intent = state.intent
         now = datetime.now()
 
-        print("📅 Preparando agendamento de envio...")
-
         # Define horário base por intenção
-        if intent == "pos_consulta":
-            # Próxima manhã às 10h
-            send_at = (now + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
-
-        elif intent == "abandono":
+        if intent == "abandono":
             # Daqui 2 horas
             send_at = now + timedelta(hours=2)
-
-        elif intent == "lead_frio":
-            # Amanhã às 16h
-            send_at = (now + timedelta(days=1)).replace(hour=16, minute=0, second=0, microsecond=0)
-
-        elif intent == "checagem_retorno":
-            # Amanhã às 10h
-            send_at = (now + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
-
-        elif intent == "agendar_consulta":
-            # Hoje às 18h
-            send_at = now.replace(hour=18, minute=0, second=0, microsecond=0)
-            # Se já passou das 18h, move para amanhã
-            if now.hour >= 18:
-                send_at = send_at + timedelta(days=1)
-
-        else:  # reativacao e outros
-            # Hoje às 18h
-            send_at = now.replace(hour=18, minute=0, second=0, microsecond=0)
-            # Se já passou das 18h, move para amanhã
-            if now.hour >= 18:
-                send_at = send_at + timedelta(days=1)
+        else:
+            days, hour, roll_if_past = _SCHEDULE_RULES.get(intent, _SCHEDULE_RULES[_DEFAULT_INTENT])
+            send_at = (now + timedelta(days=days)).replace(
+                hour=hour, minute=0, second=0, microsecond=0
+            )
+            # Se o horário de hoje já passou, move para amanhã
+            if roll_if_past and now.hour >= hour:
+                send_at += timedelta(days=1)
 
         # Ajusta para horário comercial
         send_at = self._adjust_to_business_hours(send_at)
@@ -304,25 +569,23 @@ class FollowupAgent:
         is_scheduled = send_at > now
         send_at_str = send_at.isoformat() if is_scheduled else "now"
 
-        print(f"   ✅ Envio agendado: {send_at_str}")
-        if is_scheduled:
-            print(f"      Agendado para: {send_at.strftime('%d/%m/%Y %H:%M')}")
+        logger.debug("Envio agendado: %s", send_at_str)
 
         return {
-            **state,
             "ready_for_delivery": True,
             "send_at": send_at_str,
         }
 
-    def _get_system_prompt(self, intent: str) -> str:
+    def _build_system_prompts(self) -> dict[str, str]:
         """
-        Retorna o prompt de sistema baseado na intenção.
+        Monta os prompts de sistema de todas as intenções.
 
-        Args:
-            intent: Intenção detectada
+        BUSINESS_NAME, DEFAULT_LANGUAGE e as instruções por intenção não mudam
+        em runtime, então os prompts são montados uma única vez no __init__.
+        O conteúdo estático fica no início do prompt (bom para prompt caching).
 
         Returns:
-            Prompt de sistema
+            Dict intent -> prompt de sistema completo
         """
         business_name = taskni_settings.BUSINESS_NAME
         language = taskni_settings.DEFAULT_LANGUAGE
@@ -345,52 +608,22 @@ NUNCA:
 - Use linguagem muito comercial
 """
 
-        # Instruções específicas por intenção
-        intent_instructions = {
-            "reativacao": """
-CONTEXTO: Paciente está inativo há algum tempo.
-OBJETIVO: Reativar de forma suave e amigável.
-TOM: Saudoso mas não insistente.
-EXEMPLO: "Oi [nome]! Sentimos sua falta por aqui 😊 Que tal agendar um check-up? Estamos à disposição!"
-""",
-            "pos_consulta": """
-CONTEXTO: Acompanhamento após consulta recente.
-OBJETIVO: Verificar como está e oferecer suporte.
-TOM: Cuidadoso e atencioso.
-EXEMPLO: "Olá [nome]! Como você está se sentindo após a consulta? Qualquer dúvida, estamos aqui! 🩺"
-""",
-            "abandono": """
-CONTEXTO: Paciente iniciou agendamento mas não completou.
-OBJETIVO: Ajudar a concluir o agendamento.
-TOM: Prestativo e facilitador.
-EXEMPLO: "Oi [nome]! Vi que você teve interesse em agendar. Posso ajudar a encontrar um horário? 😊"
-""",
-            "lead_frio": """
-CONTEXTO: Lead antigo que nunca agendou.
-OBJETIVO: Reativar com oferta de valor.
-TOM: Acolhedor e informativo.
-EXEMPLO: "Oi [nome]! Ainda podemos ajudar com seu atendimento. Temos horários disponíveis esta semana!"
-""",
-            "checagem_retorno": """
-CONTEXTO: Paciente precisa de retorno após procedimento.
-OBJETIVO: Lembrar da importância do retorno.
-TOM: Profissional e cuidadoso.
-EXEMPLO: "Olá [nome]! Está na hora de agendar seu retorno. É importante para acompanharmos sua evolução! 🩺"
-""",
-            "agendar_consulta": """
-CONTEXTO: Consulta de rotina está atrasada.
-OBJETIVO: Incentivar check-up preventivo.
-TOM: Amigável e preventivo.
-EXEMPLO: "Oi [nome]! Que tal um check-up? Cuidar da saúde preventivamente é sempre melhor! 😊"
-""",
+        return {
+            intent: base_prompt + "\n" + instruction
+            for intent, instruction in _INTENT_INSTRUCTIONS.items()
         }
 
-        specific_instruction = intent_instructions.get(
-            intent,
-            intent_instructions["reativacao"],  # Default
-        )
+    def _get_system_prompt(self, intent: str) -> str:
+        """
+        Retorna o prompt de sistema baseado na intenção.
 
-        return base_prompt + "\n" + specific_instruction
+        Args:
+            intent: Intenção detectada
+
+        Returns:
+            Prompt de sistema (pré-computado)
+        """
+        return self._system_prompts.get(intent, self._system_prompts[_DEFAULT_INTENT])
 
     def _get_user_prompt(
         self, patient_name: str, intent: str, days_inactive: int, context: dict
@@ -408,26 +641,14 @@ EXEMPLO: "Oi [nome]! Que tal um check-up? Cuidar da saúde preventivamente é se
             Prompt formatado e sanitizado
         """
         # SANITIZA TODOS OS INPUTS PARA PREVENIR PROMPT INJECTION
-        patient_name = sanitize_prompt_input(patient_name, max_length=200)
-        intent = sanitize_prompt_input(intent, max_length=50)
-        clinic_type = sanitize_prompt_input(context.get("clinic_type", "clínica"), max_length=100)
-        service = sanitize_prompt_input(context.get("service", "atendimento"), max_length=100)
-        tone = sanitize_prompt_input(context.get("tone", "amigável"), max_length=50)
-
-        prompt = f"""Crie uma mensagem de followup para:
-
-Nome do paciente: {patient_name}
-Dias sem contato: {days_inactive}
-Tipo de estabelecimento: {clinic_type}
-Serviço principal: {service}
-Tom desejado: {tone}
-Intenção: {intent}
-
-Lembre-se: mensagem CURTA (2-3 linhas máximo), natural como WhatsApp, e com call-to-action suave.
-
-Mensagem:"""
-
-        return prompt
+        return _USER_PROMPT_TEMPLATE.format(
+            patient_name=sanitize_prompt_input(patient_name, max_length=200),
+            days_inactive=days_inactive,
+            clinic_type=_sanitize_label(context.get("clinic_type", "clínica"), 100),
+            service=_sanitize_label(context.get("service", "atendimento"), 100),
+            tone=_sanitize_label(context.get("tone", "amigável"), 50),
+            intent=_sanitize_label(intent, 50),
+        )
 
     async def run(
         self,
@@ -435,7 +656,8 @@ Mensagem:"""
         days_inactive: int | None = None,
         last_message: str = "",
         context: dict | None = None,
-        input_data: "FollowupInput | None" = None,
+        input_data: FollowupInput | None = None,
+        stream_queue: asyncio.Queue | None = None,
     ) -> dict:
         """
         Executa o agente de followup.
@@ -446,17 +668,18 @@ Mensagem:"""
             last_message: Última mensagem do paciente
             context: Contexto adicional
             input_data: FollowupInput validado (alternativa aos args individuais)
+            stream_queue: Fila que recebe os chunks da mensagem conforme são
+                gerados (ex: para SSE). Recebe None ao final da execução.
 
         Returns:
             Dict com intent, message, ready_for_delivery, send_at
         """
         # Suporta tanto input direto quanto FollowupInput
         if input_data is not None:
-            from taskni_core.schema.agent_inputs import FollowupInput
-
-            # Valida se é instância de FollowupInput
-            if not isinstance(input_data, FollowupInput):
-                input_data = FollowupInput(**input_data)
+            # Instância já validada (caso comum via API) passa direto;
+            # dicts são validados pelo pydantic-core
+            if type(input_data) is not FollowupInput:
+                input_data = FollowupInput.model_validate(input_data)
 
             patient_name = input_data.patient_name
             days_inactive = input_data.days_inactive
@@ -467,26 +690,25 @@ Mensagem:"""
             if patient_name is None or days_inactive is None:
                 raise ValueError("patient_name and days_inactive are required")
 
-        print(f"\n{'=' * 80}")
-        print("🤖 FollowupAgent: Processando followup")
-        print(f"{'=' * 80}")
+        logger.debug("FollowupAgent: processando followup")
 
         # Estado inicial
-        initial_state = {
-            "patient_name": patient_name,
-            "days_inactive": days_inactive,
-            "last_message": last_message or "",
-            "context": context or {},
-            "intent": "",
-            "message": "",
-            "ready_for_delivery": False,
-            "send_at": "",
-        }
+        initial_state = FollowupState(
+            patient_name=patient_name,
+            days_inactive=days_inactive,
+            last_message=last_message or "",
+            context=context or {},
+        )
 
         # Executa o grafo
-        final_state = await self.graph.ainvoke(initial_state) # type: ignore
-
-        print(f"{'=' * 80}\n")
+        try:
+            final_state = await self.graph.ainvoke(
+                initial_state,
+                config={"configurable": {"agent": self, "stream_queue": stream_queue}},
+            )
+        finally:
+            if stream_queue is not None:
+                await stream_queue.put(None)
 
         # Retorna resultado
         return {
@@ -496,6 +718,96 @@ Mensagem:"""
             "send_at": final_state["send_at"],
         }
 
+    @staticmethod
+    def _input_from_request(message: str, context: dict | None) -> FollowupInput:
+        """
+        Monta o FollowupInput de uma requisição de /agents (invoke ou stream).
+
+        A mensagem do usuário é a última mensagem do paciente; nome e dias
+        de inatividade vêm de metadata.custom ("patient_name" e
+        "days_inactive"), e o restante de metadata.custom vira o contexto.
+
+        Args:
+            message: Última mensagem do paciente
+            context: Contexto da requisição (user_id, metadata, etc)
+
+        Returns:
+            Input validado
+
+        Raises:
+            ValueError: Se os dados do paciente estiverem ausentes ou inválidos
+        """
+        custom = dict(((context or {}).get("metadata") or {}).get("custom") or {})
+        try:
+            input_data = FollowupInput(
+                patient_name=custom.pop("patient_name", None),
+                days_inactive=custom.pop("days_inactive", None),
+                last_message=message,
+                context=custom,
+            )
+        except ValidationError as e:
+            fields = ", ".join(sorted({str(error["loc"][0]) for error in e.errors()}))
+            raise ValueError(f"Dados do followup inválidos ou ausentes: {fields}") from e
+        return input_data
+
+    async def run_invoke(self, message: str, context: dict | None = None) -> str:
+        """
+        Executa o agente a partir de uma requisição de /agents/invoke.
+
+        Args:
+            message: Última mensagem do paciente
+            context: Contexto da requisição (ver _input_from_request)
+
+        Returns:
+            Mensagem de followup gerada
+
+        Raises:
+            ValueError: Se os dados do paciente estiverem ausentes ou inválidos
+        """
+        result = await self.run(input_data=self._input_from_request(message, context))
+        return result["message"]
+
+    def run_stream(self, message: str, context: dict | None = None) -> AsyncIterator[str]:
+        """
+        Executa o agente a partir de uma requisição de /agents/stream.
+
+        A validação (ver _input_from_request) acontece já na chamada, antes
+        de o stream começar.
+
+        Args:
+            message: Última mensagem do paciente
+            context: Contexto da requisição (user_id, metadata, etc)
+
+        Returns:
+            Iterador assíncrono com os chunks da mensagem gerada (a mensagem
+            inteira num único chunk quando o streaming está desabilitado)
+
+        Raises:
+            ValueError: Se os dados do paciente estiverem ausentes ou inválidos
+        """
+        return self._stream(self._input_from_request(message, context))
+
+    async def _stream(self, input_data: FollowupInput) -> AsyncIterator[str]:
+        """Executa run() emitindo os chunks da mensagem conforme são gerados."""
+        queue: asyncio.Queue[str | None] = asyncio.Queue()
+        task = asyncio.create_task(self.run(input_data=input_data, stream_queue=queue))
+        # Sentinela no fim (sucesso ou erro): todos os chunks já estão na fila
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            streamed = False
+            while (chunk := await queue.get()) is not None:
+                streamed = True
+                yield chunk
+            # Propaga erros da execução
+            result = await task
+            if not streamed:
+                # Sem streaming do LLM: a mensagem sai inteira
+                yield result["message"]
+        finally:
+            if not task.done():
+                task.cancel()
+
     def invoke_sync(
         self,
         patient_name: str,
@@ -503,10 +815,13 @@ Mensagem:"""
         last_message: str = "",
         context: dict | None = None,
     ) -> dict:
-        """Versão síncrona do run() para compatibilidade."""
-        import asyncio
+        """
+        Versão síncrona do run() para compatibilidade.
 
-        return asyncio.run(self.run(patient_name, days_inactive, last_message, context))
+        Usa o event loop de background compartilhado em vez de asyncio.run(),
+        evitando criar um loop novo por chamada.
+        """
+        return run_sync(self.run(patient_name, days_inactive, last_message, context))
 
 
 # ============================================================================
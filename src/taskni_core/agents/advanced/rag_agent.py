@@ -2,52 +2,127 @@
 FAQ RAG Agent - Agente de perguntas frequentes com RAG.
 
 Usa LangGraph para implementar um workflow de:
-1. Retrieval: Busca documentos relevantes no ChromaDB
-2. Generation: Gera resposta usando LLM + contexto recuperado
+1. Retrieval híbrido (em paralelo): busca densa no ChromaDB + busca BM25
+2. Fusion: Combina os dois rankings (reciprocal rank fusion)
+3. Generation: Gera resposta usando LLM + contexto recuperado
 
 Este é um agente AVANÇADO (usa LangGraph completo).
 """
 
+import asyncio
 import hashlib
-from collections import OrderedDict
-from collections.abc import Sequence
-from operator import add
-from typing import Annotated, Any, TypedDict
+import logging
+import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Annotated, Any
 
+import numpy as np
 from langchain_core.documents import Document
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langgraph.graph import END, StateGraph
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+from langgraph.graph.state import CompiledStateGraph
 
-from taskni_core.core.llm_provider import MultiProviderLLM
+from taskni_core.core.llm_batching import get_shared_batched_llm
+from taskni_core.core.llm_provider import response_text
 from taskni_core.core.settings import taskni_settings
 from taskni_core.rag.ingest import get_ingestion_pipeline
+from taskni_core.rag.keyword_index import KeywordIndex, reciprocal_rank_fusion
+from taskni_core.rag.search_batching import BatchedSearchCoordinator
+from taskni_core.utils.async_utils import run_sync
+from taskni_core.utils.query_cache import QueryCache
 from taskni_core.utils.security import sanitize_prompt_input
 
+logger = logging.getLogger(__name__)
+
+__all__ = ["FaqRagAgent", "RagState", "create_faq_rag_agent"]
+
 # ============================================================================
 # State Definition
 # ============================================================================
 
 
-class RagState(TypedDict):
+@dataclass(slots=True)
+class RagState:
     """
     Estado do agente RAG.
 
     Campos:
     - question: Pergunta do usuário
-    - retrieved_docs: Documentos recuperados do vector store
+    - dense_docs: Documentos da busca densa (embeddings)
+    - sparse_docs: Documentos da busca por palavras-chave (BM25)
+    - retrieved_docs: Documentos finais (fusão das duas buscas)
     - context: Contexto formatado dos documentos
     - answer: Resposta final gerada
     - sources: Fontes dos documentos
     - messages: Histórico de mensagens (para LangGraph)
+    - query_embedding: Embedding da pergunta, se já calculado (evita recalcular)
     """
 
     question: str
-    retrieved_docs: list[Document]
-    context: str
-    answer: str
-    sources: list[str]
-    messages: Annotated[Sequence[BaseMessage], add]
+    dense_docs: list[Document] = field(default_factory=list)
+    sparse_docs: list[Document] = field(default_factory=list)
+    retrieved_docs: list[Document] = field(default_factory=list)
+    context: str = ""
+    answer: str = ""
+    sources: list[str] = field(default_factory=list)
+    messages: Annotated[list[BaseMessage], add_messages] = field(default_factory=list)
+    query_embedding: list[float] | None = None
+
+
+# ============================================================================
+# Graph
+# ============================================================================
+# O grafo é compilado uma única vez e compartilhado entre instâncias.
+# Cada node recebe a instância do agente via config["configurable"]["agent"].
+
+
+def _get_agent(config: RunnableConfig) -> "FaqRagAgent":
+    """Extrai a instância do agente do config do LangGraph."""
+    return config["configurable"]["agent"]
+
+
+async def _retrieve_dense_node(state: RagState, config: RunnableConfig) -> dict[str, Any]:
+    return await _get_agent(config)._retrieve_dense(state)
+
+
+async def _retrieve_sparse_node(state: RagState, config: RunnableConfig) -> dict[str, Any]:
+    return await _get_agent(config)._retrieve_sparse(state)
+
+
+async def _fuse_node(state: RagState, config: RunnableConfig) -> dict[str, Any]:
+    return _get_agent(config)._fuse_documents(state)
+
+
+async def _generate_node(state: RagState, config: RunnableConfig) -> dict[str, Any]:
+    stream_queue = config["configurable"].get("stream_queue")
+    return await _get_agent(config)._generate_answer(state, stream_queue)
+
+
+def _build_graph() -> CompiledStateGraph:
+    """Constrói e compila o grafo LangGraph do agente."""
+    # Cria workflow
+    workflow = StateGraph(RagState)
+
+    # Adiciona nodes
+    workflow.add_node("retrieve_dense", _retrieve_dense_node)
+    workflow.add_node("retrieve_sparse", _retrieve_sparse_node)
+    workflow.add_node("fuse", _fuse_node)
+    workflow.add_node("generate", _generate_node)
+
+    # Define edges: as duas buscas rodam em paralelo (mesmo superstep)
+    # e o fuse só executa quando ambas terminam
+    workflow.add_edge(START, "retrieve_dense")
+    workflow.add_edge(START, "retrieve_sparse")
+    workflow.add_edge(["retrieve_dense", "retrieve_sparse"], "fuse")
+    workflow.add_edge("fuse", "generate")
+    workflow.add_edge("generate", END)
+
+    # Compila o grafo
+    return workflow.compile()
 
 
 # ============================================================================
@@ -60,8 +135,9 @@ class FaqRagAgent:
     Agente RAG para FAQ usando LangGraph.
 
     Workflow:
-    1. retrieve_documents: Busca documentos relevantes
-    2. generate_answer: Gera resposta usando LLM + contexto
+    1. retrieve_dense / retrieve_sparse: Buscas densa e BM25 em paralelo
+    2. fuse_documents: Funde os rankings e formata o contexto
+    3. generate_answer: Gera resposta usando LLM + contexto
     """
 
     # Metadata do agente (para o registry)
@@ -72,7 +148,17 @@ class FaqRagAgent:
         "Busca documentos relevantes e gera respostas baseadas no contexto recuperado."
     )
 
-    def __init__(self, k_documents: int = 4, enable_streaming: bool = True, cache_size: int = 50):
+    # Grafo compilado compartilhado por todas as instâncias (ver _get_compiled_graph)
+    _GRAPH: CompiledStateGraph | None = None
+
+    def __init__(
+        self,
+        k_documents: int = 4,
+        enable_streaming: bool = True,
+        cache_size: int = 50,
+        cache_ttl_seconds: float | None = 3600,
+        semantic_threshold: float | None = 0.93,
+    ):
         """
         Inicializa o agente RAG.
 
@@ -80,142 +166,197 @@ class FaqRagAgent:
             k_documents: Número de documentos a recuperar
             enable_streaming: Habilitar streaming nas respostas
             cache_size: Tamanho máximo do cache (default: 50)
+            cache_ttl_seconds: Tempo de vida das respostas em cache (None = sem expiração)
+            semantic_threshold: Similaridade de cosseno mínima para reaproveitar
+                a resposta de uma pergunta parecida (None desabilita)
         """
         self.k_documents = k_documents
         self.enable_streaming = enable_streaming
         self.cache_size = cache_size
+        self.semantic_threshold = semantic_threshold
 
-        # Inicializa LLM multi-provider
-        self.llm = MultiProviderLLM(enable_streaming=enable_streaming)
+        # LLM multi-provider compartilhado (micro-batching com os demais agentes)
+        self.llm = get_shared_batched_llm(enable_streaming=enable_streaming)
 
         # Inicializa pipeline de ingestão/retrieval
         self.ingestion = get_ingestion_pipeline()
 
-        # Cache para respostas (FIFO com OrderedDict)
+        # Embedding + busca agrupados entre execuções concorrentes
+        self.search_coordinator = BatchedSearchCoordinator(self.ingestion, k=k_documents)
+
+        # Índice BM25 sobre a mesma coleção (busca esparsa do retrieval híbrido)
+        self.keyword_index = KeywordIndex(self.ingestion)
+
+        # Cache para respostas (LRU + TTL, thread-safe)
         # Estrutura: {cache_key: {"answer": str, "sources": List[str]}}
-        self.cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.cache = QueryCache(max_size=cache_size, ttl_seconds=cache_ttl_seconds)
+
+        # Cache semântico: embeddings normalizados das perguntas em cache,
+        # numa matriz float32 (um produto matriz-vetor por consulta). Matriz
+        # alocada no primeiro save, quando a dimensão é conhecida.
+        self._semantic_lock = threading.Lock()
+        self._semantic_embs: np.ndarray | None = None
+        self._semantic_keys: list[str | None] = [None] * cache_size
+        self._semantic_next = 0
+
+        # Prompts compilados uma única vez: o system prompt é um prefixo
+        # estático e o template do usuário só tem o conteúdo por pergunta
+        self._system_prompt = self._get_system_prompt()
+        self._prompt_template = ChatPromptTemplate.from_messages(
+            [("human", self._get_user_prompt_template())]
+        )
 
-        # Constrói o grafo LangGraph
-        self.graph = self._build_graph()
+        # Grafo LangGraph (compilado uma vez por processo)
+        self.graph = self._get_compiled_graph()
 
-    def _build_graph(self) -> StateGraph:
-        """Constrói o grafo LangGraph do agente."""
-        # Cria workflow
-        workflow = StateGraph(RagState)
+    @classmethod
+    def _get_compiled_graph(cls) -> CompiledStateGraph:
+        """Retorna o grafo compilado da classe, compilando na primeira chamada."""
+        if cls._GRAPH is None:
+            cls._GRAPH = _build_graph()
+        return cls._GRAPH
 
-        # Adiciona nodes
-        workflow.add_node("retrieve", self._retrieve_documents)
-        workflow.add_node("generate", self._generate_answer)
+    async def _retrieve_dense(self, state: RagState) -> dict[str, Any]:
+        """
+        Node 1a: Busca densa (embeddings) no vector store.
 
-        # Define edges
-        workflow.set_entry_point("retrieve")
-        workflow.add_edge("retrieve", "generate")
-        workflow.add_edge("generate", END)
+        Embedding e busca passam pelo BatchedSearchCoordinator: consultas
+        concorrentes viram um único embedding em lote e uma única query ao
+        ChromaDB, executados numa thread para não bloquear o event loop.
 
-        # Compila o grafo
-        return workflow.compile() # type: ignore
+        Args:
+            state: Estado atual
 
-    def _retrieve_documents(self, state: RagState) -> RagState:
+        Returns:
+            Atualização parcial do estado (dense_docs)
         """
-        Node 1: Recupera documentos relevantes do vector store.
+        logger.debug("Busca densa para: '%s'", state.question)
+
+        # Reaproveita o embedding do cache semântico, se já calculado
+        if state.query_embedding is not None:
+            docs = await self.search_coordinator.search(state.query_embedding)
+        else:
+            docs = await self.search_coordinator.submit(state.question)
+
+        return {"dense_docs": docs}
+
+    async def _retrieve_sparse(self, state: RagState) -> dict[str, Any]:
+        """
+        Node 1b: Busca por palavras-chave (BM25), em paralelo com a densa.
 
         Args:
             state: Estado atual
 
         Returns:
-            Estado atualizado com documentos recuperados
+            Atualização parcial do estado (sparse_docs)
         """
-        question = state["question"]
+        logger.debug("Busca BM25 para: '%s'", state.question)
 
-        print(f"🔍 Buscando documentos para: '{question}'")
+        docs = await asyncio.to_thread(self.keyword_index.search, state.question, self.k_documents)
 
-        # Busca documentos similares
-        docs = self.ingestion.search(query=question, k=self.k_documents)
+        return {"sparse_docs": docs}
 
-        print(f"   ✅ {len(docs)} documentos recuperados")
+    def _fuse_documents(self, state: RagState) -> dict[str, Any]:
+        """
+        Node 2: Funde os resultados das duas buscas e formata o contexto.
 
-        # Formata contexto
-        context_parts = []
-        sources = []
+        Args:
+            state: Estado atual
 
-        for i, doc in enumerate(docs, 1):
-            # Adiciona documento ao contexto
-            context_parts.append(f"[Documento {i}]\n{doc.page_content}\n")
+        Returns:
+            Atualização parcial do estado (retrieved_docs, context, sources)
+        """
+        docs = reciprocal_rank_fusion([state.dense_docs, state.sparse_docs], k=self.k_documents)
+
+        logger.debug(
+            "%d documentos recuperados (%d densos, %d BM25)",
+            len(docs),
+            len(state.dense_docs),
+            len(state.sparse_docs),
+        )
 
-            # Adiciona fonte
-            source = doc.metadata.get("source_file", f"doc_{i}")
-            page = doc.metadata.get("page", "")
-            if page:
-                sources.append(f"{source} (página {page})")
-            else:
-                sources.append(source)
+        # Formata contexto (um único join no final)
+        context = "\n".join(
+            f"[Documento {i}]\n{doc.page_content}\n" for i, doc in enumerate(docs, 1)
+        )
 
-        context = "\n".join(context_parts)
+        # Fontes dos documentos
+        sources = []
+        for i, doc in enumerate(docs, 1):
+            meta = doc.metadata
+            source = meta["source_file"] if "source_file" in meta else f"doc_{i}"
+            page = meta.get("page")
+            sources.append(f"{source} (página {page})" if page else source)
 
         # Atualiza estado
         return {
-            **state,
             "retrieved_docs": docs,
             "context": context,
             "sources": sources,
         }
 
-    def _generate_answer(self, state: RagState) -> RagState:
+    async def _generate_answer(
+        self, state: RagState, stream_queue: asyncio.Queue | None = None
+    ) -> dict[str, Any]:
         """
-        Node 2: Gera resposta usando LLM + contexto recuperado.
+        Node 3: Gera resposta usando LLM + contexto recuperado.
 
         Args:
             state: Estado atual
+            stream_queue: Fila que recebe os chunks da resposta conforme são
+                gerados (ver run_stream)
 
         Returns:
-            Estado atualizado com resposta gerada
+            Atualização parcial do estado (answer, messages)
         """
-        question = state["question"]
-        context = state["context"]
+        question = state.question
+        context = state.context
 
-        print("🤖 Gerando resposta...")
+        logger.debug("Gerando resposta...")
 
-        # Template do prompt
-        prompt_template = ChatPromptTemplate.from_messages(
-            [
-                ("system", self._get_system_prompt()),
-                ("human", self._get_user_prompt_template()),
-            ]
-        )
-
-        # Formata prompt
-        messages = prompt_template.format_messages(
-            business_name=taskni_settings.BUSINESS_NAME,
-            language=taskni_settings.DEFAULT_LANGUAGE,
-            context=context,
-            question=question,
-        )
+        # Formata prompt (só as partes dinâmicas)
+        user_message = self._prompt_template.format_messages(context=context, question=question)[0]
 
         # Converte para formato dict
         messages_dict = [
-            {"role": "system", "content": messages[0].content},
-            {"role": "user", "content": messages[1].content},
+            {"role": "system", "content": self._system_prompt},
+            {"role": "user", "content": user_message.content},
         ]
 
         # Gera resposta
-        response = self.llm.invoke_sync(messages_dict) # type: ignore
-
-        print("   ✅ Resposta gerada")
+        if stream_queue is not None:
+            chunks: list[str] = []
+            async for chunk in self.llm.astream(messages_dict):
+                chunks.append(chunk)
+                await stream_queue.put(chunk)
+            response = "".join(chunks)
+        else:
+            # Respostas de FAQ podem ser longas: bin proporcional ao contexto
+            response = response_text(
+                await self.llm.ainvoke(messages_dict, max_tokens_hint=self.k_documents * 256)
+            )
+
+        logger.debug("Resposta gerada")
 
         # Atualiza estado
+        # "messages" usa o reducer `add_messages`: retorna só as novas mensagens
         return {
-            **state,
             "answer": response,
-            "messages": state.get("messages", []) # type: ignore
-            + [
+            "messages": [
                 HumanMessage(content=question),
                 AIMessage(content=response),
             ],
         }
 
     def _get_system_prompt(self) -> str:
-        """Retorna o prompt de sistema do agente."""
-        return """Você é um assistente especializado em responder perguntas frequentes (FAQ).
+        """
+        Retorna o prompt de sistema do agente.
+
+        Nome do negócio e idioma são constantes do processo e já entram
+        materializados aqui: o system prompt é um prefixo byte-a-byte estático,
+        que o cache de prompt do provider consegue reaproveitar.
+        """
+        return f"""Você é um assistente especializado em responder perguntas frequentes (FAQ) de {taskni_settings.BUSINESS_NAME}.
 
 Seu papel:
 1. Analisar cuidadosamente o contexto fornecido (documentos recuperados)
@@ -227,6 +368,7 @@ Seu papel:
 IMPORTANTE:
 - NÃO invente informações que não estão no contexto
 - Se não tiver certeza, seja honesto
+- Responda sempre em {taskni_settings.DEFAULT_LANGUAGE}
 - Mantenha um tom profissional e acolhedor
 """
 
@@ -239,9 +381,7 @@ IMPORTANTE:
 
 Pergunta do usuário: {question}
 
-Por favor, responda a pergunta baseado no contexto acima. Se a informação não estiver no contexto, seja honesto e diga que não encontrou.
-
-Responda em {language}."""
+Por favor, responda a pergunta baseado no contexto acima. Se a informação não estiver no contexto, seja honesto e diga que não encontrou."""
 
     def _get_cache_key(self, question: str) -> str:
         """
@@ -251,99 +391,147 @@ Responda em {language}."""
             question: Pergunta do usuário
 
         Returns:
-            Hash MD5 da pergunta normalizada
+            Hash BLAKE2b (64 bits) da pergunta normalizada
         """
         # Normaliza a pergunta (lowercase, strip)
         normalized = question.lower().strip()
-        # Gera hash MD5
-        return hashlib.md5(normalized.encode()).hexdigest()
+        # Chave só é usada em memória: não precisa de hash criptográfico forte
+        return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
 
-    def _get_from_cache(self, question: str) -> dict[str, Any] | None:
+    def _get_from_cache(self, cache_key: str) -> dict[str, Any] | None:
         """
         Busca resposta no cache.
 
         Args:
-            question: Pergunta do usuário
+            cache_key: Chave gerada por _get_cache_key
 
         Returns:
             Dict com answer e sources, ou None se não encontrado
         """
-        cache_key = self._get_cache_key(question)
-
-        if cache_key in self.cache:
-            # Move para o final (LRU behavior)
-            self.cache.move_to_end(cache_key)
-            print(f"   💾 Resposta encontrada no cache (key: {cache_key[:8]}...)")
-            return self.cache[cache_key]
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Resposta encontrada no cache (key: %s...)", cache_key[:8])
+        return cached
 
-        return None
-
-    def _save_to_cache(self, question: str, answer: str, sources: list[str]):
+    def _save_to_cache(self, cache_key: str, answer: str, sources: list[str]):
         """
         Salva resposta no cache.
 
         Args:
-            question: Pergunta do usuário
+            cache_key: Chave gerada por _get_cache_key
             answer: Resposta gerada
             sources: Fontes dos documentos
         """
-        cache_key = self._get_cache_key(question)
+        # Adiciona ao cache (remove a entrada menos usada se estiver cheio)
+        self.cache.put(
+            cache_key,
+            {
+                "answer": answer,
+                "sources": sources,
+            },
+        )
 
-        # Se cache está cheio, remove o mais antigo (FIFO)
-        if len(self.cache) >= self.cache_size:
-            # Remove primeiro item (mais antigo)
-            oldest_key = next(iter(self.cache))
-            self.cache.pop(oldest_key)
-            print("   🗑️  Cache cheio: removendo entrada antiga")
+        logger.debug("Resposta salva no cache (%d/%d)", len(self.cache), self.cache_size)
 
-        # Adiciona ao cache
-        self.cache[cache_key] = {
-            "answer": answer,
-            "sources": sources,
-        }
+    def _get_from_semantic_cache(self, embedding: np.ndarray) -> dict[str, Any] | None:
+        """
+        Busca a resposta de uma pergunta semanticamente parecida.
 
-        print(f"   💾 Resposta salva no cache ({len(self.cache)}/{self.cache_size})")
+        Args:
+            embedding: Embedding normalizado da pergunta
 
-    def get_cache_stats(self) -> dict[str, int]:
+        Returns:
+            Dict com answer e sources, ou None se nada passar do threshold
+        """
+        if self._semantic_embs is None or self.semantic_threshold is None:
+            return None
+
+        # Linhas vazias são zero, então nunca passam do threshold
+        with self._semantic_lock:
+            scores = self._semantic_embs @ embedding
+            best = int(np.argmax(scores))
+            if scores[best] < self.semantic_threshold:
+                return None
+            cache_key = self._semantic_keys[best]
+
+        if cache_key is None:
+            return None
+
+        # A entrada pode já ter sido removida do cache exato
+        return self._get_from_cache(cache_key)
+
+    def _save_to_semantic_cache(self, cache_key: str, embedding: np.ndarray):
+        """
+        Registra o embedding de uma pergunta no cache semântico.
+
+        Args:
+            cache_key: Chave da resposta no cache exato
+            embedding: Embedding normalizado da pergunta
+        """
+        with self._semantic_lock:
+            if self._semantic_embs is None:
+                self._semantic_embs = np.zeros((self.cache_size, embedding.shape[0]), np.float32)
+
+            slot = self._semantic_next % self.cache_size
+            self._semantic_embs[slot] = embedding
+            self._semantic_keys[slot] = cache_key
+            self._semantic_next += 1
+
+    def get_cache_stats(self) -> dict[str, Any]:
         """
         Retorna estatísticas do cache.
 
         Returns:
-            Dict com size e capacity
+            Dict com size, capacity, hits, misses, evictions e hit_rate
         """
-        return {
-            "size": len(self.cache),
-            "capacity": self.cache_size,
-        }
+        return self.cache.stats()
 
     def clear_cache(self):
         """Limpa todo o cache."""
         self.cache.clear()
-        print("   🗑️  Cache limpo")
+        with self._semantic_lock:
+            self._semantic_embs = None
+            self._semantic_keys = [None] * self.cache_size
+            self._semantic_next = 0
+        logger.debug("Cache limpo")
 
-    async def run(self, question: str) -> dict:
+    async def run(self, question: str, stream_queue: asyncio.Queue | None = None) -> dict:
         """
         Executa o agente RAG com cache e sanitização de input.
 
         Args:
             question: Pergunta do usuário
+            stream_queue: Fila que recebe a resposta em chunks (ver run_stream)
 
         Returns:
             Dict com answer, sources, retrieved_docs, cached
         """
-        print(f"\n{'=' * 80}")
-        print("🤖 FaqRagAgent: Processando pergunta")
-        print(f"{'=' * 80}")
+        logger.debug("FaqRagAgent: processando pergunta")
 
         # SANITIZA O INPUT PARA PREVENIR PROMPT INJECTION
         # Permite quebras de linha pois perguntas podem ser multilinhas
         question = sanitize_prompt_input(question, max_length=500, allow_multiline=True)
 
-        # Tenta buscar no cache
-        cached_result = self._get_from_cache(question)
+        # Tenta buscar no cache (chave calculada uma vez por execução)
+        cache_key = self._get_cache_key(question)
+        cached_result = self._get_from_cache(cache_key)
+
+        # Cache semântico: perguntas parecidas reaproveitam a mesma resposta.
+        # O embedding calculado aqui é reaproveitado pela busca no grafo.
+        query_embedding = None
+        embedding = None
+        if cached_result is None and self.semantic_threshold is not None:
+            query_embedding = await self.search_coordinator.embed(question)
+            embedding = np.asarray(query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(embedding)
+            if norm:
+                embedding /= norm
+            cached_result = self._get_from_semantic_cache(embedding)
 
         if cached_result is not None:
-            print(f"{'=' * 80}\n")
+            # Cache hit: a resposta inteira vai num único chunk
+            if stream_queue is not None:
+                await stream_queue.put(cached_result["answer"])
             return {
                 "answer": cached_result["answer"],
                 "sources": cached_result["sources"],
@@ -352,27 +540,23 @@ Responda em {language}."""
             }
 
         # Não está no cache - executa workflow normal
-        print("   🔄 Cache miss - executando workflow RAG...")
+        logger.debug("Cache miss - executando workflow RAG")
 
         # Estado inicial
-        initial_state = {
-            "question": question,
-            "retrieved_docs": [],
-            "context": "",
-            "answer": "",
-            "sources": [],
-            "messages": [],
-        }
+        initial_state = RagState(question=question, query_embedding=query_embedding)
 
         # Executa o grafo
-        final_state = await self.graph.ainvoke(initial_state) # type: ignore
+        final_state = await self.graph.ainvoke(
+            initial_state,
+            config={"configurable": {"agent": self, "stream_queue": stream_queue}},
+        )
 
         # Salva no cache
         self._save_to_cache(
-            question=question, answer=final_state["answer"], sources=final_state["sources"]
+            cache_key=cache_key, answer=final_state["answer"], sources=final_state["sources"]
         )
-
-        print(f"{'=' * 80}\n")
+        if embedding is not None:
+            self._save_to_semantic_cache(cache_key, embedding)
 
         # Retorna resultado
         return {
@@ -382,11 +566,75 @@ Responda em {language}."""
             "cached": False,
         }
 
+    async def run_invoke(self, question: str, context: dict[str, Any] | None = None) -> str:
+        """
+        Executa o agente a partir de uma requisição de /agents/invoke.
+
+        Args:
+            question: Pergunta do usuário
+            context: Contexto da requisição (não usado; mesma assinatura
+                dos outros agentes no registry)
+
+        Returns:
+            Resposta gerada
+        """
+        result = await self.run(question)
+        return result["answer"]
+
+    async def run_stream(
+        self, question: str, context: dict[str, Any] | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Executa o agente RAG emitindo a resposta conforme é gerada.
+
+        Mesmo fluxo de run() (cache incluído): o primeiro chunk chega assim
+        que o LLM gera o primeiro token, em vez de ao fim da geração.
+
+        Args:
+            question: Pergunta do usuário
+            context: Contexto da requisição (não usado; mesma assinatura
+                dos outros agentes no registry)
+
+        Yields:
+            Chunks da resposta
+        """
+        queue: asyncio.Queue[str | None] = asyncio.Queue()
+        task = asyncio.create_task(self.run(question, stream_queue=queue))
+        # Sentinela no fim (sucesso ou erro): todos os chunks já estão na fila
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while (chunk := await queue.get()) is not None:
+                yield chunk
+            # Propaga erros da execução
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def run_batch(self, questions: list[str]) -> list[dict]:
+        """
+        Executa o agente para várias perguntas concorrentemente.
+
+        Cada pergunta passa pelo mesmo fluxo de run() (cache, retrieval,
+        geração); as execuções são disparadas em paralelo com asyncio.gather.
+
+        Args:
+            questions: Lista de perguntas
+
+        Returns:
+            Lista de resultados, na mesma ordem das perguntas
+        """
+        return list(await asyncio.gather(*(self.run(question) for question in questions)))
+
     def invoke_sync(self, question: str) -> dict:
-        """Versão síncrona do run() para compatibilidade."""
-        import asyncio
+        """
+        Versão síncrona do run() para compatibilidade.
 
-        return asyncio.run(self.run(question))
+        Usa o event loop de background compartilhado em vez de asyncio.run(),
+        evitando criar um loop novo por chamada.
+        """
+        return run_sync(self.run(question))
 
 
 # ============================================================================
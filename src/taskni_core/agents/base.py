@@ -9,6 +9,7 @@ use diretamente LangGraph e registre no registry.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any
 
 
@@ -40,6 +41,22 @@ class BaseAgent(ABC):
         """
         ...
 
+    async def run_stream(self, message: str, context: dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Executa o agente emitindo a resposta em chunks (usado por /agents/stream).
+
+        Por padrão emite a resposta de run() num único chunk; agentes que
+        chamam o LLM diretamente podem sobrescrever com streaming token a token.
+
+        Args:
+            message: Mensagem do usuário
+            context: Contexto adicional (user_id, session_id, metadata, etc)
+
+        Yields:
+            Chunks da resposta
+        """
+        yield await self.run(message, context)
+
     def get_info(self) -> dict[str, str]:
         """Retorna informações sobre o agente."""
         return {
@@ -8,10 +8,11 @@ Este é um agente SIMPLES (não usa LangGraph), apenas LLM direto.
 Ideal para começar rápido sem complexidade.
 """
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 from taskni_core.agents.base import BaseAgent
-from taskni_core.core.settings import taskni_settings
+from taskni_core.core.settings import hot_settings
 
 
 class IntakeAgent(BaseAgent):
@@ -37,9 +38,9 @@ class IntakeAgent(BaseAgent):
     def llm(self):
         """Lazy load do LLM multi-provedor com fallback automático."""
         if self._llm is None:
-            from taskni_core.core.llm_provider import MultiProviderLLM
+            from taskni_core.core.llm_provider import get_shared_llm
 
-            self._llm = MultiProviderLLM(enable_streaming=True)
+            self._llm = get_shared_llm(enable_streaming=True)
         return self._llm
 
     async def run(self, message: str, context: dict[str, Any]) -> str:
@@ -53,18 +54,8 @@ class IntakeAgent(BaseAgent):
         Returns:
             Resposta do agente
         """
-        # Constrói o prompt de triagem
-        system_prompt = self._build_system_prompt()
-        user_prompt = self._build_user_prompt(message, context)
-
-        # Chama o LLM
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ]
-
         # Invoca o modelo
-        response = await self.llm.ainvoke(messages)
+        response = await self.llm.ainvoke(self._build_messages(message, context))
 
         # Extrai o conteúdo da resposta
         if hasattr(response, "content"):
@@ -74,10 +65,31 @@ class IntakeAgent(BaseAgent):
 
         return reply
 
+    async def run_stream(self, message: str, context: dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Executa a triagem emitindo a resposta conforme o LLM gera.
+
+        Args:
+            message: Mensagem do paciente
+            context: Contexto (user_id, session_id, metadata, etc)
+
+        Yields:
+            Chunks da resposta
+        """
+        async for chunk in self.llm.astream(self._build_messages(message, context)):
+            yield chunk
+
+    def _build_messages(self, message: str, context: dict[str, Any]) -> list[dict[str, str]]:
+        """Monta as mensagens (system + user) da triagem."""
+        return [
+            {"role": "system", "content": self._build_system_prompt()},
+            {"role": "user", "content": self._build_user_prompt(message, context)},
+        ]
+
     def _build_system_prompt(self) -> str:
         """Constrói o prompt de sistema do agente."""
-        business_name = taskni_settings.BUSINESS_NAME
-        language = taskni_settings.DEFAULT_LANGUAGE
+        business_name = hot_settings.business_name
+        language = hot_settings.default_language
 
         return f"""Você é um agente de triagem e atendimento inicial da {business_name}.
 
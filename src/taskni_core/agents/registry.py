@@ -7,17 +7,159 @@ Suporta dois tipos de agentes:
 
 Isso permite começar com agentes simples e evoluir para LangGraph
 conforme a complexidade aumenta.
-"""
 
-from typing import Any
+Padrão para agentes LangGraph: nodes independentes entre si (ex: vários
+revisores, buscas em fontes diferentes) devem sair do mesmo node (fan-out
+com várias arestas ou `Send`) e convergir num node de junção, em vez de
+serem encadeados. O LangGraph executa os nodes de um mesmo superstep em
+paralelo, então N chamadas ao LLM custam uma rodada em vez de N.
+Ex: FaqRagAgent (busca densa + BM25) e FollowupAgent (mensagem + agendamento).
+"""
 
-from langgraph.graph.state import CompiledStateGraph
+import asyncio
+import functools
+import logging
+import sys
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TYPE_CHECKING, Any, TypeAlias
 
 from taskni_core.agents.base import BaseAgent
 from taskni_core.core.settings import taskni_settings
 
+if TYPE_CHECKING:
+    # Só para tipagem: evita carregar o LangGraph ao importar o registry
+    from langgraph.graph.state import CompiledStateGraph
+
+logger = logging.getLogger(__name__)
+
 # Type alias para aceitar ambos os tipos
-AgentType = BaseAgent | CompiledStateGraph
+AgentType: TypeAlias = "BaseAgent | CompiledStateGraph"
+
+# Invoker de um agente já ligado à instância: (message, context) -> resposta
+AgentInvoker: TypeAlias = Callable[[str, dict[str, Any]], Awaitable[str]]
+
+# Streamer de um agente já ligado à instância: (message, context) -> chunks
+AgentStreamer: TypeAlias = Callable[[str, dict[str, Any]], AsyncIterator[str]]
+
+
+# Checkpointers do LangGraph que só têm implementação síncrona: dentro de um
+# ainvoke, todo acesso ao banco bloqueia o event loop (e serializa as requisições)
+_SYNC_CHECKPOINTERS = frozenset({"PostgresSaver", "SqliteSaver", "MongoDBSaver"})
+
+
+def _check_async_checkpointer(agent: Any, agent_id: str):
+    """
+    Garante que um agente LangGraph não usa um checkpointer síncrono.
+
+    Args:
+        agent: Grafo compilado
+        agent_id: ID do agente (para a mensagem de erro)
+
+    Raises:
+        ValueError: Se o checkpointer for síncrono (use a versão Async*,
+            ex: AsyncPostgresSaver, criada uma vez no lifespan)
+    """
+    checkpointer = getattr(agent, "checkpointer", None)
+    saver_name = type(checkpointer).__name__
+    if saver_name in _SYNC_CHECKPOINTERS:
+        raise ValueError(
+            f"Agente '{agent_id}' usa checkpointer síncrono ({saver_name}); use Async{saver_name}"
+        )
+
+
+async def _invoke_simple_agent(agent: BaseAgent, message: str, context: dict[str, Any]) -> str:
+    """Invoca um agente simples (BaseAgent)."""
+    return await agent.run(message=message, context=context)
+
+
+async def _invoke_langgraph_agent(
+    agent: "CompiledStateGraph",
+    message: str,
+    context: dict[str, Any],
+) -> str:
+    """
+    Invoca um agente LangGraph.
+
+    Args:
+        agent: Agente compilado do LangGraph
+        message: Mensagem do usuário
+        context: Contexto adicional
+
+    Returns:
+        Resposta do agente
+    """
+    # Prepara o input para o LangGraph
+    # TODO: Adaptar conforme a estrutura do state do seu grafo
+    input_state = {
+        "messages": [{"role": "user", "content": message}],
+        **context,
+    }
+
+    # Invoca o grafo
+    result = await agent.ainvoke(input_state)
+
+    # Extrai a resposta
+    # TODO: Adaptar conforme a estrutura do output do seu grafo
+    if isinstance(result, dict) and "messages" in result:
+        last_message = result["messages"][-1]
+        if hasattr(last_message, "content"):
+            return last_message.content
+        return str(last_message)
+
+    return str(result)
+
+
+def _stream_simple_agent(
+    agent: BaseAgent, message: str, context: dict[str, Any]
+) -> AsyncIterator[str]:
+    """Stream de um agente simples (BaseAgent.run_stream)."""
+    return agent.run_stream(message, context)
+
+
+async def _invoke_custom_agent(agent: Any, message: str, context: dict[str, Any]) -> str:
+    """Invoca um agente avançado com run_invoke próprio (ex: FaqRagAgent, FollowupAgent)."""
+    return await agent.run_invoke(message, context)
+
+
+def _stream_custom_agent(agent: Any, message: str, context: dict[str, Any]) -> AsyncIterator[str]:
+    """Stream de um agente avançado com run_stream próprio (ex: FaqRagAgent, FollowupAgent)."""
+    return agent.run_stream(message, context)
+
+
+async def _stream_from_invoker(
+    invoker: AgentInvoker, message: str, context: dict[str, Any]
+) -> AsyncIterator[str]:
+    """Stream de um agente sem streaming próprio: a resposta inteira num único chunk."""
+    yield await invoker(message, context)
+
+
+async def _stream_langgraph_agent(
+    agent: "CompiledStateGraph",
+    message: str,
+    context: dict[str, Any],
+) -> AsyncIterator[str]:
+    """
+    Stream de um agente LangGraph (tokens das mensagens de IA).
+
+    Args:
+        agent: Agente compilado do LangGraph
+        message: Mensagem do usuário
+        context: Contexto adicional
+
+    Yields:
+        Chunks de texto gerados pelos nodes do grafo
+    """
+    input_state = {
+        "messages": [{"role": "user", "content": message}],
+        **context,
+    }
+
+    async for chunk, _ in agent.astream(input_state, stream_mode="messages"):
+        # Só mensagens da IA (ignora mensagens de tool, etc)
+        if getattr(chunk, "type", None) in ("AIMessageChunk", "ai"):
+            content = getattr(chunk, "content", None)
+            if isinstance(content, str) and content:
+                yield content
 
 
 class AgentRegistry:
@@ -31,6 +173,12 @@ class AgentRegistry:
     def __init__(self):
         self._agents: dict[str, AgentType] = {}
         self._metadata: dict[str, dict[str, Any]] = {}
+        # Invokers dos agentes habilitados, resolvidos no registro: o caminho
+        # de invocação é um único lookup, sem isinstance nem metadados
+        self._invokers: dict[str, AgentInvoker] = {}
+        self._streamers: dict[str, AgentStreamer] = {}
+        # Incrementado a cada mudança no registro (usado como ETag da listagem)
+        self.version = 0
 
     def register(
         self,
@@ -51,20 +199,46 @@ class AgentRegistry:
             enabled: Se o agente está habilitado
         """
         # Tenta extrair metadados do agente
+        invoker: AgentInvoker
+        streamer: AgentStreamer
         if isinstance(agent, BaseAgent):
             agent_id = agent_id or agent.id
             name = name or agent.name
             description = description or agent.description
             agent_type = "simple"
+            invoker = functools.partial(_invoke_simple_agent, agent)
+            streamer = functools.partial(_stream_simple_agent, agent)
         else:
             # É um CompiledStateGraph do LangGraph
             if not agent_id:
                 raise ValueError("agent_id é obrigatório para agentes LangGraph")
+            _check_async_checkpointer(agent, agent_id)
             name = name or agent_id
             description = description or "Agente LangGraph"
             agent_type = "langgraph"
+            if hasattr(agent, "run_invoke"):
+                # Agentes avançados não são grafos: não têm ainvoke
+                invoker = functools.partial(_invoke_custom_agent, agent)
+            else:
+                invoker = functools.partial(_invoke_langgraph_agent, agent)
+            if hasattr(agent, "run_stream"):
+                streamer = functools.partial(_stream_custom_agent, agent)
+            elif hasattr(agent, "astream"):
+                streamer = functools.partial(_stream_langgraph_agent, agent)
+            else:
+                # Sem streaming próprio: emite a resposta do invoker
+                streamer = functools.partial(_stream_from_invoker, invoker)
+
+        agent_id = sys.intern(agent_id)
 
         self._agents[agent_id] = agent
+        if enabled:
+            self._invokers[agent_id] = invoker
+            self._streamers[agent_id] = streamer
+        else:
+            self._invokers.pop(agent_id, None)
+            self._streamers.pop(agent_id, None)
+        self.version += 1
         self._metadata[agent_id] = {
             "id": agent_id,
             "name": name,
@@ -86,14 +260,69 @@ class AgentRegistry:
         Raises:
             ValueError: Se o agente não existe ou está desabilitado
         """
+        if agent_id not in self._agents or not self._metadata[agent_id].get("enabled", True):
+            raise self._lookup_error(agent_id)
+
+        return self._agents[agent_id]
+
+    def _lookup_error(self, agent_id: str) -> ValueError:
+        """Erro para um agente fora dos habilitados (não encontrado ou desabilitado)."""
         if agent_id not in self._agents:
-            raise ValueError(f"Agente '{agent_id}' não encontrado")
+            return ValueError(f"Agente '{agent_id}' não encontrado")
+        return ValueError(f"Agente '{agent_id}' está desabilitado")
 
-        metadata = self._metadata[agent_id]
-        if not metadata.get("enabled", True):
-            raise ValueError(f"Agente '{agent_id}' está desabilitado")
+    def get_invoker(self, agent_id: str) -> AgentInvoker:
+        """
+        Obtém a função de invocação de um agente.
 
-        return self._agents[agent_id]
+        Args:
+            agent_id: ID do agente
+
+        Returns:
+            Corrotina `(message, context) -> resposta` já ligada ao agente
+
+        Raises:
+            ValueError: Se o agente não existe ou está desabilitado
+        """
+        invoker = self._invokers.get(agent_id)
+        if invoker is None:
+            raise self._lookup_error(agent_id)
+        return invoker
+
+    def get_streamer(self, agent_id: str) -> AgentStreamer:
+        """
+        Obtém a função de streaming de um agente.
+
+        Args:
+            agent_id: ID do agente
+
+        Returns:
+            Função `(message, context) -> chunks` já ligada ao agente
+
+        Raises:
+            ValueError: Se o agente não existe ou está desabilitado
+        """
+        streamer = self._streamers.get(agent_id)
+        if streamer is None:
+            raise self._lookup_error(agent_id)
+        return streamer
+
+    async def invoke(self, agent_id: str, message: str, context: dict[str, Any]) -> str:
+        """
+        Invoca um agente pelo ID, qualquer que seja o tipo.
+
+        Args:
+            agent_id: ID do agente
+            message: Mensagem do usuário
+            context: Contexto adicional
+
+        Returns:
+            Resposta do agente
+
+        Raises:
+            ValueError: Se o agente não existe ou está desabilitado
+        """
+        return await self.get_invoker(agent_id)(message, context)
 
     def list_agents(self, include_disabled: bool = False) -> list[dict[str, Any]]:
         """
@@ -113,15 +342,13 @@ class AgentRegistry:
 
     def is_simple_agent(self, agent_id: str) -> bool:
         """Verifica se é um agente simples (BaseAgent)."""
-        if agent_id not in self._metadata:
-            return False
-        return self._metadata[agent_id]["type"] == "simple"
+        metadata = self._metadata.get(agent_id)
+        return metadata is not None and metadata["type"] == "simple"
 
     def is_langgraph_agent(self, agent_id: str) -> bool:
         """Verifica se é um agente LangGraph."""
-        if agent_id not in self._metadata:
-            return False
-        return self._metadata[agent_id]["type"] == "langgraph"
+        metadata = self._metadata.get(agent_id)
+        return metadata is not None and metadata["type"] == "langgraph"
 
 
 # Singleton global
@@ -171,6 +398,8 @@ def register_taskni_agents():
             from taskni_core.agents.advanced.rag_agent import create_faq_rag_agent
 
             # Cria e registra o agente RAG
+            # (carrega o pipeline de ingestão compartilhado - vector store e
+            # embeddings - aqui na subida, e não na primeira requisição)
             faq_agent = create_faq_rag_agent(k_documents=4, enable_streaming=True)
 
             agent_registry.register(
@@ -181,7 +410,7 @@ def register_taskni_agents():
                 enabled=True,
             )
         except ImportError as e:
-            print(f"⚠️  Não foi possível carregar FaqRagAgent: {e}")
+            logger.warning("Não foi possível carregar FaqRagAgent: %s", e)
             pass  # Agente ainda não implementado
 
     # Follow-up Agent
@@ -200,7 +429,7 @@ def register_taskni_agents():
                 enabled=True,
             )
         except ImportError as e:
-            print(f"⚠️  Não foi possível carregar FollowupAgent: {e}")
+            logger.warning("Não foi possível carregar FollowupAgent: %s", e)
             pass  # Agente ainda não implementado
 
     # Billing Agent
@@ -225,3 +454,61 @@ def register_taskni_agents():
     #     description="Chatbot geral usando LangGraph",
     #     enabled=True,
     # )
+
+
+async def prewarm_taskni_agents(pipeline: Any | None = None):
+    """
+    Aquece LLM, embedder e vector store dos agentes registrados.
+
+    A primeira requisição real pagaria o handshake com o provider do LLM, a
+    primeira chamada ao embedder e o carregamento do índice do ChromaDB
+    (feito só na primeira consulta); aqui esse custo é pago na subida do app.
+    Erros são apenas logados (o app sobe mesmo sem aquecimento).
+
+    Args:
+        pipeline: Pipeline de ingestão das rotas RAG (aquecido mesmo que
+            nenhum agente o use)
+    """
+    llms: dict[int, Any] = {}
+    pipelines: dict[int, Any] = {}
+    if pipeline is not None:
+        pipelines[id(pipeline)] = pipeline
+
+    for agent in agent_registry._agents.values():
+        llm = getattr(agent, "llm", None)
+        if llm is not None:
+            # Desembrulha o BatchedLLMClient: agentes compartilham o mesmo LLM
+            llm = getattr(llm, "llm", llm)
+            llms[id(llm)] = llm
+
+        ingestion = getattr(agent, "ingestion", None)
+        if ingestion is not None:
+            pipelines[id(ingestion)] = ingestion
+
+    async def warm_llm(llm: Any):
+        await llm.ainvoke([{"role": "user", "content": "ping"}], max_tokens=1)
+
+    def warm_pipeline(ingestion: Any):
+        # Busca k=1: carrega o índice HNSW da coleção para a memória
+        embedding = ingestion.embed_query("warmup")
+        ingestion.search_by_vector(embedding, k=1)
+
+    async def warm_embedder(ingestion: Any):
+        await asyncio.to_thread(warm_pipeline, ingestion)
+
+    results = await asyncio.gather(
+        *(warm_llm(llm) for llm in llms.values()),
+        *(warm_embedder(ingestion) for ingestion in pipelines.values()),
+        return_exceptions=True,
+    )
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    for error in errors:
+        logger.warning("Falha ao aquecer agente: %s", error)
+
+    logger.info(
+        "Aquecimento concluído (%d LLM(s), %d embedder(s), %d falha(s))",
+        len(llms),
+        len(pipelines),
+        len(errors),
+    )
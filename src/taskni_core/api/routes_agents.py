@@ -1,24 +1,33 @@
 """
 Rotas para agentes.
 
-Endpoints para listar, invocar e fazer stream de agentes.
+Endpoints para listar, invocar (individual ou em lote) e fazer stream de agentes.
 """
 
+import asyncio
+import functools
+import json
 import logging
-from typing import Any
+from collections.abc import AsyncIterator
+from typing import Any, TypeVar
 
-from fastapi import APIRouter, HTTPException, Request
-from langgraph.graph.state import CompiledStateGraph
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from slowapi import Limiter  # type: ignore
 from slowapi.util import get_remote_address  # type: ignore
 
-from taskni_core.agents.base import BaseAgent
 from taskni_core.agents.registry import agent_registry
 from taskni_core.schema.agent_io import (
+    INVOKE_ADAPTER,
+    STREAM_ADAPTER,
     AgentInvokeRequest,
     AgentInvokeResponse,
     AgentListItem,
+    AgentStreamRequest,
 )
+from taskni_core.schema.metadata_schemas import ResponseMetadata
 from taskni_core.utils.error_handler import safe_str_exception
 
 logger = logging.getLogger(__name__)
@@ -28,6 +37,41 @@ router = APIRouter()
 # Inicializa limiter (será injetado pelo app)
 limiter = Limiter(key_func=get_remote_address)
 
+# Campos do payload repassados aos agentes como contexto
+_CONTEXT_FIELDS: set[str] = {"user_id", "session_id", "thread_id", "metadata"}
+
+# Limites do /invoke/batch
+MAX_BATCH_SIZE = 10
+MAX_BATCH_CONCURRENCY = 10
+
+# /invoke e /invoke/batch dividem o mesmo limite por IP; cada mensagem de um
+# lote conta como uma invocação (o lote não contorna o limite do /invoke)
+_INVOKE_RATE_LIMIT = "10/minute"
+_INVOKE_RATE_SCOPE = "agents-invoke"
+
+
+def _invocation_cost(request: Request) -> int:
+    """Custo de uma requisição no limite compartilhado: número de mensagens."""
+    return getattr(request.state, "invocation_count", 1)
+
+
+_AGENT_LIST_ADAPTER = TypeAdapter(list[AgentListItem])
+
+
+@functools.lru_cache(maxsize=4)
+def _agent_list_json(registry_version: int) -> bytes:
+    """
+    Listagem de agentes serializada, cacheada por versão do registry.
+
+    Args:
+        registry_version: agent_registry.version (só usado como chave)
+
+    Returns:
+        JSON da lista de agentes habilitados
+    """
+    agents = agent_registry.list_agents(include_disabled=False)
+    return _AGENT_LIST_ADAPTER.dump_json([AgentListItem(**agent) for agent in agents])
+
 
 @router.get("/", response_model=list[AgentListItem])
 @limiter.limit("60/minute")  # 60 requests por minuto - menos crítico
@@ -35,63 +79,178 @@ async def list_agents(request: Request):
     """
     Lista todos os agentes disponíveis.
 
+    A resposta tem ETag (versão do registry): clientes que reenviam o ETag
+    em If-None-Match recebem 304 enquanto os agentes não mudarem.
+
     Rate limit: 60 requests/minuto por IP
 
     Returns:
         Lista de agentes com seus metadados
     """
-    agents = agent_registry.list_agents(include_disabled=False)
-    return [AgentListItem(**agent) for agent in agents]
+    version = agent_registry.version
+    headers = {"ETag": f'W/"{version}"', "Cache-Control": "no-cache"}
+
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
 
+    return Response(
+        content=_agent_list_json(version), media_type="application/json", headers=headers
+    )
+
+
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
 
-@router.post("/invoke", response_model=AgentInvokeResponse)
-@limiter.limit("10/minute")  # 10 requests por minuto - CRÍTICO
-async def invoke_agent(request: Request, payload: AgentInvokeRequest):
+
+def _validate_body(adapter: TypeAdapter[_ModelT], body: bytes) -> _ModelT:
+    """
+    Valida o corpo JSON cru com o adapter pré-compilado.
+
+    Erros viram RequestValidationError com loc ("body", ...), o mesmo 422
+    que o FastAPI devolve para corpos declarados como parâmetro.
+
+    Args:
+        adapter: TypeAdapter do modelo do payload
+        body: Bytes do corpo da requisição
+
+    Returns:
+        Payload validado
+    """
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        errors = []
+        for error in e.errors(include_url=False):
+            error["loc"] = ("body", *error["loc"])
+            if error["type"] == "json_invalid":
+                # Como no FastAPI: não ecoa o corpo cru (bytes) no erro
+                error["input"] = {}
+            errors.append(error)
+        raise RequestValidationError(errors)
+
+
+def _openapi_body(model: type[BaseModel]) -> dict[str, Any]:
+    """
+    Documenta no OpenAPI um corpo validado fora do FastAPI.
+
+    O schema do modelo vai inline; os modelos aninhados (RequestMetadata)
+    são referenciados em components/schemas, onde o corpo declarado de
+    /invoke/batch já os registra.
+    """
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    schema.pop("$defs", None)
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
+
+async def _invoke_payload(request: Request) -> AgentInvokeRequest:
+    return _validate_body(INVOKE_ADAPTER, await request.body())
+
+
+async def _batch_payloads(
+    request: Request, payloads: list[AgentInvokeRequest] = Body(...)
+) -> list[AgentInvokeRequest]:
+    """
+    Valida o tamanho do lote e registra o custo dele no rate limit.
+
+    Roda antes do limiter (que cobra _invocation_cost): lotes grandes demais
+    são recusados sem consumir o limite.
+    """
+    if len(payloads) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Lote muito grande: máximo de {MAX_BATCH_SIZE} mensagens",
+        )
+    request.state.invocation_count = len(payloads)
+    return payloads
+
+
+async def _stream_payload(request: Request) -> AgentStreamRequest:
+    return _validate_body(STREAM_ADAPTER, await request.body())
+
+
+@router.post(
+    "/invoke",
+    response_model=AgentInvokeResponse,
+    openapi_extra=_openapi_body(AgentInvokeRequest),
+)
+@limiter.shared_limit(_INVOKE_RATE_LIMIT, scope=_INVOKE_RATE_SCOPE)  # CRÍTICO
+async def invoke_agent(request: Request, payload: AgentInvokeRequest = Depends(_invoke_payload)):
     """
     Invoca um agente com uma mensagem.
 
+    Rate limit: 10 invocações/minuto por IP (compartilhado com /invoke/batch)
+
     Args:
         payload: Dados da requisição (agent_id, message, etc)
 
     Returns:
         Resposta do agente
 
+    Raises:
+        HTTPException: Se o agente não existe ou erro na execução
+    """
+    return await _invoke_one(payload)
+
+
+@router.post("/invoke/batch", response_model=list[AgentInvokeResponse])
+@limiter.shared_limit(_INVOKE_RATE_LIMIT, scope=_INVOKE_RATE_SCOPE, cost=_invocation_cost)
+async def invoke_agent_batch(
+    request: Request, payloads: list[AgentInvokeRequest] = Depends(_batch_payloads)
+):
+    """
+    Invoca agentes para várias mensagens numa única requisição.
+
+    As invocações rodam concorrentemente (até MAX_BATCH_CONCURRENCY por vez);
+    chamadas ao LLM que caem na mesma janela são agrupadas num único batch
+    no provider. Se alguma invocação falhar, a requisição inteira falha.
+
+    Rate limit: compartilhado com /invoke (10 invocações/minuto por IP),
+    cobrando uma invocação por mensagem do lote
+
+    Args:
+        payloads: Lista de requisições (agent_id, message, etc)
+
+    Returns:
+        Respostas dos agentes, na mesma ordem das requisições
+
+    Raises:
+        HTTPException: Lote grande demais, agente inexistente ou erro na execução
+    """
+    semaphore = asyncio.Semaphore(MAX_BATCH_CONCURRENCY)
+
+    async def invoke(payload: AgentInvokeRequest) -> AgentInvokeResponse:
+        async with semaphore:
+            return await _invoke_one(payload)
+
+    return list(await asyncio.gather(*(invoke(payload) for payload in payloads)))
+
+
+async def _invoke_one(payload: AgentInvokeRequest) -> AgentInvokeResponse:
+    """
+    Invoca um agente (lógica comum de /invoke e /invoke/batch).
+
+    Args:
+        payload: Dados da requisição
+
+    Returns:
+        Resposta do agente
+
     Raises:
         HTTPException: Se o agente não existe ou erro na execução
     """
     try:
-        agent = agent_registry.get(payload.agent_id)
+        invoker = agent_registry.get_invoker(payload.agent_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-    # Prepara o contexto
-    # Converte metadata tipado para dicionário (compatibilidade com agentes)
-    context = {
-        "user_id": payload.user_id,
-        "session_id": payload.session_id,
-        "thread_id": payload.thread_id,
-        "metadata": payload.metadata.model_dump(exclude_none=True),
-    }
+    # Prepara o contexto (user_id, session_id, thread_id, metadata)
+    # Um único model_dump do payload; campos None são omitidos
+    context = payload.model_dump(include=_CONTEXT_FIELDS, exclude_none=True)
 
     try:
-        # Executa o agente baseado no tipo
-        if isinstance(agent, BaseAgent):
-            # Agente simples
-            reply = await agent.run(
-                message=payload.message,
-                context=context,
-            )
-        else:
-            # Agente LangGraph
-            reply = await _invoke_langgraph_agent(
-                agent=agent,
-                message=payload.message,
-                context=context,
-            )
+        # Executa o agente (invoker já resolvido pelo tipo no registro)
+        reply = await invoker(payload.message, context)
 
         # Cria resposta com metadata vazio (pode ser populado depois)
-        from taskni_core.schema.metadata_schemas import ResponseMetadata
-
         return AgentInvokeResponse(
             agent_id=payload.agent_id,
             reply=reply,
@@ -117,54 +276,63 @@ async def invoke_agent(request: Request, payload: AgentInvokeRequest):
         )
 
 
-async def _invoke_langgraph_agent(
-    agent: CompiledStateGraph,
-    message: str,
-    context: dict[str, Any],
-) -> str:
+@router.post("/stream", openapi_extra=_openapi_body(AgentStreamRequest))
+@limiter.limit("5/minute")  # 5 requests por minuto - streaming é custoso
+async def stream_agent(request: Request, payload: AgentStreamRequest = Depends(_stream_payload)):
     """
-    Invoca um agente LangGraph.
+    Stream de resposta do agente via Server-Sent Events (SSE).
 
-    Args:
-        agent: Agente compilado do LangGraph
-        message: Mensagem do usuário
-        context: Contexto adicional
+    Cada chunk é enviado como `data: {"chunk": "..."}` assim que é gerado;
+    o fim do stream é sinalizado com `event: end`. Todos os tipos de agente
+    suportam stream (agentes sem streaming próprio emitem a resposta
+    inteira num único chunk).
 
-    Returns:
-        Resposta do agente
+    Rate limit: 5 requests/minuto por IP
+
+    Raises:
+        HTTPException: Se o agente não existe (404) ou recusa a entrada (422)
     """
-    # Prepara o input para o LangGraph
-    # TODO: Adaptar conforme a estrutura do state do seu grafo
-    input_state = {
-        "messages": [{"role": "user", "content": message}],
-        **context,
-    }
+    try:
+        streamer = agent_registry.get_streamer(payload.agent_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-    # Invoca o grafo
-    result = await agent.ainvoke(input_state)
+    context = payload.model_dump(include=_CONTEXT_FIELDS, exclude_none=True)
 
-    # Extrai a resposta
-    # TODO: Adaptar conforme a estrutura do output do seu grafo
-    if isinstance(result, dict) and "messages" in result:
-        last_message = result["messages"][-1]
-        if hasattr(last_message, "content"):
-            return last_message.content
-        return str(last_message)
+    try:
+        # Agentes que validam a entrada o fazem aqui, antes do stream começar
+        chunks = streamer(payload.message, context)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
-    return str(result)
+    return StreamingResponse(
+        _sse_events(chunks, payload.agent_id),
+        media_type="text/event-stream",
+        # Sem buffering em proxies (nginx) nem caches: cada chunk sai na hora
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@router.post("/stream")
-@limiter.limit("5/minute")  # 5 requests por minuto - streaming é custoso
-async def stream_agent(request: Request, payload: AgentInvokeRequest):
+async def _sse_events(chunks: AsyncIterator[str], agent_id: str) -> AsyncIterator[str]:
     """
-    Stream de resposta do agente.
+    Formata os chunks de um agente como eventos SSE.
 
-    Rate limit: 5 requests/minuto por IP
+    Args:
+        chunks: Chunks de resposta do agente
+        agent_id: ID do agente (para logs)
 
-    TODO: Implementar streaming com Server-Sent Events (SSE)
+    Yields:
+        Eventos SSE
     """
-    raise HTTPException(
-        status_code=501,
-        detail="Stream não implementado ainda. Use /invoke por enquanto.",
-    )
+    try:
+        async for chunk in chunks:
+            yield f"data: {json.dumps({'chunk': chunk}, ensure_ascii=False)}\n\n"
+        yield "event: end\ndata: {}\n\n"
+    except Exception as e:
+        # Loga detalhes internos NO SERVIDOR (não expõe ao cliente)
+        logger.error(
+            f"Erro no stream do agente {agent_id}: {safe_str_exception(e)}",
+            extra={"agent_id": agent_id, "error_type": e.__class__.__name__},
+        )
+        error = {"detail": "Erro ao executar agente. Nossa equipe foi notificada."}
+        yield f"event: error\ndata: {json.dumps(error, ensure_ascii=False)}\n\n"
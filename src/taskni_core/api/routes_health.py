@@ -2,12 +2,34 @@
 Rotas de health check.
 
 Endpoint simples para verificar se o serviço está rodando.
+
+Os corpos das respostas são constantes: são serializados uma única vez,
+no import, e devolvidos como bytes prontos (sem validação/serialização
+do FastAPI a cada probe).
 """
 
+import json
+
 from fastapi import APIRouter
+from fastapi.responses import Response
 
 router = APIRouter()
 
+_HEALTH_JSON = json.dumps(
+    {
+        "status": "ok",
+        "service": "taskni-core",
+        "version": "0.1.0",
+    }
+).encode()
+
+_READY_JSON = json.dumps(
+    {
+        "status": "ready",
+        "service": "taskni-core",
+    }
+).encode()
+
 
 @router.get("/")
 async def health_check():
@@ -16,11 +38,7 @@ async def health_check():
 
     Retorna status ok se o serviço está rodando.
     """
-    return {
-        "status": "ok",
-        "service": "taskni-core",
-        "version": "0.1.0",
-    }
+    return Response(content=_HEALTH_JSON, media_type="application/json")
 
 
 @router.get("/ready")
@@ -32,7 +50,5 @@ async def readiness_check():
     Pode incluir checagens de banco de dados, etc.
     """
     # TODO: Adicionar checagens de dependências (DB, APIs externas, etc)
-    return {
-        "status": "ready",
-        "service": "taskni-core",
-    }
+    # (quando houver, cachear o resultado "tudo ok" por ~1s)
+    return Response(content=_READY_JSON, media_type="application/json")
@@ -2,22 +2,27 @@
 Rotas para o sistema RAG (Retrieval-Augmented Generation).
 
 Endpoints:
-- POST /rag/upload - Upload de documentos (PDF, texto)
-- POST /rag/ingest/text - Ingestão de texto direto
+- POST /rag/upload - Upload de documentos (PDF, texto) - ingestão em background
+- POST /rag/ingest/text - Ingestão de texto direto - ingestão em background
+- GET /rag/jobs/{job_id} - Status de um job de ingestão
 - GET /rag/documents - Informações sobre documentos ingeridos
 - DELETE /rag/documents - Deleta coleção (cuidado!)
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
 import tempfile
 
-from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi import APIRouter, File, HTTPException, Request, Response, UploadFile
 from pydantic import BaseModel, Field
 from slowapi import Limiter  # type: ignore
 from slowapi.util import get_remote_address  # type: ignore
 
-from taskni_core.rag.ingest import get_ingestion_pipeline
+from taskni_core.core.settings import hot_settings
+from taskni_core.rag.ingest_jobs import DOC_HASH_METADATA_KEY, IngestJob, ingest_job_queue
 from taskni_core.schema.metadata_schemas import DocumentMetadata
 
 logger = logging.getLogger(__name__)
@@ -32,35 +37,167 @@ router = APIRouter(tags=["RAG"])
 limiter = Limiter(key_func=get_remote_address)
 
 
+def _get_pipeline(request: Request):
+    """
+    Retorna o pipeline de ingestão.
+
+    O pipeline é criado no lifespan do app e fica em `app.state.pipeline`
+    (um acesso de atributo por requisição). Se a criação na subida falhou,
+    tenta de novo aqui (import tardio de LangChain/ChromaDB/embeddings).
+    """
+    pipeline = getattr(request.app.state, "pipeline", None)
+    if pipeline is None:
+        from taskni_core.rag.ingest import get_ingestion_pipeline
+
+        pipeline = request.app.state.pipeline = get_ingestion_pipeline()
+    return pipeline
+
+
+# Extensões aceitas no upload
+_ALLOWED_EXTENSIONS = frozenset({".pdf", ".txt", ".md"})
+
+# Tamanho dos blocos lidos do upload
+_UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Tamanho máximo da metadata (JSON) de um upload
+MAX_METADATA_BYTES = 64 * 1024
+
+
+async def _save_upload(file: UploadFile, suffix: str) -> tuple[str, int, str]:
+    """
+    Salva um upload num arquivo temporário sem carregá-lo inteiro em memória.
+
+    O upload é lido em blocos de 1 MiB. Enquanto o total não passa de
+    UPLOAD_MEMORY_THRESHOLD_MB os blocos ficam num buffer e são gravados de
+    uma vez; acima disso o buffer é descarregado e o resto vai direto para o
+    disco, bloco a bloco. As escritas rodam numa thread para não bloquear o
+    event loop. O SHA-256 do conteúdo é calculado durante a leitura.
+
+    Args:
+        file: Arquivo enviado
+        suffix: Extensão do arquivo temporário (o loader depende dela)
+
+    Returns:
+        Tupla (caminho do arquivo temporário, tamanho em bytes, SHA-256 hex)
+    """
+    threshold = hot_settings.upload_memory_threshold_bytes
+    buffer = bytearray()
+    file_size = 0
+    hasher = hashlib.sha256()
+
+    fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                hasher.update(chunk)
+                if file_size <= threshold:
+                    buffer += chunk
+                    continue
+                if buffer:
+                    await asyncio.to_thread(tmp_file.write, buffer)
+                    buffer = bytearray()
+                await asyncio.to_thread(tmp_file.write, chunk)
+
+            if buffer:
+                await asyncio.to_thread(tmp_file.write, buffer)
+    except BaseException:
+        _remove_file(tmp_path)
+        raise
+
+    return tmp_path, file_size, hasher.hexdigest()
+
+
+async def _count_ingested(request: Request, content_hash: str) -> int:
+    """
+    Conta os chunks já ingeridos de um conteúdo (pelo SHA-256).
+
+    Args:
+        request: Requisição (dá acesso ao pipeline em app.state)
+        content_hash: SHA-256 hex do conteúdo original
+
+    Returns:
+        Número de chunks existentes (0 = conteúdo novo)
+    """
+    pipeline = _get_pipeline(request)
+    return await asyncio.to_thread(pipeline.count_documents, {DOC_HASH_METADATA_KEY: content_hash})
+
+
+def _remove_file(path: str):
+    """Remove um arquivo, ignorando se ele já não existir."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
 # ============================================================================
 # Schemas
 # ============================================================================
 
 
 class IngestTextRequest(BaseModel):
-    """Request para ingestão de texto direto."""
+    """
+    Request para ingestão de texto direto.
 
-    text: str
+    Envie `text` (será dividido em chunks) ou `chunks` (já divididos pelo
+    cliente: cada item vira um chunk, sem passar pelo text splitter).
+    """
+
+    text: str | None = None
+    chunks: list[str] | None = Field(
+        default=None, description="Chunks prontos (dispensa o chunking do servidor)"
+    )
     metadata: DocumentMetadata = Field(
         default_factory=DocumentMetadata, description="Metadados validados do documento"
     )
 
 
 class IngestTextResponse(BaseModel):
-    """Response da ingestão de texto."""
+    """Response da ingestão de texto (job enfileirado ou duplicado)."""
 
     message: str
-    chunks_count: int
+    job_id: str | None
+    status: str
     metadata: DocumentMetadata
+    chunks_count: int | None = None
 
 
 class UploadResponse(BaseModel):
-    """Response do upload de documento."""
+    """Response do upload de documento (job enfileirado ou duplicado)."""
 
     message: str
     filename: str
-    chunks_count: int
+    job_id: str | None
+    status: str
     file_size: int
+    chunks_count: int | None = None
+
+
+class IngestJobResponse(BaseModel):
+    """Status de um job de ingestão."""
+
+    job_id: str
+    source: str
+    status: str
+    chunks_count: int | None = None
+    error: str | None = None
+    duplicate: bool = False
+    created_at: str
+    finished_at: str | None = None
+
+    @classmethod
+    def from_job(cls, job: IngestJob) -> "IngestJobResponse":
+        return cls(
+            job_id=job.id,
+            source=job.source,
+            status=job.status,
+            chunks_count=job.chunks_count,
+            error=job.error,
+            duplicate=job.duplicate,
+            created_at=job.created_at.isoformat(),
+            finished_at=job.finished_at.isoformat() if job.finished_at else None,
+        )
 
 
 class DocumentsStatsResponse(BaseModel):
@@ -83,15 +220,21 @@ class DeleteResponse(BaseModel):
 # ============================================================================
 
 
-@router.post("/upload", response_model=UploadResponse)
+@router.post("/upload", response_model=UploadResponse, status_code=202)
 @limiter.limit("5/minute")  # 5 uploads por minuto - pode encher disco
 async def upload_document(
     request: Request,
+    response: Response,
     file: UploadFile = File(...),
     metadata: str | None = None,
 ):
     """
-    Upload e ingestão de documento (PDF ou texto).
+    Upload de documento (PDF ou texto) com ingestão em background.
+
+    O arquivo é salvo e a ingestão é enfileirada; a resposta sai logo em
+    seguida com o id do job (acompanhe em GET /rag/jobs/{job_id}).
+    Se um arquivo com o mesmo conteúdo (SHA-256) já foi ingerido, nada é
+    enfileirado e a resposta é 200 com status "duplicate".
 
     Rate limit: 5 requests/minuto por IP
 
@@ -100,62 +243,77 @@ async def upload_document(
         metadata: Metadata adicional (JSON string opcional)
 
     Returns:
-        Informações sobre a ingestão
+        Informações sobre o job de ingestão
     """
     # Valida extensão
     filename = file.filename or "unknown"
     file_extension = os.path.splitext(filename)[1].lower()
 
-    if file_extension not in [".pdf", ".txt", ".md"]:
+    if file_extension not in _ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail=f"Formato não suportado: {file_extension}. Use .pdf, .txt ou .md",
         )
 
-    # Lê conteúdo do arquivo
-    content = await file.read()
-    file_size = len(content)
-
-    # Salva temporariamente
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension, mode="wb") as tmp_file:
-        tmp_file.write(content)
-        tmp_path = tmp_file.name
-
+    # Parse metadata se fornecido (antes de gravar o arquivo)
+    metadata_dict = {}
+    if metadata:
+        # Rejeita metadata gigante antes de parsear
+        if len(metadata) > MAX_METADATA_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Metadata muito grande (máximo {MAX_METADATA_BYTES // 1024}KB)",
+            )
+        try:
+            metadata_dict = json.loads(metadata)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Metadata inválida. Use formato JSON.")
+        if not isinstance(metadata_dict, dict):
+            raise HTTPException(status_code=400, detail="Metadata deve ser um objeto JSON.")
+
+    # Salva temporariamente (em blocos, sem ler o arquivo inteiro em memória)
+    tmp_path, file_size, content_hash = await _save_upload(file, file_extension)
+
+    # Enfileira a ingestão (o worker remove o arquivo temporário ao terminar)
     try:
-        # Pipeline de ingestão
-        pipeline = get_ingestion_pipeline()
-
-        # Parse metadata se fornecido
-        import json
-
-        metadata_dict = {}
-        if metadata:
-            try:
-                metadata_dict = json.loads(metadata)
-            except json.JSONDecodeError:
-                raise HTTPException(status_code=400, detail="Metadata inválida. Use formato JSON.")
-
-        # Ingere arquivo
-        chunks_count = pipeline.ingest_file(file_path=tmp_path, metadata=metadata_dict)
-
-        return UploadResponse(
-            message=f"Documento '{filename}' ingerido com sucesso",
-            filename=filename,
-            chunks_count=chunks_count,
-            file_size=file_size,
+        existing = await _count_ingested(request, content_hash)
+        if existing:
+            _remove_file(tmp_path)
+            response.status_code = 200
+            return UploadResponse(
+                message=f"Documento '{filename}' já ingerido, nada a fazer",
+                filename=filename,
+                job_id=None,
+                status="duplicate",
+                file_size=file_size,
+                chunks_count=existing,
+            )
+
+        job = ingest_job_queue.submit_file(
+            tmp_path, source=filename, metadata=metadata_dict, content_hash=content_hash
         )
-
-    finally:
-        # Remove arquivo temporário
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+    except Exception:
+        _remove_file(tmp_path)
+        raise
+
+    return UploadResponse(
+        message=f"Documento '{filename}' recebido, ingestão em andamento",
+        filename=filename,
+        job_id=job.id,
+        status=job.status,
+        file_size=file_size,
+    )
 
 
-@router.post("/ingest/text", response_model=IngestTextResponse)
+@router.post("/ingest/text", response_model=IngestTextResponse, status_code=202)
 @limiter.limit("10/minute")  # 10 ingestões de texto por minuto
-async def ingest_text(request: Request, payload: IngestTextRequest):
+async def ingest_text(request: Request, response: Response, payload: IngestTextRequest):
     """
-    Ingere texto direto (sem arquivo).
+    Ingere texto direto (sem arquivo), em background.
+
+    Aceita texto corrido ou chunks prontos (ver IngestTextRequest). Conteúdo
+    idêntico (SHA-256) a um já ingerido não é reingerido: a resposta é 200
+    com status "duplicate".
 
     Rate limit: 10 requests/minuto por IP
 
@@ -163,27 +321,76 @@ async def ingest_text(request: Request, payload: IngestTextRequest):
         payload: Texto e metadata opcional
 
     Returns:
-        Informações sobre a ingestão
+        Informações sobre o job de ingestão
     """
-    if not payload.text or not payload.text.strip():
+    # Chunks prontos: descarta os vazios
+    chunks = [chunk for chunk in payload.chunks or [] if chunk.strip()]
+
+    if payload.chunks is not None:
+        if not chunks:
+            raise HTTPException(status_code=400, detail="Chunks não podem estar vazios")
+        # Separador que não aparece em texto: chunks diferentes, hashes diferentes
+        content = "\x00".join(chunks)
+    elif payload.text and payload.text.strip():
+        content = payload.text
+    else:
         raise HTTPException(status_code=400, detail="Texto não pode estar vazio")
 
-    # Pipeline de ingestão
-    pipeline = get_ingestion_pipeline()
-
     # Converte metadata tipado para dicionário
     metadata_dict = payload.metadata.model_dump(exclude_none=True)
 
-    # Ingere texto
-    chunks_count = pipeline.ingest_text_direct(text=payload.text, metadata=metadata_dict)
+    # Deduplicação pelo conteúdo
+    content_hash = hashlib.sha256(content.encode()).hexdigest()
+    existing = await _count_ingested(request, content_hash)
+    if existing:
+        response.status_code = 200
+        return IngestTextResponse(
+            message="Texto já ingerido, nada a fazer",
+            job_id=None,
+            status="duplicate",
+            metadata=payload.metadata,
+            chunks_count=existing,
+        )
+
+    # Enfileira a ingestão
+    if payload.chunks is not None:
+        job = ingest_job_queue.submit_chunks(
+            chunks=chunks, metadata=metadata_dict, content_hash=content_hash
+        )
+    else:
+        job = ingest_job_queue.submit_text(
+            text=content, metadata=metadata_dict, content_hash=content_hash
+        )
 
     return IngestTextResponse(
-        message="Texto ingerido com sucesso",
-        chunks_count=chunks_count,
+        message="Texto recebido, ingestão em andamento",
+        job_id=job.id,
+        status=job.status,
         metadata=payload.metadata,
     )
 
 
+@router.get("/jobs/{job_id}", response_model=IngestJobResponse)
+@limiter.limit("60/minute")  # 60 consultas por minuto - polling de status
+async def get_ingest_job(request: Request, job_id: str):
+    """
+    Retorna o status de um job de ingestão.
+
+    Rate limit: 60 requests/minuto por IP
+
+    Args:
+        job_id: Id retornado por /rag/upload ou /rag/ingest/text
+
+    Returns:
+        Status do job (queued, running, done ou failed)
+    """
+    job = ingest_job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' não encontrado")
+
+    return IngestJobResponse.from_job(job)
+
+
 @router.get("/documents", response_model=DocumentsStatsResponse)
 @limiter.limit("30/minute")  # 30 consultas por minuto - menos crítico
 async def get_documents_stats(request: Request):
@@ -195,7 +402,7 @@ async def get_documents_stats(request: Request):
     Returns:
         Informações sobre a coleção ChromaDB
     """
-    pipeline = get_ingestion_pipeline()
+    pipeline = _get_pipeline(request)
     stats = pipeline.get_collection_stats()
 
     return DocumentsStatsResponse(
@@ -217,7 +424,7 @@ async def delete_all_documents(request: Request):
     Returns:
         Confirmação da deleção
     """
-    pipeline = get_ingestion_pipeline()
+    pipeline = _get_pipeline(request)
     collection_name = pipeline.collection_name
 
     # Deleta coleção
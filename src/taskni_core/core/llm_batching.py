@@ -0,0 +1,231 @@
+"""
+Micro-batching de chamadas ao LLM.
+
+Agrupa as chamadas que chegam dentro de uma janela curta (ex: 10ms) e as
+despacha juntas, em vez de disparar uma requisição isolada por chamada:
+chamadas com os mesmos argumentos e o mesmo system prompt viram um único
+`ainvoke_batch`. Uma chamada que falha dentro do batch é refeita sozinha
+(com o fallback de provedores do ainvoke), sem afetar as demais.
+Sob tráfego concorrente isso aproveita a capacidade de batch do provider
+(ou de um modelo self-hosted) sem mudar a interface usada pelos agentes.
+
+As chamadas são separadas em "bins" pelo tamanho esperado da resposta
+(`max_tokens_hint`), para que respostas curtas (followup) não fiquem presas
+no mesmo batch que respostas longas (RAG).
+
+O batching só acontece entre chamadas que passam pelo mesmo cliente: os
+agentes usam o cliente compartilhado do LLM (`get_shared_batched_llm`), não
+um cliente próprio por instância.
+
+Uso:
+    llm = get_shared_batched_llm(enable_streaming=True, model_tier="small")
+    response = await llm.ainvoke(messages, max_tokens_hint=80)
+"""
+
+import asyncio
+import functools
+import logging
+from typing import Any
+
+from taskni_core.core.llm_provider import MultiProviderLLM, get_shared_llm, system_prompt_of
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores (em tokens) de cada bin; acima do último cai no último bin
+_LENGTH_BINS = (80, 256, 1024)
+
+# Item pendente: (mensagens, kwargs, future do chamador)
+_PendingCall = tuple[Any, dict[str, Any], asyncio.Future]
+
+# Fila identificada por (event loop, índice do bin)
+_QueueKey = tuple[asyncio.AbstractEventLoop, int]
+
+
+def _length_bin(max_tokens_hint: int | None) -> int:
+    """
+    Retorna o índice do bin para um tamanho de resposta esperado.
+
+    Args:
+        max_tokens_hint: Tamanho máximo esperado da resposta (None = maior bin)
+
+    Returns:
+        Índice em _LENGTH_BINS
+    """
+    if max_tokens_hint is None:
+        return len(_LENGTH_BINS) - 1
+    for index, limit in enumerate(_LENGTH_BINS):
+        if max_tokens_hint <= limit:
+            return index
+    return len(_LENGTH_BINS) - 1
+
+
+class BatchedLLMClient:
+    """
+    Wrapper do MultiProviderLLM que agrupa chamadas concorrentes.
+
+    Cada `ainvoke` entra na fila do seu bin de tamanho; cada fila é drenada
+    quando a janela `batch_window_ms` expira ou quando atinge `max_batch` itens.
+    Atributos não definidos aqui (invoke_sync, astream, etc) são
+    delegados para o MultiProviderLLM.
+    """
+
+    def __init__(self, llm: MultiProviderLLM, batch_window_ms: float = 10.0, max_batch: int = 32):
+        """
+        Inicializa o cliente com batching.
+
+        Args:
+            llm: LLM multi-provider usado para as chamadas
+            batch_window_ms: Janela de agrupamento em milissegundos
+            max_batch: Tamanho máximo de um batch
+        """
+        self.llm = llm
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+
+        # Uma fila por (event loop, bin): futures pertencem ao loop que as criou
+        self._pending: dict[_QueueKey, list[_PendingCall]] = {}
+        self._timers: dict[_QueueKey, asyncio.TimerHandle] = {}
+
+        # Referências às tasks de despacho (evita coleta pelo GC no meio do batch)
+        self._tasks: set[asyncio.Task] = set()
+
+    def __getattr__(self, name: str) -> Any:
+        """Delega atributos não definidos para o MultiProviderLLM."""
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    async def ainvoke(self, messages: Any, max_tokens_hint: int | None = None, **kwargs) -> Any:
+        """
+        Invoca o LLM passando pela fila de batching.
+
+        Args:
+            messages: Mensagens para enviar ao LLM
+            max_tokens_hint: Tamanho esperado da resposta, usado só para
+                escolher o bin (não é repassado ao LLM)
+            **kwargs: Argumentos adicionais (timeout, etc)
+
+        Returns:
+            Resposta do LLM (mesmo formato de MultiProviderLLM.ainvoke)
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        key = (loop, _length_bin(max_tokens_hint))
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = []
+            self._timers[key] = loop.call_later(self.batch_window, self._flush, key)
+
+        pending.append((messages, kwargs, future))
+
+        if len(pending) >= self.max_batch:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: _QueueKey):
+        """Drena uma fila e despacha o batch."""
+        loop = key[0]
+
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = loop.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: list[_PendingCall]):
+        """
+        Executa um batch e entrega cada resultado ao seu chamador.
+
+        Args:
+            batch: Chamadas pendentes
+        """
+        logger.debug("Despachando batch de %d chamada(s) ao LLM", len(batch))
+
+        # Grupos com os mesmos argumentos e o mesmo system prompt (o
+        # prompt_cache_key do provider é um só por `abatch`)
+        groups: list[tuple[dict[str, Any], str | None, list[_PendingCall]]] = []
+        for call in batch:
+            messages, kwargs, _ = call
+            system_prompt = system_prompt_of(messages)
+            for group_kwargs, group_prompt, calls in groups:
+                if group_prompt == system_prompt and group_kwargs == kwargs:
+                    calls.append(call)
+                    break
+            else:
+                groups.append((kwargs, system_prompt, [call]))
+
+        await asyncio.gather(*(self._dispatch_group(kwargs, calls) for kwargs, _, calls in groups))
+
+    async def _dispatch_group(self, kwargs: dict[str, Any], calls: list[_PendingCall]):
+        """
+        Executa chamadas com os mesmos argumentos e entrega os resultados.
+
+        Args:
+            kwargs: Argumentos comuns às chamadas
+            calls: Chamadas pendentes
+        """
+        results: list[Any]
+        if len(calls) > 1:
+            try:
+                results = await self.llm.ainvoke_batch(
+                    [messages for messages, _, _ in calls], max_concurrency=self.max_batch, **kwargs
+                )
+            except Exception as e:
+                logger.warning("Batch de %d chamada(s) falhou: %s", len(calls), e)
+                results = [e] * len(calls)
+
+            # Falhas (do batch inteiro ou de uma conversa): refaz cada uma
+            # sozinha, com o fallback de provedores do ainvoke
+            retries = [
+                index for index, result in enumerate(results) if isinstance(result, BaseException)
+            ]
+            if retries:
+                retried = await asyncio.gather(
+                    *(self.llm.ainvoke(calls[index][0], **kwargs) for index in retries),
+                    return_exceptions=True,
+                )
+                for index, result in zip(retries, retried, strict=True):
+                    results[index] = result
+        else:
+            try:
+                results = [await self.llm.ainvoke(calls[0][0], **kwargs)]
+            except Exception as e:
+                results = [e]
+
+        for (_, _, future), result in zip(calls, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def get_shared_batched_llm(
+    enable_streaming: bool = True, model_tier: str = "small"
+) -> BatchedLLMClient:
+    """
+    Retorna o BatchedLLMClient compartilhado do LLM da configuração.
+
+    Um cliente por LLM compartilhado (ver get_shared_llm): chamadas de todos
+    os agentes caem na mesma janela de batching.
+
+    Args:
+        enable_streaming: Se deve habilitar streaming de respostas
+        model_tier: "small" ou "large" (ver MultiProviderLLM)
+
+    Returns:
+        Instância compartilhada do BatchedLLMClient
+    """
+    return _shared_batched_llm(enable_streaming, model_tier)
+
+
+@functools.cache
+def _shared_batched_llm(enable_streaming: bool, model_tier: str) -> BatchedLLMClient:
+    return BatchedLLMClient(get_shared_llm(enable_streaming, model_tier))
@@ -6,21 +6,107 @@ Prioridade:
 2. OpenAI (fallback - confiável)
 3. FakeModel (development)
 
-Suporta streaming e retry automático.
+Suporta streaming e retry automático. No streaming, quando o provider
+primário demora a emitir o primeiro chunk, o próximo é disparado em paralelo
+(hedging) e vence quem responder primeiro.
 """
 
+import asyncio
+import functools
+import hashlib
 import logging
-from typing import Any
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any, TypedDict
 
-from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
 from langchain_core.messages import BaseMessage
 
 from core.llm import get_model
 from core.settings import settings
+from schema.models import AllModelEnum
+from taskni_core.utils.async_utils import run_sync
 
 logger = logging.getLogger(__name__)
 
 
+class ProviderConfig(TypedDict):
+    """Provedor configurado (antes de instanciar o chat model)."""
+
+    name: str
+    model: AllModelEnum
+    priority: int
+    fast: bool
+
+
+class ProviderInfo(ProviderConfig):
+    """Provedor disponível, com o chat model já instanciado."""
+
+    llm: BaseChatModel
+
+
+def response_text(response: Any) -> str:
+    """
+    Extrai o texto de uma resposta do LLM.
+
+    Args:
+        response: Resposta retornada por ainvoke (AIMessage ou similar)
+
+    Returns:
+        Conteúdo da resposta como string
+    """
+    if hasattr(response, "content"):
+        return response.content
+    return str(response)
+
+
+def system_prompt_of(messages: list[BaseMessage] | list[dict[str, str]]) -> str | None:
+    """
+    Retorna o conteúdo da mensagem de sistema (primeira mensagem), se houver.
+
+    Args:
+        messages: Mensagens no formato dict ou BaseMessage
+
+    Returns:
+        Conteúdo do system prompt ou None
+    """
+    if not messages:
+        return None
+
+    first = messages[0]
+    if isinstance(first, dict):
+        return first["content"] if first.get("role") == "system" else None
+    return first.content if first.type == "system" else None  # type: ignore
+
+
+def _prompt_cache_kwargs(
+    provider_info: ProviderInfo, messages: list[BaseMessage] | list[dict[str, str]]
+) -> dict[str, Any]:
+    """
+    Argumentos de prompt caching do provider.
+
+    O system prompt dos agentes é estático e vem antes de todo conteúdo
+    dinâmico, então o prefixo pode ser reaproveitado pelo cache do provider.
+    Na OpenAI, `prompt_cache_key` agrupa as requisições com o mesmo prefixo
+    no mesmo servidor de cache. Os demais providers não expõem controle.
+
+    Args:
+        provider_info: Informações do provedor
+        messages: Mensagens da chamada
+
+    Returns:
+        Kwargs extras para o ainvoke/astream do chat model
+    """
+    if provider_info["name"] != "OpenAI":
+        return {}
+
+    system_prompt = system_prompt_of(messages)
+    if not system_prompt:
+        return {}
+
+    digest = hashlib.blake2b(system_prompt.encode(), digest_size=8).hexdigest()
+    return {"prompt_cache_key": f"taskni-{digest}"}
+
+
 class MultiProviderLLM:
     """
     LLM com múltiplos provedores e fallback automático.
@@ -32,29 +118,51 @@ class MultiProviderLLM:
 
     Suporta:
     - Fallback automático em caso de erro
+    - Hedging (só no streaming): se o provider atual não emite o primeiro
+      chunk em `hedge_delay` segundos, o próximo é disparado em paralelo
+      (nunca o FakeModel)
     - Streaming de respostas
     - Retry com exponential backoff
+    - Tiers de modelo: "small" (rápido/barato) ou "large" (tarefas mais difíceis)
     """
 
-    def __init__(self, enable_streaming: bool = True):
+    def __init__(
+        self,
+        enable_streaming: bool = True,
+        model_tier: str = "small",
+        hedge_delay: float | None = 2.0,
+    ):
         """
         Inicializa o multi-provider LLM.
 
         Args:
             enable_streaming: Se deve habilitar streaming de respostas
+            model_tier: "small" (Llama 3.1 8B / GPT-4o-mini) ou
+                "large" (Llama 3.3 70B / GPT-4o)
+            hedge_delay: Segundos de espera pelo primeiro chunk do stream
+                antes de disparar o próximo provider em paralelo (None =
+                fallback só em erro). Chamadas sem streaming não fazem
+                hedging: o tempo delas é o da geração inteira, e um hedge
+                ali seria uma segunda chamada paga a cada resposta longa
         """
+        if model_tier not in ("small", "large"):
+            raise ValueError(f"model_tier inválido: {model_tier!r} (use 'small' ou 'large')")
+
         self.enable_streaming = enable_streaming
+        self.model_tier = model_tier
+        self.hedge_delay = hedge_delay
         self._providers = self._initialize_providers()
         self._current_provider_index = 0
 
-    def _initialize_providers(self) -> list[dict[str, Any]]:
+    def _initialize_providers(self) -> list[ProviderInfo]:
         """
         Inicializa a lista de provedores disponíveis.
 
         Returns:
             Lista de dicionários com informações dos provedores
         """
-        providers = []
+        providers: list[ProviderConfig] = []
+        large = self.model_tier == "large"
 
         # 1. Groq (primário)
         if settings.GROQ_API_KEY:
@@ -64,7 +172,9 @@ class MultiProviderLLM:
                 providers.append(
                     {
                         "name": "Groq",
-                        "model": GroqModelName.LLAMA_31_8B,
+                        "model": (
+                            GroqModelName.LLAMA_33_70B if large else GroqModelName.LLAMA_31_8B
+                        ),
                         "priority": 1,
                         "fast": True,
                     }
@@ -81,7 +191,7 @@ class MultiProviderLLM:
                 providers.append(
                     {
                         "name": "OpenAI",
-                        "model": OpenAIModelName.GPT_4O_MINI,
+                        "model": OpenAIModelName.GPT_4O if large else OpenAIModelName.GPT_4O_MINI,
                         "priority": 2,
                         "fast": True,
                     }
@@ -104,12 +214,23 @@ class MultiProviderLLM:
         logger.info("✅ FakeModel configurado como último recurso")
 
         # Ordena por prioridade
-        providers.sort(key=lambda p: p["priority"]) # type: ignore
+        providers.sort(key=lambda p: p["priority"])
 
-        logger.info(f"📋 Provedores disponíveis: {[p['name'] for p in providers]}")
-        return providers
+        # Instancia o chat model de cada provider uma única vez: o cliente
+        # (e o pool de conexões HTTP) é reaproveitado por todas as chamadas
+        available: list[ProviderInfo] = []
+        for provider in providers:
+            try:
+                llm = get_model(provider["model"])
+            except Exception as e:
+                logger.warning("%s não pôde ser instanciado: %s", provider["name"], e)
+                continue
+            available.append({**provider, "llm": llm})
 
-    def _get_llm(self, provider_info: dict[str, Any]) -> BaseChatModel:
+        logger.info(f"📋 Provedores disponíveis: {[p['name'] for p in available]}")
+        return available
+
+    def _get_llm(self, provider_info: ProviderInfo) -> BaseChatModel:
         """
         Obtém instância do LLM para um provedor.
 
@@ -117,9 +238,100 @@ class MultiProviderLLM:
             provider_info: Informações do provedor
 
         Returns:
-            Instância do chat model
+            Instância do chat model (criada em _initialize_providers)
+        """
+        return provider_info["llm"]
+
+    async def _race_providers(
+        self,
+        call: Callable[[ProviderInfo], Awaitable[Any]],
+        timeout: float,
+        failure_message: str,
+        hedge_delay: float | None = None,
+    ) -> Any:
+        """
+        Executa `call` nos provedores em ordem, com fallback e hedging.
+
+        Começa pelo primeiro provider. Se ele falha, o próximo é disparado na
+        hora; se ele só demora mais que `hedge_delay`, o próximo é disparado em
+        paralelo (no máximo duas chamadas em voo, e nunca para o FakeModel,
+        que só é usado quando os demais falharam). O primeiro sucesso vence e
+        as chamadas restantes são canceladas.
+
+        Args:
+            call: Corrotina que executa a chamada em um provider
+            timeout: Timeout de cada chamada (só para a mensagem de erro)
+            failure_message: Início da mensagem se todos falharem
+            hedge_delay: Espera antes do hedge (None = fallback só em erro)
+
+        Returns:
+            Resultado da primeira chamada bem-sucedida
+
+        Raises:
+            Exception: Se todos os provedores falharem
         """
-        return get_model(provider_info["model"])
+        providers = self._providers
+        if not providers:
+            raise Exception(f"{failure_message}: nenhum provedor disponível")
+
+        in_flight: dict[asyncio.Task, ProviderInfo] = {}
+        next_index = 0
+        errors = []
+
+        def launch():
+            nonlocal next_index
+            provider_info = providers[next_index]
+            next_index += 1
+            logger.info("Tentando provider: %s", provider_info["name"])
+            in_flight[asyncio.create_task(call(provider_info))] = provider_info
+
+        def can_hedge() -> bool:
+            return (
+                hedge_delay is not None
+                and len(in_flight) < 2
+                and next_index < len(providers)
+                and providers[next_index]["name"] != "FakeModel"
+            )
+
+        launch()
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(
+                    in_flight,
+                    timeout=hedge_delay if can_hedge() else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    # Provider atual lento: dispara o próximo em paralelo
+                    logger.info("Sem resposta em %ss, disparando hedge", hedge_delay)
+                    launch()
+                    continue
+
+                for task in done:
+                    provider_info = in_flight.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        logger.info("%s respondeu com sucesso", provider_info["name"])
+                        return task.result()
+
+                    if isinstance(error, TimeoutError):
+                        error_msg = f"{provider_info['name']}: Timeout após {timeout}s"
+                    else:
+                        error_msg = f"{provider_info['name']}: {str(error)[:100]}"
+                    logger.warning("%s", error_msg)
+                    errors.append(error_msg)
+
+                # Nada em voo: fallback imediato para o próximo provider
+                if not in_flight and next_index < len(providers):
+                    launch()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+        # Se chegou aqui, todos falharam
+        error_summary = "\n".join([f"  - {err}" for err in errors])
+        raise Exception(f"{failure_message}:\n{error_summary}")
 
     async def ainvoke(
         self, messages: list[BaseMessage] | list[dict[str, str]], timeout: float = 30.0, **kwargs
@@ -127,7 +339,9 @@ class MultiProviderLLM:
         """
         Invoca o LLM com fallback automático e timeout.
 
-        Tenta os provedores em ordem de prioridade até um funcionar.
+        Tenta os provedores em ordem de prioridade até um funcionar (ver
+        _race_providers). Sem hedging: o próximo provider só é chamado
+        quando o atual falha.
 
         Args:
             messages: Mensagens para enviar ao LLM
@@ -140,46 +354,108 @@ class MultiProviderLLM:
         Raises:
             Exception: Se todos os provedores falharem
         """
-        import asyncio
 
-        errors = []
+        async def invoke(provider_info: ProviderInfo) -> Any:
+            llm = self._get_llm(provider_info)
+            call_kwargs = {**_prompt_cache_kwargs(provider_info, messages), **kwargs}
+            # Timeout por provider para evitar hang
+            return await asyncio.wait_for(llm.ainvoke(messages, **call_kwargs), timeout=timeout)
+
+        return await self._race_providers(invoke, timeout, "Todos os provedores falharam")
+
+    async def ainvoke_batch(
+        self,
+        inputs: list[list[BaseMessage]] | list[list[dict[str, str]]],
+        max_concurrency: int = 10,
+        timeout: float = 30.0,
+        **kwargs,
+    ) -> list[Any]:
+        """
+        Invoca o LLM para várias conversas de uma vez (`abatch` do provider).
 
-        for provider_info in self._providers:
-            try:
-                logger.info(f"🔄 Tentando provider: {provider_info['name']}")
+        O lote inteiro vai para um provider; se ele falhar, o lote todo passa
+        para o próximo (mesmo fallback de ainvoke). Falhas de uma
+        conversa isolada não derrubam as outras: a exceção volta na posição
+        da conversa, para o chamador tratar (ex: BatchedLLMClient refaz só
+        essa conversa com ainvoke).
 
-                llm = self._get_llm(provider_info)
+        Args:
+            inputs: Lista de conversas (cada uma, uma lista de mensagens)
+            max_concurrency: Máximo de requisições simultâneas no provider
+            timeout: Timeout do lote em segundos
+            **kwargs: Argumentos adicionais
 
-                # Adiciona timeout de 30 segundos para evitar hang
-                response = await asyncio.wait_for(llm.ainvoke(messages, **kwargs), timeout=timeout)
+        Returns:
+            Respostas do LLM (ou a exceção de cada conversa que falhou),
+            na mesma ordem das entradas
 
-                logger.info(f"✅ {provider_info['name']} respondeu com sucesso")
-                return response
+        Raises:
+            Exception: Se todos os provedores falharem
+        """
+        if not inputs:
+            return []
+
+        batch_inputs: list[LanguageModelInput] = list(inputs)
+
+        # prompt_cache_key só quando o lote todo tem o mesmo system prompt
+        system_prompts = {system_prompt_of(messages) for messages in inputs}
+        shared_prompt = len(system_prompts) == 1
+
+        async def invoke_batch(provider_info: ProviderInfo) -> list[Any]:
+            llm = self._get_llm(provider_info)
+            cache_kwargs = _prompt_cache_kwargs(provider_info, inputs[0]) if shared_prompt else {}
+            return await asyncio.wait_for(
+                llm.abatch(
+                    batch_inputs,
+                    config={"max_concurrency": max_concurrency},
+                    return_exceptions=True,
+                    **{**cache_kwargs, **kwargs},
+                ),
+                timeout=timeout,
+            )
+
+        return await self._race_providers(
+            invoke_batch, timeout, "Todos os provedores falharam no batch"
+        )
 
-            except TimeoutError:
-                error_msg = f"{provider_info['name']}: Timeout após {timeout}s"
-                logger.warning(f"⚠️  {error_msg}")
-                errors.append(error_msg)
-                continue
-            except Exception as e:
-                error_msg = f"{provider_info['name']}: {str(e)[:100]}"
-                logger.warning(f"⚠️  {error_msg}")
-                errors.append(error_msg)
-                continue
+    async def _stream_chunks(
+        self,
+        provider_info: ProviderInfo,
+        messages: list[BaseMessage] | list[dict[str, str]],
+        kwargs: dict[str, Any],
+    ) -> AsyncGenerator[str, None]:
+        """Stream de um provider específico, como texto."""
+        llm = self._get_llm(provider_info)
+        call_kwargs = {**_prompt_cache_kwargs(provider_info, messages), **kwargs}
 
-        # Se chegou aqui, todos falharam
-        error_summary = "\n".join([f"  - {err}" for err in errors])
-        raise Exception(f"Todos os provedores falharam:\n{error_summary}")
+        async for chunk in llm.astream(messages, **call_kwargs):
+            content = chunk.content
+            yield content if isinstance(content, str) else str(content)
 
     async def astream(
-        self, messages: list[BaseMessage] | list[dict[str, str]], timeout: float = 60.0, **kwargs
-    ):
+        self,
+        messages: list[BaseMessage] | list[dict[str, str]],
+        timeout: float = 60.0,
+        chunk_timeout: float = 15.0,
+        **kwargs,
+    ) -> AsyncGenerator[str, None]:
         """
-        Stream de respostas do LLM com fallback automático e timeout.
+        Stream de respostas do LLM com fallback automático, hedging e timeout.
+
+        A disputa entre provedores vale até o primeiro chunk: o provider que
+        emitir o primeiro chunk segue com o stream e os demais são cancelados.
+        Depois do primeiro chunk não há fallback (o chamador já recebeu
+        parte da resposta).
+
+        Os timeouts são aplicados a cada `anext` do stream (um `wait_for`
+        em volta do gerador inteiro não teria efeito): `timeout` limita o
+        stream completo e `chunk_timeout` o intervalo entre dois chunks,
+        que é como um stream travado costuma falhar.
 
         Args:
             messages: Mensagens para enviar ao LLM
             timeout: Timeout total em segundos (padrão: 60s para streaming)
+            chunk_timeout: Tempo máximo entre chunks depois do primeiro
             **kwargs: Argumentos adicionais
 
         Yields:
@@ -187,59 +463,70 @@ class MultiProviderLLM:
 
         Raises:
             Exception: Se todos os provedores falharem
+            TimeoutError: Se o stream travar ou estourar o timeout depois
+                do primeiro chunk
         """
-        import asyncio
-
         if not self.enable_streaming:
             # Fallback para invoke se streaming desabilitado
             response = await self.ainvoke(messages, timeout=timeout, **kwargs)
-            if hasattr(response, "content"):
-                yield response.content
-            else:
-                yield str(response)
+            yield response_text(response)
             return
 
-        errors = []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
 
-        for provider_info in self._providers:
+        async def first_chunk(
+            provider_info: ProviderInfo,
+        ) -> tuple[AsyncGenerator[str, None], str | None]:
+            stream = self._stream_chunks(provider_info, messages, kwargs)
             try:
-                logger.info(f"🔄 Streaming com: {provider_info['name']}")
-
-                llm = self._get_llm(provider_info)
-
-                # Timeout para o stream completo
-                async def stream_with_timeout():
-                    async for chunk in llm.astream(messages, **kwargs):
-                        if hasattr(chunk, "content"):
-                            yield chunk.content
-                        else:
-                            yield str(chunk)
-
-                async for chunk in asyncio.wait_for(stream_with_timeout(), timeout=timeout): # type: ignore
-                    yield chunk
-
-                logger.info(f"✅ {provider_info['name']} stream concluído")
-                return  # Stream bem-sucedido, sai da função
-
-            except TimeoutError:
-                error_msg = f"{provider_info['name']}: Stream timeout após {timeout}s"
-                logger.warning(f"⚠️  {error_msg}")
-                errors.append(error_msg)
-                continue
-            except Exception as e:
-                error_msg = f"{provider_info['name']}: {str(e)[:100]}"
-                logger.warning(f"⚠️  {error_msg}")
-                errors.append(error_msg)
-                continue
+                first = await asyncio.wait_for(anext(stream), timeout=deadline - loop.time())
+                return stream, first
+            except StopAsyncIteration:
+                return stream, None  # Resposta vazia
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        stream, first = await self._race_providers(
+            first_chunk,
+            timeout,
+            "Todos os provedores falharam no streaming",
+            hedge_delay=self.hedge_delay,
+        )
 
-        # Se chegou aqui, todos falharam
-        error_summary = "\n".join([f"  - {err}" for err in errors])
-        raise Exception(f"Todos os provedores falharam no streaming:\n{error_summary}")
+        try:
+            if first is None:
+                return
+            yield first
+
+            while True:
+                remaining = deadline - loop.time()
+                try:
+                    chunk = await asyncio.wait_for(
+                        anext(stream), timeout=min(chunk_timeout, remaining)
+                    )
+                except StopAsyncIteration:
+                    return
+                yield chunk
+        except TimeoutError:
+            logger.warning(
+                "Stream interrompido por timeout (total %ss, entre chunks %ss)",
+                timeout,
+                chunk_timeout,
+            )
+            raise
+        finally:
+            await stream.aclose()
 
     def invoke_sync(self, messages: list[BaseMessage] | list[dict[str, str]], **kwargs) -> str:
         """
         Versão síncrona do ainvoke.
 
+        Roda no event loop de background compartilhado (run_sync) em vez de
+        criar um loop novo por chamada com asyncio.run(): clientes HTTP e
+        conexões continuam vivos entre chamadas.
+
         Args:
             messages: Mensagens para enviar ao LLM
             **kwargs: Argumentos adicionais
@@ -250,15 +537,10 @@ class MultiProviderLLM:
         Raises:
             Exception: Se todos os provedores falharem
         """
-        import asyncio
-
-        # Executa ainvoke de forma síncrona
-        response = asyncio.run(self.ainvoke(messages, **kwargs))
+        response = run_sync(self.ainvoke(messages, **kwargs))
 
         # Extrai conteúdo
-        if hasattr(response, "content"):
-            return response.content
-        return str(response)
+        return response_text(response)
 
     def get_current_provider(self) -> str:
         """Retorna o nome do provider atual."""
@@ -269,3 +551,26 @@ class MultiProviderLLM:
     def get_available_providers(self) -> list[str]:
         """Retorna lista de providers disponíveis."""
         return [p["name"] for p in self._providers]
+
+
+def get_shared_llm(enable_streaming: bool = True, model_tier: str = "small") -> MultiProviderLLM:
+    """
+    Retorna o MultiProviderLLM compartilhado do processo para a configuração.
+
+    Todos os agentes com a mesma configuração usam a mesma instância, em vez
+    de cada um inicializar sua própria lista de provedores.
+
+    Args:
+        enable_streaming: Se deve habilitar streaming de respostas
+        model_tier: "small" ou "large" (ver MultiProviderLLM)
+
+    Returns:
+        Instância compartilhada do MultiProviderLLM
+    """
+    # Argumentos posicionais: o functools.cache diferencia f(a) de f(a=a)
+    return _shared_llm(enable_streaming, model_tier)
+
+
+@functools.cache
+def _shared_llm(enable_streaming: bool, model_tier: str) -> MultiProviderLLM:
+    return MultiProviderLLM(enable_streaming=enable_streaming, model_tier=model_tier)
@@ -6,6 +6,9 @@ O TaskniSettings tem suas próprias configurações e acessa as do toolkit
 via `core_settings` quando necessário.
 """
 
+import functools
+from dataclasses import dataclass
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -92,6 +95,9 @@ class TaskniSettings(BaseSettings):
     ENABLE_FOLLOWUP_AGENT: bool = True
     ENABLE_BILLING_AGENT: bool = False  # Desabilitado por padrão
 
+    # Aquecer LLM/embedder dos agentes na subida do app
+    PREWARM_AGENTS: bool = True
+
     # ==========================================
     # RAG/Vector Store para FAQ
     # ==========================================
@@ -99,6 +105,19 @@ class TaskniSettings(BaseSettings):
     FAQ_VECTOR_STORE_PATH: str | None = None
     FAQ_COLLECTION_NAME: str = "clinic_faq"
 
+    # Uploads até este tamanho ficam em memória e são gravados de uma vez;
+    # acima disso são transmitidos em blocos direto para o disco
+    UPLOAD_MEMORY_THRESHOLD_MB: int = 8
+
+    # Chunks por lote de embedding + insert no ChromaDB durante a ingestão
+    INGEST_BATCH_SIZE: int = 64
+
+    # Lotes de embedding + insert processados em paralelo numa ingestão
+    INGEST_EMBED_WORKERS: int = 4
+
+    # Máximo de ingestões simultâneas (workers da fila de ingestão)
+    MAX_CONCURRENT_INGESTS: int = 2
+
     # ==========================================
     # Ollama (embeddings apenas)
     # ==========================================
@@ -107,27 +126,83 @@ class TaskniSettings(BaseSettings):
     OLLAMA_BASE_URL: str | None = None
     OLLAMA_EMBED_MODEL: str = "nomic-embed-text"
 
+    # Pula as sondas de rede (Ollama / acesso à OpenAI) na escolha dos
+    # embeddings e confia na configuração (útil em CI)
+    TASKNI_SKIP_PROBES: bool = False
+
     def is_dev(self) -> bool:
         """Check if running in development mode."""
         return self.MODE == "dev"
 
 
+@functools.cache
+def get_settings() -> TaskniSettings:
+    """
+    Retorna o settings do Taskni (instanciado uma única vez).
+
+    O .env é lido e validado só na primeira chamada; todos os módulos
+    (e testes) compartilham o mesmo objeto.
+    """
+    return TaskniSettings()
+
+
+@dataclass(slots=True, frozen=True)
+class HotSettings:
+    """
+    Cópia imutável dos settings lidos em caminhos quentes (por requisição).
+
+    Os valores são copiados uma única vez do TaskniSettings (com os SecretStr
+    já extraídos e as listas já separadas); o acesso é um atributo de slot,
+    sem passar pelo modelo do pydantic.
+    """
+
+    api_token: str | None
+    api_tokens: tuple[str, ...]
+    business_name: str
+    default_language: str
+    upload_memory_threshold_bytes: int
+    ingest_batch_size: int
+    ingest_embed_workers: int
+
+    @classmethod
+    def from_settings(cls, settings: TaskniSettings) -> "HotSettings":
+        """
+        Monta a cópia a partir do settings do Taskni.
+
+        Args:
+            settings: Settings do Taskni
+
+        Returns:
+            HotSettings com os valores atuais
+        """
+        api_tokens = settings.API_TOKENS.get_secret_value() if settings.API_TOKENS else ""
+
+        return cls(
+            api_token=settings.API_TOKEN.get_secret_value() if settings.API_TOKEN else None,
+            api_tokens=tuple(t.strip() for t in api_tokens.split(",") if t.strip()),
+            business_name=settings.BUSINESS_NAME,
+            default_language=settings.DEFAULT_LANGUAGE,
+            upload_memory_threshold_bytes=settings.UPLOAD_MEMORY_THRESHOLD_MB << 20,
+            ingest_batch_size=settings.INGEST_BATCH_SIZE,
+            ingest_embed_workers=settings.INGEST_EMBED_WORKERS,
+        )
+
+
 # Singleton do Taskni
-taskni_settings = TaskniSettings()
+taskni_settings = get_settings()
 
-# Helper para acessar settings do toolkit de forma lazy (evita import circular)
-_core_settings = None
+# Valores dos caminhos quentes, extraídos uma vez no import
+hot_settings = HotSettings.from_settings(taskni_settings)
 
 
+# Helper para acessar settings do toolkit de forma lazy (evita import circular)
+@functools.cache
 def get_core_settings():
     """
     Retorna o settings do toolkit de forma lazy.
 
     Isso evita import circular e problemas de inicialização.
     """
-    global _core_settings
-    if _core_settings is None:
-        from core.settings import settings as core_settings
+    from core.settings import settings as core_settings
 
-        _core_settings = core_settings
-    return _core_settings
+    return core_settings
@@ -4,22 +4,28 @@ Aplicação principal do Taskni Core.
 Cria o app FastAPI e integra com o Agent Service Toolkit.
 """
 
+import asyncio
+import json
 import logging
+import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from slowapi import Limiter, _rate_limit_exceeded_handler  # type: ignore
 from slowapi.errors import RateLimitExceeded  # type: ignore
 from slowapi.util import get_remote_address  # type: ignore
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from taskni_core.agents.registry import register_taskni_agents
+from taskni_core.agents.registry import prewarm_taskni_agents, register_taskni_agents
 from taskni_core.api.routes_agents import router as agents_router
 from taskni_core.api.routes_health import router as health_router
 from taskni_core.api.routes_rag import router as rag_router
-from taskni_core.core.settings import taskni_settings
+from taskni_core.core.settings import hot_settings, taskni_settings
+from taskni_core.rag.ingest_jobs import ingest_job_queue
 from taskni_core.utils.auth import AuthManager
 from taskni_core.utils.error_handler import (
     generic_exception_handler,
@@ -34,10 +40,80 @@ logger = logging.getLogger(__name__)
 limiter = Limiter(key_func=get_remote_address)
 
 # Inicializa o gerenciador de autenticação
-# Obtém tokens do .env de forma segura
-api_token = taskni_settings.API_TOKEN.get_secret_value() if taskni_settings.API_TOKEN else None
-api_tokens = taskni_settings.API_TOKENS.get_secret_value() if taskni_settings.API_TOKENS else None
-auth_manager = AuthManager(api_token=api_token, api_tokens=api_tokens)
+# Os tokens do .env já vêm extraídos dos SecretStr e separados (hot_settings)
+auth_manager = AuthManager(
+    api_token=hot_settings.api_token,
+    tokens=hot_settings.api_tokens,
+)
+
+# Dependência de autenticação dos routers protegidos (/agents e /rag)
+_AUTH_DEPS = [Depends(auth_manager.require_auth)]
+
+
+# Origens CORS permitidas quando CORS_ORIGINS não está definido (desenvolvimento)
+_DEFAULT_CORS_ORIGINS = (
+    "http://localhost:3000",
+    "http://localhost:3001",
+    "http://localhost:8501",  # Streamlit
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:8501",
+)
+
+
+def _parse_cors_origins(value: str) -> tuple[str, ...]:
+    """
+    Separa a whitelist de origens CORS (lista separada por vírgula).
+
+    Args:
+        value: Valor de CORS_ORIGINS
+
+    Returns:
+        Origens não vazias, sem espaços nas bordas
+    """
+    return tuple(origin.strip() for origin in value.split(",") if origin.strip())
+
+
+# Métodos/headers aceitos no CORS (fixos: montados uma vez, no import)
+_CORS_METHODS = ("GET", "POST", "PUT", "DELETE", "OPTIONS")
+_CORS_HEADERS = ("Content-Type", "Authorization", "Accept")
+
+# Cache do preflight no navegador (24h: menos requisições OPTIONS)
+_CORS_MAX_AGE = 86400
+
+# Tamanho mínimo (bytes) para comprimir uma resposta com gzip
+_GZIP_MIN_SIZE = 1024
+
+# Whitelist CORS lida do ambiente uma única vez, no import (vazia = localhost padrão)
+_CORS_ORIGINS = _parse_cors_origins(os.environ.get("CORS_ORIGINS", ""))
+
+
+# Corpo da rota raiz (constante: serializado uma única vez, no import)
+_ROOT_JSON = json.dumps(
+    {
+        "service": "taskni-core",
+        "version": "0.1.0",
+        "description": "Motor de agentes para clínicas e negócios",
+        "docs": "/docs",
+        "health": "/health",
+    }
+).encode()
+
+
+def _load_ingestion_pipeline():
+    """
+    Carrega o pipeline de ingestão (vector store + embeddings).
+
+    Returns:
+        O pipeline, ou None se não puder ser carregado agora (as rotas RAG
+        tentam de novo na primeira requisição)
+    """
+    try:
+        from taskni_core.rag.ingest import get_ingestion_pipeline
+
+        return get_ingestion_pipeline()
+    except Exception as e:
+        logger.warning("Pipeline de ingestão não carregado na subida: %s", e)
+        return None
 
 
 @asynccontextmanager
@@ -48,16 +124,30 @@ async def lifespan(app: FastAPI):
     Executa na inicialização e shutdown.
     """
     # Startup
-    print("🚀 Iniciando Taskni Core...")
+    logger.info("Iniciando Taskni Core")
 
     # Registra os agentes do Taskni
     register_taskni_agents()
-    print("✅ Agentes Taskni registrados")
+    logger.info("Agentes Taskni registrados")
+
+    # Pipeline de ingestão compartilhado pelas rotas RAG (app.state.pipeline)
+    app.state.pipeline = await asyncio.to_thread(_load_ingestion_pipeline)
+
+    # Worker de ingestão em background (uploads respondem 202 + job id)
+    ingest_job_queue.start()
+
+    # Aquece LLM/embedder/ChromaDB em background (não bloqueia a subida)
+    prewarm_task = None
+    if taskni_settings.PREWARM_AGENTS:
+        prewarm_task = asyncio.create_task(prewarm_taskni_agents(app.state.pipeline))
 
     yield
 
     # Shutdown
-    print("👋 Encerrando Taskni Core...")
+    if prewarm_task is not None and not prewarm_task.done():
+        prewarm_task.cancel()
+    await ingest_job_queue.stop()
+    logger.info("Encerrando Taskni Core")
 
 
 def create_app() -> FastAPI:
@@ -75,6 +165,8 @@ def create_app() -> FastAPI:
             "Integra LangGraph, Evolution API, Chatwoot, n8n e mais."
         ),
         lifespan=lifespan,
+        # Serialização JSON das respostas com orjson (mais rápida que a stdlib)
+        default_response_class=ORJSONResponse,
     )
 
     # Configura Rate Limiter
@@ -89,26 +181,20 @@ def create_app() -> FastAPI:
     app.add_exception_handler(Exception, generic_exception_handler)  # Catch-all
     logger.info("✅ Exception handlers configurados (erros internos protegidos)")
 
+    # Compressão gzip das respostas (respostas de agentes e trechos do RAG
+    # são texto). Respostas pequenas e SSE (text/event-stream) não são comprimidas.
+    app.add_middleware(GZipMiddleware, minimum_size=_GZIP_MIN_SIZE)
+
     # Configuração CORS segura
     # IMPORTANTE: allow_origins=["*"] com allow_credentials=True é MUITO PERIGOSO!
     # Sempre use uma whitelist específica de origens permitidas.
-    import os
-
-    cors_origins_env = os.getenv("CORS_ORIGINS", "")
-
-    if cors_origins_env:
+    if _CORS_ORIGINS:
         # Produção: use lista específica do .env
-        cors_origins = [origin.strip() for origin in cors_origins_env.split(",")]
-        logger.info(f"✅ CORS configurado com whitelist: {cors_origins}")
+        cors_origins = _CORS_ORIGINS
+        logger.info(f"✅ CORS configurado com whitelist: {list(cors_origins)}")
     else:
         # Desenvolvimento: apenas localhost
-        cors_origins = [
-            "http://localhost:3000",
-            "http://localhost:3001",
-            "http://localhost:8501",  # Streamlit
-            "http://127.0.0.1:3000",
-            "http://127.0.0.1:8501",
-        ]
+        cors_origins = _DEFAULT_CORS_ORIGINS
         logger.warning(
             "⚠️  CORS usando origens localhost padrão. Configure CORS_ORIGINS no .env para produção!"
         )
@@ -117,9 +203,9 @@ def create_app() -> FastAPI:
         CORSMiddleware,
         allow_origins=cors_origins,  # Lista específica, NUNCA ["*"]
         allow_credentials=True,
-        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        allow_headers=["Content-Type", "Authorization", "Accept"],
-        max_age=3600,
+        allow_methods=_CORS_METHODS,
+        allow_headers=_CORS_HEADERS,
+        max_age=_CORS_MAX_AGE,
     )
 
     # Disponibiliza auth_manager para os routers
@@ -135,22 +221,18 @@ def create_app() -> FastAPI:
     )
 
     # /agents e /rag são protegidos (requerem Bearer token se configurado)
-    from fastapi import Depends
-
-    auth_dependency = [Depends(auth_manager.require_auth)]
-
     app.include_router(
         agents_router,
         prefix="/agents",
         tags=["agents"],
-        dependencies=auth_dependency,  # Protege todos os endpoints
+        dependencies=_AUTH_DEPS,  # Protege todos os endpoints
     )
 
     app.include_router(
         rag_router,
         prefix="/rag",
         tags=["rag"],
-        dependencies=auth_dependency,  # Protege todos os endpoints
+        dependencies=_AUTH_DEPS,  # Protege todos os endpoints
     )
 
     # TODO: Adicionar rotas de CRM quando implementar
@@ -163,13 +245,7 @@ def create_app() -> FastAPI:
     @app.get("/")
     async def root():
         """Endpoint raiz com informações do serviço."""
-        return {
-            "service": "taskni-core",
-            "version": "0.1.0",
-            "description": "Motor de agentes para clínicas e negócios",
-            "docs": "/docs",
-            "health": "/health",
-        }
+        return Response(content=_ROOT_JSON, media_type="application/json")
 
     return app
 
@@ -2,6 +2,11 @@
 Sistema RAG (Retrieval-Augmented Generation).
 
 Módulos:
+- embedding_cache: Cache persistente (SQLite) de embeddings
 - ingest: Pipeline de ingestão de documentos (PDFs, textos)
+- ingest_jobs: Fila de ingestão em background (jobs com status consultável)
+- keyword_index: Índice BM25 em memória (busca híbrida com o vector store)
+- search_batching: Embedding e busca em lote para consultas concorrentes
 - store: Configuração do vector store (ChromaDB)
+- text_splitter: Text splitter recursivo com merge de chunks otimizado
 """
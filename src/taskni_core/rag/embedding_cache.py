@@ -0,0 +1,160 @@
+"""
+Cache persistente de embeddings (SQLite).
+
+Reingerir um documento (ou ingerir chunks repetidos) não chama de novo o
+provedor de embeddings: cada vetor fica gravado num SQLite ao lado do
+ChromaDB, com chave SHA-256 de (modelo, tipo, texto). O modelo entra na
+chave, então trocar de modelo não reaproveita vetores de outro.
+
+Vetores de documentos ficam enquanto o documento existir; os de consultas
+(texto livre dos usuários, sem fim) ficam numa tabela à parte limitada a
+`max_query_entries` linhas, com descarte das menos usadas recentemente (LRU).
+
+Uso:
+    embeddings = CachedEmbeddings(OpenAIEmbeddings(...), "./data/chroma/emb_cache.db")
+    embeddings.embed_documents(["texto"])  # só os textos novos vão ao provedor
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# Máximo de parâmetros por SELECT ... IN (...) (limite antigo do SQLite: 999)
+_LOOKUP_CHUNK = 500
+
+# Tabela de cada tipo de embedding
+_TABLES = {"doc": "embeddings", "query": "query_embeddings"}
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings com cache em disco na frente de outro provedor.
+
+    Os vetores são guardados como float32 (mesma precisão que o ChromaDB
+    armazena). Thread-safe: a ingestão embeda lotes em paralelo.
+    """
+
+    def __init__(
+        self,
+        inner: Embeddings,
+        path: str,
+        model_name: str | None = None,
+        max_query_entries: int = 10_000,
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            inner: Provedor de embeddings real
+            path: Caminho do arquivo SQLite
+            model_name: Nome do modelo na chave do cache (padrão: atributo
+                `model` do provedor, ou o nome da classe)
+            max_query_entries: Máximo de embeddings de consultas guardados
+                (os menos usados recentemente são descartados)
+        """
+        self.inner = inner
+        self.model_name = model_name or getattr(inner, "model", None) or type(inner).__name__
+        self.max_query_entries = max_query_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings"
+                " (key BLOB PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS query_embeddings_last_used"
+                " ON query_embeddings (last_used)"
+            )
+
+    def _key(self, kind: str, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}\0{kind}\0{text}".encode()).digest()
+
+    def _lookup(self, kind: str, keys: list[bytes]) -> dict[bytes, list[float]]:
+        """Busca os vetores já cacheados para as chaves dadas."""
+        found: dict[bytes, list[float]] = {}
+        table = _TABLES[kind]
+
+        with self._lock, self._conn:
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[start : start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM {table} WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+
+            if kind == "query" and found:
+                # Marca o uso para o descarte LRU
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE query_embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+
+        return found
+
+    def _store(self, kind: str, items: list[tuple[bytes, list[float]]]):
+        """Grava vetores novos no cache."""
+        blobs = [(key, array("f", vector).tobytes()) for key, vector in items]
+
+        with self._lock, self._conn:
+            if kind == "doc":
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?)", blobs)
+                return
+
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?, ?)",
+                [(key, blob, now) for key, blob in blobs],
+            )
+            # Descarta as consultas menos usadas recentemente acima do limite
+            self._conn.execute(
+                "DELETE FROM query_embeddings WHERE key IN ("
+                " SELECT key FROM query_embeddings ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_query_entries,),
+            )
+
+    def _embed(self, kind: str, texts: list[str]) -> list[list[float]]:
+        keys = [self._key(kind, text) for text in texts]
+        cached = self._lookup(kind, list(set(keys)))
+
+        # Textos ainda não cacheados (sem repetir textos iguais)
+        missing: dict[bytes, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key not in cached:
+                missing.setdefault(key, text)
+
+        if missing:
+            if kind == "query":
+                vectors = [self.inner.embed_query(text) for text in missing.values()]
+            else:
+                vectors = self.inner.embed_documents(list(missing.values()))
+            new_items = list(zip(missing, vectors, strict=True))
+            self._store(kind, new_items)
+            cached.update(new_items)
+
+        logger.debug("Cache de embeddings: %d/%d hits", len(texts) - len(missing), len(texts))
+
+        return [cached[key] for key in keys]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._embed("doc", texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed("query", [text])[0]
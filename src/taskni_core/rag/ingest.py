@@ -7,24 +7,33 @@ Suporta:
 - Chunking inteligente
 - Embeddings com múltiplos provedores
 - Armazenamento em ChromaDB
+
+Loaders, embeddings, ChromaDB e o text splitter são importados dentro dos
+métodos que os usam: importar este módulo (ex: no import do app) não carrega
+LangChain Community/ChromaDB enquanto o RAG não é usado.
 """
 
+import asyncio
+import functools
+import json
+import logging
+import multiprocessing
 import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
-from langchain_community.embeddings import FakeEmbeddings, OllamaEmbeddings
-from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
-
-# Embeddings
-from langchain_openai import OpenAIEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.embeddings import Embeddings
 
 from core.settings import settings
-from taskni_core.core.settings import taskni_settings
+from taskni_core.core.settings import hot_settings, taskni_settings
 from taskni_core.utils.security import sanitize_rag_filter
 
 # Para detecção de firewall
@@ -35,6 +44,272 @@ try:
 except ImportError:
     HTTPX_AVAILABLE = False
 
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import Chroma
+
+
+logger = logging.getLogger(__name__)
+
+
+# Validade das sondas de rede (Ollama / acesso à OpenAI): o resultado é
+# reaproveitado por todos os pipelines criados nesse intervalo
+_PROBE_TTL_SECONDS = 300
+
+
+def _probe_bucket() -> int:
+    """Janela de tempo atual das sondas (muda a cada _PROBE_TTL_SECONDS)."""
+    return int(time.monotonic() // _PROBE_TTL_SECONDS)
+
+
+@functools.cache
+def _probe_client(verify: bool) -> "httpx.Client":
+    """Cliente HTTP das sondas, compartilhado (mantém conexões abertas)."""
+    return httpx.Client(verify=verify)
+
+
+@functools.lru_cache(maxsize=4)
+def _probe_ollama(base_url: str, bucket: int) -> bool:
+    """
+    Sonda o Ollama (GET /api/tags), com cache por (base_url, janela de tempo).
+
+    Args:
+        base_url: URL base do Ollama
+        bucket: Janela de tempo (ver _probe_bucket)
+
+    Returns:
+        True se o Ollama respondeu 200
+    """
+    if not HTTPX_AVAILABLE:
+        return False
+
+    try:
+        # verify=False para HTTPS auto-assinado
+        client = _probe_client(verify=False)
+        response = client.get(f"{base_url.rstrip('/')}/api/tags", timeout=3.0)
+        return response.status_code == 200
+    except Exception as e:
+        logger.warning("Ollama não acessível: %s", e)
+        return False
+
+
+@functools.lru_cache(maxsize=2)
+def _probe_openai_blocked(bucket: int) -> bool:
+    """
+    Sonda o acesso à API da OpenAI, com cache por janela de tempo.
+
+    Args:
+        bucket: Janela de tempo (ver _probe_bucket)
+
+    Returns:
+        True se o acesso está bloqueado (firewall/proxy), False se tem acesso
+    """
+    if not HTTPX_AVAILABLE:
+        # Se httpx não está disponível, assume que está bloqueado
+        return True
+
+    try:
+        # Qualquer resposta (mesmo 401) indica que a API é alcançável
+        _probe_client(verify=True).get("https://api.openai.com/v1/models", timeout=2.0)
+        return False
+    except Exception:
+        # Qualquer erro (timeout, connection, SSL, etc) = bloqueado
+        return True
+
+
+class FastFakeEmbeddings(Embeddings):
+    """
+    Embeddings aleatórios para desenvolvimento (substitui o FakeEmbeddings).
+
+    Gera todos os vetores de um lote numa única chamada NumPy, em vez de um
+    vetor por documento. Cada chamada usa um gerador próprio, então é segura
+    para os embeddings em paralelo da ingestão.
+    """
+
+    def __init__(self, size: int):
+        """
+        Args:
+            size: Dimensão dos vetores
+        """
+        self.size = size
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        import numpy as np
+
+        rng = np.random.default_rng()
+        return rng.standard_normal((len(texts), self.size), dtype=np.float32).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+# Validade da contagem em cache de get_collection_stats (escritas de outros
+# processos aparecem em até esse tempo; as deste processo, na hora)
+_STATS_TTL_SECONDS = 10.0
+
+
+# Separadores do chunking, do maior para o menor (parágrafo, linha, palavra)
+_SPLITTER_SEPARATORS = ("\n\n", "\n", " ", "")
+
+
+@functools.cache
+def _get_text_splitter(chunk_size: int, chunk_overlap: int):
+    """
+    Retorna o text splitter para os parâmetros dados.
+
+    O splitter não guarda estado entre chamadas, então uma única instância
+    por (chunk_size, chunk_overlap) é reutilizada por todos os pipelines.
+
+    Args:
+        chunk_size: Tamanho máximo de cada chunk (caracteres)
+        chunk_overlap: Sobreposição entre chunks consecutivos
+
+    Returns:
+        Splitter recursivo configurado (ver rag.text_splitter)
+    """
+    from taskni_core.rag.text_splitter import FastRecursiveSplitter
+
+    return FastRecursiveSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=list(_SPLITTER_SEPARATORS),
+    )
+
+
+# Chunks por insert no ChromaDB (independente do lote de embedding)
+_INSERT_BATCH_SIZE = 500
+
+
+# Prefixo das chaves de metadata com a origem de chunks repetidos
+DUP_METADATA_PREFIX = "dup_"
+
+
+def _chroma_metadata(metadata: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Adapta metadata para o ChromaDB, que só aceita valores escalares.
+
+    Listas (ex: tags) viram texto separado por vírgula e dicts viram JSON;
+    None e listas vazias são omitidos.
+
+    Args:
+        metadata: Metadata do chunk
+
+    Returns:
+        Metadata só com valores escalares (None se ficar vazia)
+    """
+    result: dict[str, Any] = {}
+    for key, value in metadata.items():
+        if value is None:
+            continue
+        if isinstance(value, list | tuple):
+            if value:
+                result[key] = ", ".join(map(str, value))
+        elif isinstance(value, dict):
+            result[key] = json.dumps(value, ensure_ascii=False)
+        else:
+            result[key] = value
+    return result or None
+
+
+def _dedupe_chunks(chunks: list[Document]) -> list[Document]:
+    """
+    Remove chunks com conteúdo repetido (cabeçalhos/rodapés, textos legais).
+
+    Cada conteúdo é embedado uma única vez. O chunk mantido conserva a sua
+    metadata escalar intacta (filtros por `page`/`source` continuam valendo);
+    a origem das repetições fica em chaves à parte, `dup_<chave>`, com os
+    valores diferentes em JSON (ex: dup_page = "[0, 3, 7]"): o ChromaDB não
+    armazena listas. O próprio texto é a chave do dict (comparação exata,
+    sem codificar nem calcular hash extra).
+
+    Args:
+        chunks: Chunks na ordem original
+
+    Returns:
+        Chunks únicos, na ordem da primeira ocorrência
+    """
+    kept: dict[str, Document] = {}
+    # Valores acumulados por chave de metadata, por conteúdo repetido
+    provenance: dict[str, dict[str, list[Any]]] = {}
+
+    for chunk in chunks:
+        first = kept.setdefault(chunk.page_content, chunk)
+        if first is chunk:
+            continue
+
+        merged = provenance.setdefault(chunk.page_content, {})
+        for key, value in chunk.metadata.items():
+            values = merged.get(key)
+            if values is None:
+                if key in first.metadata and first.metadata[key] == value:
+                    continue
+                values = merged[key] = [first.metadata[key]] if key in first.metadata else []
+            if value not in values:
+                values.append(value)
+
+    for content, merged in provenance.items():
+        kept[content].metadata |= {
+            f"{DUP_METADATA_PREFIX}{key}": json.dumps(values, ensure_ascii=False, default=str)
+            for key, values in merged.items()
+        }
+
+    if len(kept) < len(chunks):
+        logger.info("Deduplicação: %d → %d chunks", len(chunks), len(kept))
+
+    return list(kept.values())
+
+
+def _read_pdf(file_path: str) -> list[Document]:
+    """Lê um PDF (um documento por página)."""
+    from langchain_community.document_loaders import PyPDFLoader
+
+    return PyPDFLoader(file_path).load()
+
+
+def _read_text(file_path: str) -> list[Document]:
+    """Lê um arquivo de texto (UTF-8)."""
+    from langchain_community.document_loaders import TextLoader
+
+    return TextLoader(file_path, encoding="utf-8").load()
+
+
+# Leitor por extensão (mesmas extensões de DocumentIngestion._LOADERS)
+_READERS: dict[str, Callable[[str], list[Document]]] = {
+    ".pdf": _read_pdf,
+    ".txt": _read_text,
+    ".md": _read_text,
+}
+
+
+def _load_and_split(task: tuple[str, int, int]) -> tuple[str, list[Document]]:
+    """
+    Lê e faz o chunking de um arquivo (roda nos processos de ingest_files).
+
+    Args:
+        task: (caminho do arquivo, chunk_size, chunk_overlap)
+
+    Returns:
+        Tupla (caminho do arquivo, chunks)
+    """
+    file_path, chunk_size, chunk_overlap = task
+    documents = _READERS[Path(file_path).suffix.lower()](file_path)
+    return file_path, _get_text_splitter(chunk_size, chunk_overlap).split_documents(documents)
+
+
+@dataclass(slots=True)
+class _SharedStore:
+    """Embeddings + vector store compartilhados pelos pipelines de uma coleção."""
+
+    embeddings: Embeddings
+    vectorstore: "Chroma"
+    # Incrementado a cada mudança na coleção (ver DocumentIngestion.version)
+    version: int = 0
+
+
+# Stores já abertos, por (persist_directory absoluto, collection_name)
+_stores: dict[tuple[str, str], _SharedStore] = {}
+_stores_lock = threading.Lock()
+
 
 class DocumentIngestion:
     """
@@ -65,70 +340,82 @@ class DocumentIngestion:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
 
+        # Contagem em cache para get_collection_stats: (version, momento, count)
+        self._count_cache: tuple[int, float, int] | None = None
+
+        # Retrievers já criados, por k (ver get_retriever)
+        self._retrievers: dict[int, Any] = {}
+
         # Cria diretório se não existir
         os.makedirs(persist_directory, exist_ok=True)
 
-        # Inicializa text splitter
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""],
-        )
+        # Text splitter compartilhado (um por combinação de tamanho/overlap)
+        self.text_splitter = _get_text_splitter(chunk_size, chunk_overlap)
+
+        # Embeddings + ChromaDB compartilhados por todos os pipelines da mesma
+        # coleção: abrir o ChromaDB e sondar os provedores só acontece uma vez
+        self._store_key = (os.path.abspath(persist_directory), collection_name)
+        with _stores_lock:
+            store = _stores.get(self._store_key)
+            if store is None:
+                # Inicializa embeddings
+                self.embeddings = self._get_embeddings()
 
-        # Inicializa embeddings
-        self.embeddings = self._get_embeddings()
+                # Inicializa vector store
+                store = _SharedStore(self.embeddings, self._get_vectorstore())
+                _stores[self._store_key] = store
 
-        # Inicializa vector store
-        self.vectorstore = self._get_vectorstore()
+        self._store = store
+        self.embeddings = store.embeddings
+        self.vectorstore = store.vectorstore
+
+    @property
+    def version(self) -> int:
+        """
+        Versão da coleção, incrementada a cada mudança.
+
+        Invalida índices derivados (ex: KeywordIndex) e é compartilhada por
+        todos os pipelines da mesma coleção.
+        """
+        return self._store.version
+
+    @version.setter
+    def version(self, value: int):
+        self._store.version = value
 
     def _is_ollama_available(self) -> bool:
         """
         Detecta se o Ollama está disponível e acessível.
 
+        O resultado da sonda fica em cache por _PROBE_TTL_SECONDS.
+
         Returns:
             True se Ollama está acessível, False caso contrário
         """
         if not taskni_settings.OLLAMA_BASE_URL:
             return False
 
-        if not HTTPX_AVAILABLE:
-            return False
+        if taskni_settings.TASKNI_SKIP_PROBES:
+            # Sem sondas: confia na configuração
+            return True
 
-        try:
-            # Tenta acessar o endpoint /api/tags do Ollama
-            base_url = taskni_settings.OLLAMA_BASE_URL.rstrip("/")
-            with httpx.Client(
-                timeout=3.0, verify=False
-            ) as client:  # verify=False para HTTPS auto-assinado
-                response = client.get(f"{base_url}/api/tags")
-                return response.status_code == 200
-        except Exception as e:
-            print(f"⚠️  Ollama não acessível: {e}")
-            return False
+        return _probe_ollama(taskni_settings.OLLAMA_BASE_URL, _probe_bucket())
 
     def _is_firewalled(self) -> bool:
         """
         Detecta se o ambiente está atrás de firewall/proxy.
 
-        Tenta acessar a API da OpenAI para verificar conectividade.
+        Tenta acessar a API da OpenAI para verificar conectividade. O resultado
+        da sonda fica em cache por _PROBE_TTL_SECONDS.
 
         Returns:
             True se está bloqueado, False se tem acesso
         """
-        if not HTTPX_AVAILABLE:
-            # Se httpx não está disponível, assume que está bloqueado
-            return True
+        if taskni_settings.TASKNI_SKIP_PROBES:
+            # Sem sondas: confia na chave configurada
+            return False
 
-        try:
-            # Tenta acessar endpoint da OpenAI com timeout curto
-            with httpx.Client(timeout=2.0) as client:
-                _ = client.get("https://api.openai.com/v1/models")
-                # Se chegou aqui, não está bloqueado
-                return False
-        except Exception:
-            # Qualquer erro (timeout, connection, SSL, etc) = bloqueado
-            return True
+        return _probe_openai_blocked(_probe_bucket())
 
     def _get_embeddings(self):
         """
@@ -142,22 +429,30 @@ class DocumentIngestion:
         Returns:
             Instância de embeddings configurada
         """
+        from langchain_community.embeddings import OllamaEmbeddings
+
         # 1. PRIORIDADE: Ollama (embeddings locais/self-hosted)
         if taskni_settings.OLLAMA_BASE_URL:
             if self._is_ollama_available():
                 try:
-                    print(f"✅ Usando Ollama Embeddings ({taskni_settings.OLLAMA_EMBED_MODEL})")
-                    print(f"   Endpoint: {taskni_settings.OLLAMA_BASE_URL}")
-                    return OllamaEmbeddings(
-                        base_url=taskni_settings.OLLAMA_BASE_URL,
-                        model=taskni_settings.OLLAMA_EMBED_MODEL,
+                    logger.info(
+                        "Usando Ollama Embeddings (%s) em %s",
+                        taskni_settings.OLLAMA_EMBED_MODEL,
+                        taskni_settings.OLLAMA_BASE_URL,
+                    )
+                    return self._with_cache(
+                        OllamaEmbeddings(
+                            base_url=taskni_settings.OLLAMA_BASE_URL,
+                            model=taskni_settings.OLLAMA_EMBED_MODEL,
+                        )
                     )
                 except Exception as e:
-                    print(f"⚠️  Ollama Embeddings falhou: {e}")
-                    print("📝 Tentando fallback...")
+                    logger.warning("Ollama Embeddings falhou: %s. Tentando fallback", e)
             else:
-                print(f"⚠️  Ollama não está acessível em {taskni_settings.OLLAMA_BASE_URL}")
-                print("📝 Tentando fallback...")
+                logger.warning(
+                    "Ollama não está acessível em %s. Tentando fallback",
+                    taskni_settings.OLLAMA_BASE_URL,
+                )
 
         # 2. FALLBACK 1: OpenAI (se chave existe)
         if settings.OPENAI_API_KEY:
@@ -167,28 +462,43 @@ class DocumentIngestion:
             if not is_blocked:
                 # Ambiente OK - usa OpenAI
                 try:
-                    print("✅ Usando OpenAI Embeddings (text-embedding-3-small)")
-                    return OpenAIEmbeddings(
-                        api_key=settings.OPENAI_API_KEY.get_secret_value(),
-                        model="text-embedding-3-small",  # Mais barato
+                    from langchain_openai import OpenAIEmbeddings
+
+                    logger.info("Usando OpenAI Embeddings (text-embedding-3-small)")
+                    return self._with_cache(
+                        OpenAIEmbeddings(
+                            api_key=settings.OPENAI_API_KEY.get_secret_value(),
+                            model="text-embedding-3-small",  # Mais barato
+                        )
                     )
                 except Exception as e:
-                    print(f"⚠️  OpenAI Embeddings falhou: {e}")
-                    print("📝 Fallback para FakeEmbeddings")
-                    return FakeEmbeddings(size=768)  # nomic-embed-text usa 768 dims
+                    logger.warning("OpenAI Embeddings falhou: %s. Usando FakeEmbeddings", e)
+                    return FastFakeEmbeddings(size=768)  # nomic-embed-text usa 768 dims
             else:
                 # Ambiente bloqueado
-                print("⚠️  Firewall/proxy detectado - acesso à OpenAI bloqueado")
-                print("📝 Usando FakeEmbeddings (desenvolvimento)")
-                return FakeEmbeddings(size=768)
+                logger.warning(
+                    "Firewall/proxy detectado - acesso à OpenAI bloqueado. Usando FakeEmbeddings"
+                )
+                return FastFakeEmbeddings(size=768)
 
         # 3. FALLBACK FINAL: FakeEmbeddings
-        print("⚠️  Nenhum provedor de embeddings disponível")
-        print("📝 Usando FakeEmbeddings (desenvolvimento)")
-        return FakeEmbeddings(size=768)
+        logger.warning("Nenhum provedor de embeddings disponível. Usando FakeEmbeddings")
+        return FastFakeEmbeddings(size=768)
+
+    def _with_cache(self, embeddings: Embeddings) -> Embeddings:
+        """
+        Envolve um provedor real com o cache persistente de embeddings.
+
+        O cache fica em `<persist_directory>/emb_cache.db`, ao lado do ChromaDB.
+        """
+        from taskni_core.rag.embedding_cache import CachedEmbeddings
+
+        return CachedEmbeddings(embeddings, os.path.join(self.persist_directory, "emb_cache.db"))
 
-    def _get_vectorstore(self) -> Chroma:
+    def _get_vectorstore(self) -> "Chroma":
         """Inicializa ou carrega o vector store ChromaDB."""
+        from langchain_community.vectorstores import Chroma
+
         return Chroma(
             collection_name=self.collection_name,
             embedding_function=self.embeddings,
@@ -205,17 +515,16 @@ class DocumentIngestion:
         Returns:
             Lista de documentos (chunks)
         """
-        print(f"📄 Carregando PDF: {file_path}")
+        logger.debug("Carregando PDF: %s", file_path)
 
-        loader = PyPDFLoader(file_path)
-        documents = loader.load()
+        documents = _read_pdf(file_path)
 
-        print(f"   ✅ {len(documents)} páginas carregadas")
+        logger.debug("%d páginas carregadas", len(documents))
 
         # Chunking
         chunks = self.text_splitter.split_documents(documents)
 
-        print(f"   ✅ {len(chunks)} chunks criados")
+        logger.debug("%d chunks criados", len(chunks))
 
         return chunks
 
@@ -229,27 +538,148 @@ class DocumentIngestion:
         Returns:
             Lista de documentos (chunks)
         """
-        print(f"📝 Carregando texto: {file_path}")
-
-        loader = TextLoader(file_path, encoding="utf-8")
-        documents = loader.load()
+        logger.debug("Carregando texto: %s", file_path)
 
-        print("   ✅ Documento carregado")
+        documents = _read_text(file_path)
 
         # Chunking
         chunks = self.text_splitter.split_documents(documents)
 
-        print(f"   ✅ {len(chunks)} chunks criados")
+        logger.debug("%d chunks criados", len(chunks))
 
         return chunks
 
-    def ingest_file(self, file_path: str, metadata: dict[str, Any] | None = None) -> int:
+    # Loader por extensão de arquivo (novos formatos: basta adicionar aqui)
+    _LOADERS: dict[str, Callable[["DocumentIngestion", str], list[Document]]] = {
+        ".pdf": load_pdf,
+        ".txt": load_text,
+        ".md": load_text,
+    }
+
+    def _add_documents(
+        self, chunks: list[Document], batch_size: int, workers: int | None = None
+    ) -> int:
+        """
+        Adiciona chunks ao vector store em lotes (ver _add_texts).
+
+        Chunks com conteúdo repetido são gravados (e embedados) uma única vez.
+
+        Args:
+            chunks: Chunks a adicionar
+            batch_size: Chunks por lote de embedding
+            workers: Embeddings simultâneos (padrão: INGEST_EMBED_WORKERS)
+
+        Returns:
+            Número de chunks gravados (após a deduplicação)
+        """
+        chunks = _dedupe_chunks(chunks)
+        self._add_texts(
+            [chunk.page_content for chunk in chunks],
+            [_chroma_metadata(chunk.metadata) for chunk in chunks],
+            batch_size,
+            workers,
+        )
+        return len(chunks)
+
+    def _add_texts(
+        self,
+        texts: list[str],
+        metadatas: list[dict[str, Any] | None],
+        batch_size: int,
+        workers: int | None = None,
+    ) -> None:
+        """
+        Adiciona textos ao vector store em lotes (embedding + insert por lote).
+
+        Recebe listas paralelas (texto e metadata já no formato do ChromaDB),
+        o mesmo formato que vai para collection.add, sem Document no meio.
+
+        Cada lote é embedado numa única chamada (embed_documents). Até
+        `workers` embeddings rodam em paralelo (a chamada é I/O) enquanto os
+        vetores prontos são gravados em ordem, por uma única thread, direto na
+        coleção do ChromaDB em blocos de _INSERT_BATCH_SIZE (o insert no índice
+        HNSW rende mais em blocos grandes do que lote a lote). Se algo falhar,
+        tudo o que foi gravado é removido: a ingestão é tudo ou nada.
+
+        Args:
+            texts: Conteúdo de cada chunk
+            metadatas: Metadata de cada chunk (saída de _chroma_metadata)
+            batch_size: Chunks por lote de embedding
+            workers: Embeddings simultâneos (padrão: INGEST_EMBED_WORKERS)
+        """
+        if workers is None:
+            workers = hot_settings.ingest_embed_workers
+
+        # Ids definidos antes do insert: o rollback não depende de quais lotes
+        # chegaram a terminar
+        ids = [uuid.uuid4().hex for _ in texts]
+        batches = range(0, len(texts), batch_size)
+        collection = self.vectorstore._collection
+
+        # Vetores já embedados e ainda não gravados (a partir de pending_start)
+        pending: list[list[float]] = []
+        pending_start = 0
+
+        def embed(start: int) -> list[list[float]]:
+            return self.embeddings.embed_documents(texts[start : start + batch_size])
+
+        def flush():
+            nonlocal pending, pending_start
+            if not pending:
+                return
+            end = pending_start + len(pending)
+            collection.add(
+                ids=ids[pending_start:end],
+                embeddings=pending,
+                documents=texts[pending_start:end],
+                metadatas=metadatas[pending_start:end],
+            )
+            logger.debug("%d/%d chunks gravados", end, len(texts))
+            pending, pending_start = [], end
+
+        def insert(embeddings: list[list[float]]):
+            pending.extend(embeddings)
+            if len(pending) >= _INSERT_BATCH_SIZE:
+                flush()
+
+        try:
+            if workers <= 1 or len(batches) <= 1:
+                for start in batches:
+                    insert(embed(start))
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=min(workers, len(batches)), thread_name_prefix="taskni-embed"
+                ) as pool:
+                    futures = [pool.submit(embed, start) for start in batches]
+                    try:
+                        for future in futures:
+                            insert(future.result())
+                    except Exception:
+                        # Não inicia os lotes que ainda estão na fila
+                        for future in futures:
+                            future.cancel()
+                        raise
+            flush()
+        except Exception:
+            logger.warning("Falha na ingestão: removendo até %d chunks parciais", len(ids))
+            self.vectorstore.delete(ids=ids)
+            raise
+        finally:
+            self.version += 1
+
+    def ingest_file(
+        self,
+        file_path: str,
+        metadata: dict[str, Any] | None = None,
+        batch_size: int = 64,
+    ) -> int:
         """
         Ingere um arquivo (PDF ou texto) no vector store.
 
         Args:
             file_path: Caminho para o arquivo
             metadata: Metadata adicional para os documentos
+            batch_size: Chunks por lote de embedding + insert
 
         Returns:
             Número de chunks ingeridos
@@ -257,43 +687,257 @@ class DocumentIngestion:
         file_extension = Path(file_path).suffix.lower()
 
         # Carrega documento baseado na extensão
-        if file_extension == ".pdf":
-            chunks = self.load_pdf(file_path)
-        elif file_extension in [".txt", ".md"]:
-            chunks = self.load_text(file_path)
-        else:
+        loader = self._LOADERS.get(file_extension)
+        if loader is None:
             raise ValueError(f"Formato não suportado: {file_extension}")
+        chunks = loader(self, file_path)
 
-        # Adiciona metadata customizada
-        if metadata:
-            for chunk in chunks:
-                chunk.metadata.update(metadata)
-
-        # Adiciona metadata padrão
+        # Metadata customizada + padrão (iguais para todos os chunks)
+        base_metadata = {
+            **(metadata or {}),
+            "ingested_at": datetime.now().isoformat(),
+            "source_file": os.path.basename(file_path),
+        }
         for chunk in chunks:
-            chunk.metadata["ingested_at"] = datetime.now().isoformat()
-            chunk.metadata["source_file"] = os.path.basename(file_path)
+            chunk.metadata |= base_metadata
 
-        # Adiciona ao vector store
-        print(f"💾 Adicionando {len(chunks)} chunks ao ChromaDB...")
-        self.vectorstore.add_documents(chunks)
+        # Adiciona ao vector store (em lotes)
+        count = self._add_documents(chunks, batch_size)
 
-        print(f"✅ Ingestão completa: {len(chunks)} chunks")
+        logger.info("Ingestão completa: %d chunks", count)
 
-        return len(chunks)
+        return count
+
+    def ingest_files(
+        self,
+        file_paths: list[str],
+        metadata: dict[str, Any] | None = None,
+        batch_size: int = 64,
+        num_workers: int | None = None,
+    ) -> int:
+        """
+        Ingere vários arquivos, com leitura e chunking em paralelo.
+
+        O parse (principalmente de PDFs) é CPU-bound, então roda num pool de
+        processos; os chunks voltam para este processo e são gravados em
+        lotes. A ingestão é tudo ou nada para o conjunto de arquivos.
+
+        Args:
+            file_paths: Caminhos dos arquivos (PDF ou texto)
+            metadata: Metadata adicional para todos os documentos
+            batch_size: Chunks por lote de embedding + insert
+            num_workers: Processos de parse (padrão: min(CPUs, 4))
 
-    def ingest_text_direct(self, text: str, metadata: dict[str, Any] | None = None) -> int:
+        Returns:
+            Número de chunks ingeridos
+        """
+        for file_path in file_paths:
+            file_extension = Path(file_path).suffix.lower()
+            if file_extension not in self._LOADERS:
+                raise ValueError(f"Formato não suportado: {file_extension}")
+
+        if num_workers is None:
+            num_workers = min(os.cpu_count() or 1, 4)
+        num_workers = min(num_workers, len(file_paths))
+
+        tasks = [(file_path, self.chunk_size, self.chunk_overlap) for file_path in file_paths]
+        if num_workers <= 1:
+            results = [_load_and_split(task) for task in tasks]
+        else:
+            # spawn: o app tem threads rodando (fork não é seguro aqui)
+            with multiprocessing.get_context("spawn").Pool(num_workers) as pool:
+                results = list(pool.imap_unordered(_load_and_split, tasks, chunksize=2))
+
+        ingested_at = datetime.now().isoformat()
+        chunks: list[Document] = []
+        for file_path, file_chunks in results:
+            base_metadata = {
+                **(metadata or {}),
+                "ingested_at": ingested_at,
+                "source_file": os.path.basename(file_path),
+            }
+            for chunk in file_chunks:
+                chunk.metadata |= base_metadata
+            chunks += file_chunks
+
+        # Adiciona ao vector store (em lotes)
+        count = self._add_documents(chunks, batch_size)
+
+        logger.info("Ingestão completa: %d arquivos, %d chunks", len(file_paths), count)
+
+        return count
+
+    async def ingest_files_async(
+        self,
+        file_paths: list[str],
+        metadata: dict[str, Any] | None = None,
+        batch_size: int = 64,
+        queue_size: int = 4,
+    ) -> int:
+        """
+        Ingere vários arquivos num pipeline assíncrono em estágios.
+
+        leitura → chunking → embedding → insert rodam ao mesmo tempo, ligados
+        por filas limitadas: enquanto um lote é embedado (rede), o próximo
+        arquivo já está sendo lido (disco) e o anterior gravado (ChromaDB).
+        As filas limitam a memória a ~queue_size lotes por estágio.
+        A ingestão é tudo ou nada para o conjunto de arquivos.
+
+        Chunks com conteúdo repetido são descartados, mas, ao contrário de
+        ingest_files, sem juntar a metadata das repetições (a primeira
+        ocorrência pode já ter sido gravada).
+
+        Args:
+            file_paths: Caminhos dos arquivos (PDF ou texto)
+            metadata: Metadata adicional para todos os documentos
+            batch_size: Chunks por lote de embedding
+            queue_size: Itens máximos em cada fila entre estágios
+
+        Returns:
+            Número de chunks ingeridos
+        """
+        for file_path in file_paths:
+            file_extension = Path(file_path).suffix.lower()
+            if file_extension not in self._LOADERS:
+                raise ValueError(f"Formato não suportado: {file_extension}")
+
+        workers = max(1, hot_settings.ingest_embed_workers)
+        ingested_at = datetime.now().isoformat()
+        collection = self.vectorstore._collection
+
+        loaded: asyncio.Queue[tuple[str, list[Document]] | None] = asyncio.Queue(queue_size)
+        batches: asyncio.Queue[list[Document] | None] = asyncio.Queue(queue_size)
+        embedded: asyncio.Queue[tuple[list[Document], list[list[float]]] | None] = asyncio.Queue(
+            queue_size
+        )
+
+        # Ids de tudo que foi (ou está sendo) gravado, para o rollback
+        ids: list[str] = []
+
+        async def load():
+            for file_path in file_paths:
+                reader = _READERS[Path(file_path).suffix.lower()]
+                await loaded.put((file_path, await asyncio.to_thread(reader, file_path)))
+            await loaded.put(None)
+
+        async def split():
+            pending: list[Document] = []
+            # Conteúdos já enviados (repetições entre arquivos não são embedadas)
+            seen: set[str] = set()
+            while (item := await loaded.get()) is not None:
+                file_path, documents = item
+                chunks = await asyncio.to_thread(self.text_splitter.split_documents, documents)
+
+                base_metadata = {
+                    **(metadata or {}),
+                    "ingested_at": ingested_at,
+                    "source_file": os.path.basename(file_path),
+                }
+                for chunk in chunks:
+                    if chunk.page_content not in seen:
+                        seen.add(chunk.page_content)
+                        chunk.metadata |= base_metadata
+                        pending.append(chunk)
+                while len(pending) >= batch_size:
+                    await batches.put(pending[:batch_size])
+                    pending = pending[batch_size:]
+
+            if pending:
+                await batches.put(pending)
+            for _ in range(workers):
+                await batches.put(None)
+
+        async def embed():
+            while (chunks := await batches.get()) is not None:
+                texts = [chunk.page_content for chunk in chunks]
+                await embedded.put((chunks, await self.embeddings.aembed_documents(texts)))
+            await embedded.put(None)
+
+        async def upsert() -> int:
+            total = 0
+            buffer: list[Document] = []
+            vectors: list[list[float]] = []
+
+            async def flush():
+                nonlocal buffer, vectors, total
+                if not buffer:
+                    return
+                batch_ids = [uuid.uuid4().hex for _ in buffer]
+                ids.extend(batch_ids)
+                await asyncio.to_thread(
+                    collection.add,
+                    ids=batch_ids,
+                    embeddings=vectors,
+                    documents=[chunk.page_content for chunk in buffer],
+                    metadatas=[_chroma_metadata(chunk.metadata) for chunk in buffer],
+                )
+                total += len(buffer)
+                buffer, vectors = [], []
+
+            finished = 0
+            while finished < workers:
+                item = await embedded.get()
+                if item is None:
+                    finished += 1
+                    continue
+                buffer += item[0]
+                vectors += item[1]
+                if len(buffer) >= _INSERT_BATCH_SIZE:
+                    await flush()
+            await flush()
+            return total
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(load())
+                group.create_task(split())
+                for _ in range(workers):
+                    group.create_task(embed())
+                upsert_task = group.create_task(upsert())
+        except BaseException as e:
+            logger.warning("Falha na ingestão: removendo até %d chunks parciais", len(ids))
+            if ids:
+                await asyncio.to_thread(self.vectorstore.delete, ids=ids)
+            # TaskGroup agrupa os erros: todos vão para o log (a ordem depende
+            # de qual estágio falhou antes) e o primeiro é propagado, como em
+            # ingest_files; o grupo inteiro fica em __cause__
+            if isinstance(e, BaseExceptionGroup):
+                for index, error in enumerate(e.exceptions, 1):
+                    logger.error(
+                        "Erro %d/%d na ingestão: %s",
+                        index,
+                        len(e.exceptions),
+                        error,
+                        exc_info=error,
+                    )
+                raise e.exceptions[0] from e
+            raise
+        finally:
+            self.version += 1
+
+        total = upsert_task.result()
+        logger.info("Ingestão completa: %d arquivos, %d chunks", len(file_paths), total)
+
+        return total
+
+    def ingest_text_direct(
+        self,
+        text: str,
+        metadata: dict[str, Any] | None = None,
+        batch_size: int = 64,
+    ) -> int:
         """
         Ingere texto diretamente (sem arquivo).
 
         Args:
             text: Texto a ser ingerido
             metadata: Metadata para o documento
+            batch_size: Chunks por lote de embedding + insert
 
         Returns:
             Número de chunks ingeridos
         """
-        print(f"📝 Ingerindo texto direto ({len(text)} caracteres)")
+        logger.debug("Ingerindo texto direto (%d caracteres)", len(text))
 
         # Cria documento
         doc = Document(page_content=text, metadata=metadata or {})
@@ -301,18 +945,59 @@ class DocumentIngestion:
         # Chunking
         chunks = self.text_splitter.split_documents([doc])
 
-        # Adiciona metadata padrão
+        # Adiciona metadata padrão (igual para todos os chunks)
+        base_metadata = {"ingested_at": datetime.now().isoformat(), "source": "direct_text"}
         for chunk in chunks:
-            chunk.metadata["ingested_at"] = datetime.now().isoformat()
-            chunk.metadata["source"] = "direct_text"
+            chunk.metadata |= base_metadata
 
-        # Adiciona ao vector store
-        print(f"💾 Adicionando {len(chunks)} chunks ao ChromaDB...")
-        self.vectorstore.add_documents(chunks)
+        # Adiciona ao vector store (em lotes)
+        count = self._add_documents(chunks, batch_size)
 
-        print(f"✅ Ingestão completa: {len(chunks)} chunks")
+        logger.info("Ingestão completa: %d chunks", count)
 
-        return len(chunks)
+        return count
+
+    def ingest_chunks(
+        self,
+        texts: list[str],
+        metadata: dict[str, Any] | None = None,
+        batch_size: int = 64,
+    ) -> int:
+        """
+        Ingere chunks já prontos (sem passar pelo text splitter).
+
+        Args:
+            texts: Conteúdo de cada chunk
+            metadata: Metadata para todos os chunks
+            batch_size: Chunks por lote de embedding + insert
+
+        Returns:
+            Número de chunks ingeridos
+        """
+        logger.debug("Ingerindo %d chunks prontos", len(texts))
+
+        # Metadata é a mesma para todos: repetições são só descartadas
+        unique_texts = list(dict.fromkeys(texts))
+        if len(unique_texts) < len(texts):
+            logger.info("Deduplicação: %d → %d chunks", len(texts), len(unique_texts))
+        texts = unique_texts
+
+        # A metadata é a mesma para todos os chunks: convertida uma única vez
+        # e compartilhada (sem um Document/dict por chunk)
+        chunk_metadata = _chroma_metadata(
+            {
+                **(metadata or {}),
+                "ingested_at": datetime.now().isoformat(),
+                "source": "direct_chunks",
+            }
+        )
+
+        # Adiciona ao vector store (em lotes)
+        self._add_texts(texts, [chunk_metadata] * len(texts), batch_size)
+
+        logger.info("Ingestão completa: %d chunks", len(texts))
+
+        return len(texts)
 
     def search(
         self, query: str, k: int = 4, filter: dict[str, Any] | None = None
@@ -328,6 +1013,10 @@ class DocumentIngestion:
         Returns:
             Lista de documentos mais relevantes
         """
+        # Consulta vazia ou k <= 0: nada a buscar (evita embedding + consulta)
+        if k <= 0 or not query.strip():
+            return []
+
         # SANITIZA FILTROS PARA PREVENIR SQL/NoSQL INJECTION
         if filter is not None:
             filter = sanitize_rag_filter(filter)
@@ -336,6 +1025,88 @@ class DocumentIngestion:
 
         return results
 
+    def embed_query(self, query: str) -> list[float]:
+        """
+        Gera o embedding de uma consulta com o mesmo modelo do vector store.
+
+        Args:
+            query: Texto da consulta
+
+        Returns:
+            Vetor de embedding
+        """
+        return self.embeddings.embed_query(query)
+
+    def search_by_vector(
+        self, embedding: list[float], k: int = 4, filter: dict[str, Any] | None = None
+    ) -> list[Document]:
+        """
+        Busca documentos similares a partir de um embedding já calculado.
+
+        Evita recalcular o embedding quando o chamador já o tem em mãos.
+
+        Args:
+            embedding: Embedding da consulta (ver embed_query)
+            k: Número de documentos a retornar
+            filter: Filtros de metadata (será sanitizado)
+
+        Returns:
+            Lista de documentos mais relevantes
+        """
+        if filter is not None:
+            filter = sanitize_rag_filter(filter)
+
+        return self.vectorstore.similarity_search_by_vector(embedding, k=k, filter=filter)
+
+    def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """
+        Gera embeddings de várias consultas.
+
+        Cada consulta passa por embed_query, como em embed_query/search:
+        embed_documents não serve aqui, pois provedores como o Ollama usam
+        prefixos diferentes para consulta ("query: ") e documento
+        ("passage: ") e o vetor resultante seria outro.
+
+        Args:
+            queries: Textos das consultas
+
+        Returns:
+            Embeddings na mesma ordem das consultas
+        """
+        return [self.embeddings.embed_query(query) for query in queries]
+
+    def search_by_vectors(
+        self, embeddings: list[list[float]], k: int = 4, filter: dict[str, Any] | None = None
+    ) -> list[list[Document]]:
+        """
+        Busca documentos para várias consultas em uma única query ao ChromaDB.
+
+        Args:
+            embeddings: Embeddings das consultas
+            k: Número de documentos por consulta
+            filter: Filtros de metadata (será sanitizado)
+
+        Returns:
+            Lista de documentos mais relevantes para cada consulta
+        """
+        if filter is not None:
+            filter = sanitize_rag_filter(filter)
+
+        results = self.vectorstore._collection.query(
+            query_embeddings=embeddings,
+            n_results=k,
+            where=filter,
+            include=["documents", "metadatas"],
+        )
+
+        return [
+            [
+                Document(page_content=text, metadata=metadata or {})
+                for text, metadata in zip(texts, metadatas, strict=True)
+            ]
+            for texts, metadatas in zip(results["documents"], results["metadatas"], strict=True)
+        ]
+
     def get_retriever(self, k: int = 4):
         """
         Retorna um retriever configurado.
@@ -344,9 +1115,15 @@ class DocumentIngestion:
             k: Número de documentos a retornar
 
         Returns:
-            Retriever do LangChain
+            Retriever do LangChain (um por k, reutilizado entre chamadas)
         """
-        return self.vectorstore.as_retriever(search_type="similarity", search_kwargs={"k": k})
+        retriever = self._retrievers.get(k)
+        if retriever is None:
+            retriever = self.vectorstore.as_retriever(
+                search_type="similarity", search_kwargs={"k": k}
+            )
+            self._retrievers[k] = retriever
+        return retriever
 
     def list_collections(self) -> list[str]:
         """Lista todas as coleções no ChromaDB."""
@@ -355,31 +1132,66 @@ class DocumentIngestion:
         return [self.collection_name]
 
     def get_collection_stats(self) -> dict[str, Any]:
-        """Retorna estatísticas da coleção."""
-        collection = self.vectorstore._collection
+        """
+        Retorna estatísticas da coleção.
+
+        A contagem fica em cache por _STATS_TTL_SECONDS (e é refeita na hora
+        se a coleção mudou neste processo).
+        """
+        now = time.monotonic()
+        version = self.version
+        cached = self._count_cache
+        if cached is None or cached[0] != version or now - cached[1] >= _STATS_TTL_SECONDS:
+            cached = (version, now, self.vectorstore._collection.count())
+            self._count_cache = cached
+        count = cached[2]
 
         return {
             "name": self.collection_name,
-            "count": collection.count(),
+            "count": count,
             "persist_directory": self.persist_directory,
         }
 
+    def count_documents(self, where: dict[str, Any]) -> int:
+        """
+        Conta os chunks cujo metadata casa com o filtro.
+
+        Args:
+            where: Filtro de metadata do ChromaDB (ex: {"doc_sha256": "..."})
+
+        Returns:
+            Número de chunks encontrados
+        """
+        return len(self.vectorstore._collection.get(where=where, include=[])["ids"])
+
+    def delete_documents(self, where: dict[str, Any]):
+        """
+        Remove os documentos cujo metadata casa com o filtro.
+
+        Args:
+            where: Filtro de metadata do ChromaDB (ex: {"ingest_job_id": "..."})
+        """
+        self.vectorstore._collection.delete(where=where)
+        self.version += 1
+
     def delete_collection(self):
         """Deleta a coleção atual (cuidado!)."""
-        print(f"🗑️  Deletando coleção: {self.collection_name}")
+        logger.info("Deletando coleção: %s", self.collection_name)
         self.vectorstore.delete_collection()
-        print("✅ Coleção deletada")
+        self.version += 1
 
-
-# Instância global para uso no app
-_ingestion_pipeline: DocumentIngestion | None = None
+        # Próximos pipelines desta coleção abrem um store novo
+        with _stores_lock:
+            if _stores.get(self._store_key) is self._store:
+                del _stores[self._store_key]
 
 
+@functools.cache
 def get_ingestion_pipeline() -> DocumentIngestion:
-    """Retorna instância singleton do pipeline de ingestão."""
-    global _ingestion_pipeline
-
-    if _ingestion_pipeline is None:
-        _ingestion_pipeline = DocumentIngestion()
+    """
+    Retorna instância singleton do pipeline de ingestão.
 
-    return _ingestion_pipeline
+    Vector store e modelo de embeddings são carregados uma única vez por
+    processo e compartilhados por todos os agentes e rotas RAG.
+    """
+    return DocumentIngestion()
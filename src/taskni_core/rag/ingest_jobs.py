@@ -0,0 +1,294 @@
+"""
+Fila de ingestão em background.
+
+As rotas de upload/ingestão só gravam o arquivo temporário, enfileiram um
+job e respondem 202 com o id do job; o parse → chunk → embed → store roda
+num worker iniciado no lifespan do app. O status é consultado por
+`GET /rag/jobs/{job_id}`.
+
+A fila é em processo (asyncio.Queue): com vários workers do uvicorn cada
+processo tem a sua. Para deploys multi-processo, troque por Celery/RQ.
+
+Uso:
+    ingest_job_queue.start()                    # no startup
+    job = ingest_job_queue.submit_file(path, "faq.pdf", metadata)
+    ingest_job_queue.get(job.id).status         # queued | running | done | failed
+    await ingest_job_queue.stop()               # no shutdown
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from taskni_core.core.settings import hot_settings, taskni_settings
+from taskni_core.utils.error_handler import safe_str_exception
+
+logger = logging.getLogger(__name__)
+
+# Chave de metadata que liga cada chunk ao job que o ingeriu
+JOB_ID_METADATA_KEY = "ingest_job_id"
+
+# Chave de metadata com o SHA-256 do conteúdo original (deduplicação)
+DOC_HASH_METADATA_KEY = "doc_sha256"
+
+
+@dataclass(slots=True)
+class IngestJob:
+    """
+    Job de ingestão.
+
+    Campos:
+    - id: Identificador do job
+    - source: Nome do arquivo (ou "texto direto")
+    - status: queued | running | done | failed
+    - chunks_count: Chunks ingeridos (quando done)
+    - error: Mensagem de erro (quando failed)
+    - duplicate: Conteúdo já estava ingerido (job concluído sem reingerir)
+    """
+
+    id: str
+    source: str
+    status: str = "queued"
+    chunks_count: int | None = None
+    error: str | None = None
+    duplicate: bool = False
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: datetime | None = None
+
+    # Payload do job (não exposto na API)
+    file_path: str | None = field(default=None, repr=False)
+    text: str | None = field(default=None, repr=False)
+    chunks: list[str] | None = field(default=None, repr=False)
+    metadata: dict[str, Any] = field(default_factory=dict, repr=False)
+
+
+class IngestionJobQueue:
+    """
+    Fila de jobs de ingestão drenada por workers asyncio.
+
+    A ingestão em si é síncrona (loaders, embeddings, ChromaDB) e roda numa
+    thread via asyncio.to_thread. Em caso de erro, os chunks que o job já
+    tenha gravado são removidos.
+    """
+
+    def __init__(self, workers: int = 1, max_jobs: int = 1000):
+        """
+        Inicializa a fila (os workers só sobem em start()).
+
+        Args:
+            workers: Número de workers concorrentes
+            max_jobs: Máximo de jobs mantidos para consulta de status
+                (os mais antigos são descartados)
+        """
+        self.workers = workers
+        self.max_jobs = max_jobs
+
+        self._jobs: OrderedDict[str, IngestJob] = OrderedDict()
+        self._queue: asyncio.Queue[IngestJob] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        """Cria a fila e sobe os workers no event loop atual."""
+        if self._tasks:
+            return
+
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"taskni-ingest-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Para os workers e descarta os jobs ainda na fila."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                job = self._queue.get_nowait()
+                self._finish(job, error="Servidor encerrado antes da ingestão")
+                self._remove_file(job)
+            self._queue = None
+
+    def submit_file(
+        self,
+        file_path: str,
+        source: str,
+        metadata: dict[str, Any] | None = None,
+        content_hash: str | None = None,
+    ) -> IngestJob:
+        """
+        Enfileira a ingestão de um arquivo.
+
+        O arquivo é removido quando o job termina (com sucesso ou não).
+
+        Args:
+            file_path: Caminho do arquivo temporário
+            source: Nome original do arquivo
+            metadata: Metadata adicional para os documentos
+            content_hash: SHA-256 do conteúdo (pula a ingestão se já existir)
+
+        Returns:
+            O job criado (status "queued")
+        """
+        job = IngestJob(id="", source=source, file_path=file_path)
+        return self._submit(job, metadata, content_hash)
+
+    def submit_text(
+        self, text: str, metadata: dict[str, Any] | None = None, content_hash: str | None = None
+    ) -> IngestJob:
+        """
+        Enfileira a ingestão de texto direto.
+
+        Args:
+            text: Texto a ser ingerido
+            metadata: Metadata para o documento
+            content_hash: SHA-256 do texto (pula a ingestão se já existir)
+
+        Returns:
+            O job criado (status "queued")
+        """
+        job = IngestJob(id="", source="texto direto", text=text)
+        return self._submit(job, metadata, content_hash)
+
+    def submit_chunks(
+        self,
+        chunks: list[str],
+        metadata: dict[str, Any] | None = None,
+        content_hash: str | None = None,
+    ) -> IngestJob:
+        """
+        Enfileira a ingestão de chunks já prontos (sem chunking).
+
+        Args:
+            chunks: Conteúdo de cada chunk
+            metadata: Metadata para todos os chunks
+            content_hash: SHA-256 dos chunks (pula a ingestão se já existir)
+
+        Returns:
+            O job criado (status "queued")
+        """
+        job = IngestJob(id="", source="chunks diretos", chunks=chunks)
+        return self._submit(job, metadata, content_hash)
+
+    def get(self, job_id: str) -> IngestJob | None:
+        """
+        Busca um job pelo id.
+
+        Args:
+            job_id: Id do job
+
+        Returns:
+            O job, ou None se não existir (ou já tiver sido descartado)
+        """
+        return self._jobs.get(job_id)
+
+    def _submit(
+        self, job: IngestJob, metadata: dict[str, Any] | None, content_hash: str | None
+    ) -> IngestJob:
+        if self._queue is None:
+            raise RuntimeError("Fila de ingestão não iniciada (chame start() no startup)")
+
+        job.id = uuid.uuid4().hex
+        job.metadata = {**(metadata or {}), JOB_ID_METADATA_KEY: job.id}
+        if content_hash is not None:
+            job.metadata[DOC_HASH_METADATA_KEY] = content_hash
+
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+        self._queue.put_nowait(job)
+        logger.info("Job de ingestão %s enfileirado (%s)", job.id, job.source)
+        return job
+
+    async def _worker(self):
+        """Consome a fila até ser cancelado."""
+        assert self._queue is not None
+        queue = self._queue
+
+        while True:
+            job = await queue.get()
+            try:
+                job.status = "running"
+                chunks_count = await asyncio.to_thread(self._ingest, job)
+            except Exception as e:
+                logger.error("Falha no job de ingestão %s: %s", job.id, safe_str_exception(e))
+                self._finish(job, error="Erro ao ingerir documento")
+                await asyncio.to_thread(self._delete_partial, job)
+            else:
+                self._finish(job, chunks_count=chunks_count)
+                logger.info("Job de ingestão %s concluído (%d chunks)", job.id, chunks_count)
+            finally:
+                self._remove_file(job)
+                queue.task_done()
+
+    @staticmethod
+    def _ingest(job: IngestJob) -> int:
+        """Executa a ingestão do job (roda numa thread)."""
+        # Import tardio: LangChain/ChromaDB só são carregados no primeiro job
+        from taskni_core.rag.ingest import get_ingestion_pipeline
+
+        pipeline = get_ingestion_pipeline()
+
+        # Conteúdo idêntico já ingerido (ex: upload repetido enquanto estava na fila)
+        content_hash = job.metadata.get(DOC_HASH_METADATA_KEY)
+        if content_hash is not None:
+            existing = pipeline.count_documents({DOC_HASH_METADATA_KEY: content_hash})
+            if existing:
+                job.duplicate = True
+                return existing
+
+        batch_size = hot_settings.ingest_batch_size
+        if job.file_path is not None:
+            return pipeline.ingest_file(
+                file_path=job.file_path, metadata=job.metadata, batch_size=batch_size
+            )
+        if job.chunks is not None:
+            return pipeline.ingest_chunks(
+                texts=job.chunks, metadata=job.metadata, batch_size=batch_size
+            )
+        return pipeline.ingest_text_direct(
+            text=job.text or "", metadata=job.metadata, batch_size=batch_size
+        )
+
+    @staticmethod
+    def _delete_partial(job: IngestJob):
+        """Remove os chunks que um job com erro já tenha gravado."""
+        from taskni_core.rag.ingest import get_ingestion_pipeline
+
+        try:
+            get_ingestion_pipeline().delete_documents(where={JOB_ID_METADATA_KEY: job.id})
+        except Exception as e:
+            logger.warning("Não foi possível limpar o job %s: %s", job.id, safe_str_exception(e))
+
+    @staticmethod
+    def _finish(job: IngestJob, chunks_count: int | None = None, error: str | None = None):
+        job.status = "failed" if error else "done"
+        job.chunks_count = chunks_count
+        job.error = error
+        job.finished_at = datetime.now()
+        # O payload não é mais necessário (o job fica guardado para consulta)
+        job.text = None
+        job.chunks = None
+
+    @staticmethod
+    def _remove_file(job: IngestJob):
+        if job.file_path is None:
+            return
+        try:
+            os.unlink(job.file_path)
+        except FileNotFoundError:
+            pass
+
+
+# Singleton global (iniciado/parado no lifespan do app)
+# O número de workers é o teto global de ingestões simultâneas
+ingest_job_queue = IngestionJobQueue(workers=max(1, taskni_settings.MAX_CONCURRENT_INGESTS))
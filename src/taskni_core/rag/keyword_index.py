@@ -0,0 +1,200 @@
+"""
+Índice de palavras-chave (BM25) sobre a coleção do ChromaDB.
+
+Complementa a busca densa (embeddings) com uma busca esparsa: termos
+exatos como nomes de procedimentos, códigos e valores, que embeddings
+nem sempre capturam bem. Os resultados das duas buscas são fundidos
+por reciprocal rank fusion (ver `reciprocal_rank_fusion`).
+
+O índice fica em memória e é reconstruído quando a coleção muda
+(DocumentIngestion.version). Bases de FAQ são pequenas, então a
+reconstrução é barata.
+"""
+
+import logging
+import math
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+from langchain_core.documents import Document
+
+from taskni_core.rag.ingest import DocumentIngestion
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> list[str]:
+    """Tokeniza texto em palavras minúsculas."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[Document]], k: int, rrf_k: int = 60
+) -> list[Document]:
+    """
+    Funde listas ranqueadas de documentos por reciprocal rank fusion.
+
+    Cada documento recebe sum(1 / (rrf_k + posição)) sobre as listas em que
+    aparece; documentos iguais (mesmo conteúdo) são unificados.
+
+    Args:
+        rankings: Listas de documentos, cada uma ordenada por relevância
+        k: Número de documentos a retornar
+        rrf_k: Constante de suavização do RRF (padrão da literatura: 60)
+
+    Returns:
+        Os k documentos com maior score fundido
+    """
+    scores: dict[str, float] = defaultdict(float)
+    docs: dict[str, Document] = {}
+
+    for ranking in rankings:
+        for position, doc in enumerate(ranking, 1):
+            key = doc.page_content
+            scores[key] += 1.0 / (rrf_k + position)
+            docs.setdefault(key, doc)
+
+    best = sorted(scores, key=scores.__getitem__, reverse=True)[:k]
+    return [docs[key] for key in best]
+
+
+@dataclass(slots=True, frozen=True)
+class _IndexSnapshot:
+    """
+    Índice BM25 construído para uma versão da coleção.
+
+    Imutável: uma reconstrução publica um snapshot novo com uma única
+    atribuição, então buscas concorrentes nunca veem um índice pela metade.
+    """
+
+    version: int | None
+    docs: list[Document]
+    postings: dict[str, tuple[np.ndarray, np.ndarray]]
+    idf: dict[str, float]
+    norm: np.ndarray
+
+
+_EMPTY_SNAPSHOT = _IndexSnapshot(
+    version=None, docs=[], postings={}, idf={}, norm=np.zeros(0, dtype=np.float32)
+)
+
+
+class KeywordIndex:
+    """
+    Índice BM25 (Okapi) em memória sobre os documentos do vector store.
+
+    Postings por termo são arrays numpy (ids dos docs + frequências), então a
+    pontuação de uma consulta é um punhado de operações vetorizadas.
+    """
+
+    def __init__(self, ingestion: DocumentIngestion, k1: float = 1.5, b: float = 0.75):
+        """
+        Inicializa o índice (construído sob demanda na primeira busca).
+
+        Args:
+            ingestion: Pipeline de ingestão (fonte dos documentos)
+            k1: Saturação da frequência de termo
+            b: Normalização pelo tamanho do documento
+        """
+        self.ingestion = ingestion
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.Lock()
+        self._snapshot = _EMPTY_SNAPSHOT
+
+    def _ensure_built(self) -> _IndexSnapshot:
+        """
+        Reconstrói o índice se a coleção mudou desde a última construção.
+
+        Returns:
+            Snapshot do índice para a versão atual da coleção
+        """
+        snapshot = self._snapshot
+        if snapshot.version == self.ingestion.version:
+            return snapshot
+
+        with self._lock:
+            version = self.ingestion.version
+            snapshot = self._snapshot
+            if snapshot.version == version:
+                return snapshot
+
+            data = self.ingestion.vectorstore._collection.get(include=["documents", "metadatas"])
+            texts = data["documents"] or []
+            metadatas = data["metadatas"] or [None] * len(texts)
+
+            postings: dict[str, tuple[list[int], list[int]]] = defaultdict(lambda: ([], []))
+            lengths = np.zeros(len(texts), dtype=np.float32)
+
+            for doc_id, text in enumerate(texts):
+                term_freqs: dict[str, int] = defaultdict(int)
+                tokens = _tokenize(text)
+                for token in tokens:
+                    term_freqs[token] += 1
+                lengths[doc_id] = len(tokens)
+                for term, freq in term_freqs.items():
+                    ids, freqs = postings[term]
+                    ids.append(doc_id)
+                    freqs.append(freq)
+
+            n_docs = len(texts)
+            avg_length = float(lengths.mean()) if n_docs else 0.0
+
+            snapshot = _IndexSnapshot(
+                version=version,
+                docs=[
+                    Document(page_content=text, metadata=metadata or {})
+                    for text, metadata in zip(texts, metadatas, strict=True)
+                ],
+                postings={
+                    term: (np.asarray(ids, dtype=np.int32), np.asarray(freqs, dtype=np.float32))
+                    for term, (ids, freqs) in postings.items()
+                },
+                idf={
+                    term: math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+                    for term, (ids, _) in postings.items()
+                },
+                # Denominador do BM25 sem o tf: k1 * (1 - b + b * dl / avgdl)
+                norm=self.k1 * (1 - self.b + self.b * lengths / (avg_length or 1.0)),
+            )
+            self._snapshot = snapshot
+
+            logger.debug("Índice BM25 construído (%d documentos)", n_docs)
+            return snapshot
+
+    def search(self, query: str, k: int = 4) -> list[Document]:
+        """
+        Busca os documentos mais relevantes por BM25.
+
+        Args:
+            query: Texto da consulta
+            k: Número de documentos a retornar
+
+        Returns:
+            Documentos ordenados por relevância (só os com score > 0)
+        """
+        # Um único snapshot por busca: uma reconstrução concorrente não
+        # mistura docs, postings e normas de versões diferentes
+        index = self._ensure_built()
+
+        if not index.docs:
+            return []
+
+        scores = np.zeros(len(index.docs), dtype=np.float32)
+        for term in set(_tokenize(query)):
+            posting = index.postings.get(term)
+            if posting is None:
+                continue
+            ids, freqs = posting
+            scores[ids] += index.idf[term] * freqs * (self.k1 + 1) / (freqs + index.norm[ids])
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [index.docs[i] for i in top if scores[i] > 0]
@@ -0,0 +1,169 @@
+"""
+Micro-batching de embedding e busca no vector store.
+
+Sob carga, cada FaqRagAgent.run() concorrente faria seu próprio embedding
+e sua própria busca no ChromaDB. O BatchedSearchCoordinator acumula as
+consultas que chegam dentro de uma janela curta (ex: 5ms) e executa:
+- os embeddings de todas as perguntas numa única ida à thread de I/O
+  (embed_query por pergunta: mesmo vetor da busca individual)
+- uma única query ao ChromaDB com todos os embeddings
+
+Uso:
+    coordinator = BatchedSearchCoordinator(get_ingestion_pipeline(), k=4)
+    docs = await coordinator.submit("Qual o horário de funcionamento?")
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from langchain_core.documents import Document
+
+from taskni_core.rag.ingest import DocumentIngestion
+
+logger = logging.getLogger(__name__)
+
+
+class _MicroBatcher:
+    """
+    Agrupa chamadas concorrentes a uma função síncrona de lote.
+
+    `batch_fn` recebe a lista de itens e devolve a lista de resultados na
+    mesma ordem; roda numa thread para não bloquear o event loop.
+    """
+
+    def __init__(
+        self, batch_fn: Callable[[list[Any]], list[Any]], batch_window_ms: float, max_batch: int
+    ):
+        self.batch_fn = batch_fn
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+
+        # Uma fila por event loop: futures pertencem ao loop que as criou
+        self._pending: dict[asyncio.AbstractEventLoop, list[tuple[Any, asyncio.Future]]] = {}
+        self._timers: dict[asyncio.AbstractEventLoop, asyncio.TimerHandle] = {}
+
+        # Referências às tasks de despacho (evita coleta pelo GC no meio do batch)
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Enfileira um item e aguarda o resultado do seu batch."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        pending = self._pending.get(loop)
+        if pending is None:
+            pending = self._pending[loop] = []
+            self._timers[loop] = loop.call_later(self.batch_window, self._flush, loop)
+
+        pending.append((item, future))
+
+        if len(pending) >= self.max_batch:
+            self._flush(loop)
+
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop):
+        """Drena a fila do loop e despacha o batch."""
+        timer = self._timers.pop(loop, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(loop, None)
+        if batch:
+            task = loop.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: list[tuple[Any, asyncio.Future]]):
+        """Executa o batch numa thread e entrega cada resultado ao seu chamador."""
+        items = [item for item, _ in batch]
+
+        try:
+            results = await asyncio.to_thread(self.batch_fn, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+
+class BatchedSearchCoordinator:
+    """
+    Coordena embedding + busca em lote para consultas concorrentes.
+
+    Expõe as duas etapas separadamente (`embed` e `search`) para que o
+    chamador possa reaproveitar o embedding (ex: cache semântico), e
+    `submit` para o caminho completo.
+    """
+
+    def __init__(
+        self,
+        ingestion: DocumentIngestion,
+        k: int = 4,
+        batch_window_ms: float = 5.0,
+        max_batch: int = 32,
+    ):
+        """
+        Inicializa o coordenador.
+
+        Args:
+            ingestion: Pipeline de ingestão (embedder + vector store)
+            k: Número de documentos por consulta
+            batch_window_ms: Janela de agrupamento em milissegundos
+            max_batch: Tamanho máximo de um batch
+        """
+        self.ingestion = ingestion
+        self.k = k
+
+        self._embedder = _MicroBatcher(self._embed_batch, batch_window_ms, max_batch)
+        self._searcher = _MicroBatcher(self._search_batch, batch_window_ms, max_batch)
+
+    def _embed_batch(self, queries: list[str]) -> list[list[float]]:
+        logger.debug("Embedding em lote de %d consulta(s)", len(queries))
+        return self.ingestion.embed_queries(queries)
+
+    def _search_batch(self, embeddings: list[list[float]]) -> list[list[Document]]:
+        logger.debug("Busca em lote de %d consulta(s)", len(embeddings))
+        return self.ingestion.search_by_vectors(embeddings, k=self.k)
+
+    async def embed(self, query: str) -> list[float]:
+        """
+        Gera o embedding de uma consulta (agrupado com consultas concorrentes).
+
+        Args:
+            query: Texto da consulta
+
+        Returns:
+            Vetor de embedding
+        """
+        return await self._embedder.submit(query)
+
+    async def search(self, embedding: list[float]) -> list[Document]:
+        """
+        Busca documentos a partir de um embedding (agrupado com buscas concorrentes).
+
+        Args:
+            embedding: Embedding da consulta
+
+        Returns:
+            Documentos mais relevantes
+        """
+        return await self._searcher.submit(embedding)
+
+    async def submit(self, query: str) -> list[Document]:
+        """
+        Embedding + busca para uma consulta.
+
+        Args:
+            query: Texto da consulta
+
+        Returns:
+            Documentos mais relevantes
+        """
+        return await self.search(await self.embed(query))
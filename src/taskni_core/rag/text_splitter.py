@@ -0,0 +1,83 @@
+"""
+Text splitter recursivo com merge de chunks otimizado.
+
+Mesma saída do RecursiveCharacterTextSplitter do LangChain, com duas
+diferenças de custo:
+- _merge_splits mede cada pedaço uma única vez e descarta o início da janela
+  com deque.popleft (o original re-mede o pedaço descartado e recopia a
+  lista inteira a cada descarte, o que é quadrático em textos longos);
+- create_documents copia a metadata de cada chunk com dict() em vez de
+  copy.deepcopy (a metadata dos loaders só tem valores escalares).
+
+Este módulo importa langchain_text_splitters: é carregado sob demanda por
+`taskni_core.rag.ingest`.
+"""
+
+import logging
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+logger = logging.getLogger(__name__)
+
+
+class FastRecursiveSplitter(RecursiveCharacterTextSplitter):
+    """RecursiveCharacterTextSplitter com merge linear e cópia rasa de metadata."""
+
+    def _merge_splits(self, splits: Iterable[str], separator: str) -> list[str]:
+        length_function = self._length_function
+        separator_len = length_function(separator)
+
+        docs: list[str] = []
+        # Janela atual: pedaços e seus tamanhos (medidos uma única vez)
+        current: deque[str] = deque()
+        lengths: deque[int] = deque()
+        total = 0
+
+        for split in splits:
+            split_len = length_function(split)
+            if total + split_len + (separator_len if current else 0) > self._chunk_size:
+                if total > self._chunk_size:
+                    logger.warning(
+                        "Chunk de tamanho %d criado, maior que o limite de %d",
+                        total,
+                        self._chunk_size,
+                    )
+                if current:
+                    doc = self._join_docs(list(current), separator)
+                    if doc is not None:
+                        docs.append(doc)
+                    # Descarta do início enquanto a janela passar do overlap
+                    # (ou enquanto o próximo pedaço não couber)
+                    while total > self._chunk_overlap or (
+                        total + split_len + (separator_len if current else 0) > self._chunk_size
+                        and total > 0
+                    ):
+                        total -= lengths.popleft() + (separator_len if len(current) > 1 else 0)
+                        current.popleft()
+
+            current.append(split)
+            lengths.append(split_len)
+            total += split_len + (separator_len if len(current) > 1 else 0)
+
+        doc = self._join_docs(list(current), separator)
+        if doc is not None:
+            docs.append(doc)
+        return docs
+
+    def create_documents(
+        self, texts: list[str], metadatas: list[dict[Any, Any]] | None = None
+    ) -> list[Document]:
+        if self._add_start_index:
+            # start_index depende do texto original: usa o caminho padrão
+            return super().create_documents(texts, metadatas)
+
+        metadatas = metadatas or [{}] * len(texts)
+        return [
+            Document(page_content=chunk, metadata=dict(metadata))
+            for text, metadata in zip(texts, metadatas, strict=True)
+            for chunk in self.split_text(text)
+        ]
@@ -5,9 +5,17 @@ Garante que os inputs dos agentes sejam validados antes de processar,
 evitando erros em runtime e fornecendo mensagens claras de erro.
 """
 
-from typing import Any
+from typing import Annotated, Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+# Textos obrigatórios: sem espaços nas pontas e não vazios. As restrições
+# são declarativas, então a validação roda inteira no pydantic-core.
+_PatientName = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1, max_length=200)
+]
+_Question = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=500)]
+_Message = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=1000)]
 
 
 class FollowupInput(BaseModel):
@@ -18,9 +26,7 @@ class FollowupInput(BaseModel):
     processar o workflow de reativação/acompanhamento.
     """
 
-    patient_name: str = Field(
-        ..., min_length=1, max_length=200, description="Nome do paciente (obrigatório)"
-    )
+    patient_name: _PatientName = Field(..., description="Nome do paciente (obrigatório)")
 
     days_inactive: int = Field(..., ge=0, description="Dias desde último contato (deve ser >= 0)")
 
@@ -32,24 +38,10 @@ class FollowupInput(BaseModel):
         default_factory=dict, description="Contexto adicional (clinic_type, service, etc)"
     )
 
-    @field_validator("days_inactive")
-    @classmethod
-    def validate_days_inactive(cls, v: int) -> int:
-        """Valida que days_inactive seja não-negativo."""
-        if v < 0:
-            raise ValueError("days_inactive must be >= 0")
-        return v
-
-    @field_validator("patient_name")
-    @classmethod
-    def validate_patient_name(cls, v: str) -> str:
-        """Valida que o nome não seja vazio ou apenas espaços."""
-        if not v or not v.strip():
-            raise ValueError("patient_name cannot be empty")
-        return v.strip()
-
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={
             "example": {
                 "patient_name": "João Silva",
                 "days_inactive": 45,
@@ -60,7 +52,8 @@ class FollowupInput(BaseModel):
                     "is_patient": True,
                 },
             }
-        }
+        },
+    )
 
 
 class RagQueryInput(BaseModel):
@@ -70,24 +63,19 @@ class RagQueryInput(BaseModel):
     Valida perguntas para busca RAG.
     """
 
-    question: str = Field(..., min_length=1, max_length=500, description="Pergunta do usuário")
+    question: _Question = Field(..., description="Pergunta do usuário")
 
     k_documents: int | None = Field(
         default=4, ge=1, le=10, description="Número de documentos a recuperar (1-10)"
     )
 
-    @field_validator("question")
-    @classmethod
-    def validate_question(cls, v: str) -> str:
-        """Valida que a pergunta não seja vazia."""
-        if not v or not v.strip():
-            raise ValueError("question cannot be empty")
-        return v.strip()
-
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={
             "example": {"question": "Qual o horário de funcionamento?", "k_documents": 4}
-        }
+        },
+    )
 
 
 class IntakeInput(BaseModel):
@@ -97,7 +85,7 @@ class IntakeInput(BaseModel):
     Valida mensagens para triagem inicial.
     """
 
-    message: str = Field(..., min_length=1, max_length=1000, description="Mensagem do paciente")
+    message: _Message = Field(..., description="Mensagem do paciente")
 
     user_id: str | None = Field(default=None, description="ID do usuário (opcional)")
 
@@ -107,20 +95,15 @@ class IntakeInput(BaseModel):
         default_factory=dict, description="Metadata adicional (phone, source, etc)"
     )
 
-    @field_validator("message")
-    @classmethod
-    def validate_message(cls, v: str) -> str:
-        """Valida que a mensagem não seja vazia."""
-        if not v or not v.strip():
-            raise ValueError("message cannot be empty")
-        return v.strip()
-
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={
             "example": {
                 "message": "Gostaria de agendar uma consulta",
                 "user_id": "patient_001",
                 "session_id": "session_123",
                 "metadata": {"phone": "+5511987654321", "source": "whatsapp"},
             }
-        }
+        },
+    )
@@ -6,7 +6,7 @@ Define os payloads de /invoke, /stream e outras rotas de agentes.
 
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from taskni_core.schema.metadata_schemas import RequestMetadata, ResponseMetadata
 
@@ -99,6 +99,13 @@ class AgentStreamRequest(BaseModel):
     )
 
 
+# Validadores pré-compilados dos payloads das rotas quentes. As rotas
+# validam os bytes do corpo direto com validate_json (parser JSON do
+# pydantic-core), sem passar pelo json.loads do FastAPI.
+INVOKE_ADAPTER = TypeAdapter(AgentInvokeRequest)
+STREAM_ADAPTER = TypeAdapter(AgentStreamRequest)
+
+
 class AgentListItem(BaseModel):
     """
     Item da lista de agentes disponíveis.
@@ -0,0 +1,77 @@
+"""
+Utilities para executar corrotinas a partir de código síncrono.
+
+Mantém um único event loop persistente rodando numa thread daemon, em vez de
+criar e destruir um loop novo a cada chamada com `asyncio.run()`.
+
+Vantagens:
+- Sem custo de setup/teardown de event loop por chamada
+- Funciona mesmo quando a thread chamadora já tem um loop rodando
+- Conexões HTTP dos clientes async permanecem vivas entre chamadas
+"""
+
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_thread: threading.Thread | None = None
+_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Retorna o event loop de background, criando-o no primeiro uso.
+
+    Returns:
+        Event loop rodando em uma thread daemon dedicada
+    """
+    global _loop, _loop_thread
+
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="taskni-sync-loop", daemon=True
+                )
+                thread.start()
+                _loop_thread = thread
+                _loop = loop
+
+    return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+    """
+    Executa uma corrotina e bloqueia até o resultado.
+
+    A corrotina roda no event loop de background compartilhado, então
+    pode ser chamada tanto de código puramente síncrono quanto de uma
+    thread que já tem um loop rodando (ex: dentro de um servidor async).
+
+    Args:
+        coro: Corrotina a executar
+        timeout: Timeout em segundos (None = sem limite)
+
+    Returns:
+        Resultado da corrotina
+
+    Raises:
+        RuntimeError: Se chamado de dentro do próprio loop de background
+            (causaria deadlock)
+    """
+    loop = _get_background_loop()
+
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError(
+            "run_sync() não pode ser chamado de dentro do loop de background. "
+            "Use 'await' diretamente."
+        )
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return future.result(timeout)
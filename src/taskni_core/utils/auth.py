@@ -4,8 +4,11 @@ Authentication utilities para proteger endpoints da API.
 Implementa autenticação via Bearer token simples mas segura.
 """
 
+import hashlib
+import hmac
 import logging
 import secrets
+from collections.abc import Iterable
 
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -31,24 +34,39 @@ class AuthManager:
     - Desabilitação (se nenhum token configurado)
     """
 
-    def __init__(self, api_token: str | None = None, api_tokens: str | None = None):
+    def __init__(
+        self,
+        api_token: str | None = None,
+        api_tokens: str | None = None,
+        tokens: Iterable[str] = (),
+    ):
         """
         Inicializa o gerenciador de autenticação.
 
         Args:
             api_token: Token único (API_TOKEN)
             api_tokens: Múltiplos tokens separados por vírgula (API_TOKENS)
+            tokens: Múltiplos tokens já separados (ex: API_TOKENS pré-processado)
         """
-        self.valid_tokens: set[str] = set()
+        valid_tokens: set[str] = set()
 
         # Adiciona token único
         if api_token:
-            self.valid_tokens.add(api_token.strip())
+            valid_tokens.add(api_token.strip())
 
         # Adiciona múltiplos tokens
         if api_tokens:
-            tokens = [t.strip() for t in api_tokens.split(",") if t.strip()]
-            self.valid_tokens.update(tokens)
+            valid_tokens.update(t.strip() for t in api_tokens.split(",") if t.strip())
+        valid_tokens.update(t.strip() for t in tokens if t.strip())
+
+        # Conjunto imutável: montado uma vez, só consultado por requisição
+        self.valid_tokens: frozenset[str] = frozenset(valid_tokens)
+
+        # SHA-256 de cada token válido: a verificação é um lookup O(1) em vez
+        # de comparar com cada token
+        self._digests: dict[bytes, bytes] = {
+            digest: digest for digest in map(_token_digest, self.valid_tokens)
+        }
 
         self.enabled = len(self.valid_tokens) > 0
 
@@ -63,7 +81,9 @@ class AuthManager:
         """
         Verifica se um token é válido.
 
-        Usa secrets.compare_digest() para prevenir timing attacks.
+        Compara o SHA-256 do token com os digests pré-calculados: o lookup não
+        depende do número de tokens e a confirmação usa hmac.compare_digest()
+        (tempo constante) para prevenir timing attacks.
 
         Args:
             token: Token a ser verificado
@@ -74,12 +94,9 @@ class AuthManager:
         if not self.enabled:
             return True  # Sem autenticação, sempre passa
 
-        # Compara com cada token válido usando timing-safe comparison
-        for valid_token in self.valid_tokens:
-            if secrets.compare_digest(token, valid_token):
-                return True
-
-        return False
+        digest = _token_digest(token)
+        expected = self._digests.get(digest)
+        return expected is not None and hmac.compare_digest(digest, expected)
 
     def require_auth(
         self, credentials: HTTPAuthorizationCredentials | None = Security(security_scheme)
@@ -114,14 +131,15 @@ class AuthManager:
         # Verifica se token é válido
         token = credentials.credentials
         if not self.verify_token(token):
-            logger.warning(f"❌ Token inválido tentado: {token[:10]}...")
+            logger.warning("❌ Token inválido tentado: %s...", token[:10])
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Token inválido ou expirado.",
             )
 
         # Token válido - permite acesso
-        logger.debug(f"✅ Acesso autorizado com token: {token[:10]}...")
+        # Formatação lazy: sem custo por requisição fora do nível DEBUG
+        logger.debug("✅ Acesso autorizado com token: %s...", token[:10])
 
     async def require_auth_async(
         self, credentials: HTTPAuthorizationCredentials | None = Security(security_scheme)
@@ -135,6 +153,11 @@ class AuthManager:
 # ============================================================================
 
 
+def _token_digest(token: str) -> bytes:
+    """SHA-256 de um token (base da verificação em AuthManager)."""
+    return hashlib.sha256(token.encode()).digest()
+
+
 def generate_secure_token(length: int = 32) -> str:
     """
     Gera um token seguro aleatório.
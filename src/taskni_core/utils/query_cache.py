@@ -0,0 +1,143 @@
+"""
+Cache LRU com TTL e thread-safe para respostas de agentes.
+
+O cache é dividido em shards (cada um com seu próprio RLock), então
+threads diferentes (ex: invoke_sync, threadpool do FastAPI) raramente
+disputam o mesmo lock.
+
+Uso:
+    cache = QueryCache(max_size=50, ttl_seconds=3600)
+    cache.put("chave", {"answer": "...", "sources": []})
+    cache.get("chave")  # -> dict ou None
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class _Shard:
+    """Um shard do cache: LRU com TTL protegido por um RLock."""
+
+    __slots__ = ("capacity", "entries", "lock", "hits", "misses", "evictions")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        # Estrutura: {key: (value, expires_at)}
+        self.entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class QueryCache:
+    """
+    Cache LRU com TTL, thread-safe e particionado em shards.
+
+    Cada chave vai para o shard `hash(key) % n_shards`; a capacidade total
+    é distribuída entre os shards, então o LRU é aproximado (por shard).
+    """
+
+    def __init__(self, max_size: int = 50, ttl_seconds: float | None = None, shards: int = 16):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_size: Número máximo de entradas (somando todos os shards)
+            ttl_seconds: Tempo de vida de cada entrada (None = sem expiração)
+            shards: Número de shards (limitado a max_size)
+        """
+        if max_size < 1:
+            raise ValueError("max_size deve ser >= 1")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        n_shards = max(1, min(shards, max_size))
+        base, extra = divmod(max_size, n_shards)
+        self._shards = [_Shard(base + (1 if i < extra else 0)) for i in range(n_shards)]
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def get(self, key: str) -> Any | None:
+        """
+        Busca uma entrada (e a marca como usada recentemente).
+
+        Args:
+            key: Chave da entrada
+
+        Returns:
+            Valor armazenado, ou None se ausente/expirado
+        """
+        shard = self._shard(key)
+
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del shard.entries[key]
+                shard.misses += 1
+                return None
+
+            shard.entries.move_to_end(key)
+            shard.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        """
+        Armazena uma entrada, removendo a menos usada se o shard estiver cheio.
+
+        Args:
+            key: Chave da entrada
+            value: Valor a armazenar
+        """
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        shard = self._shard(key)
+
+        with shard.lock:
+            if key in shard.entries:
+                shard.entries.move_to_end(key)
+            elif len(shard.entries) >= shard.capacity:
+                shard.entries.popitem(last=False)
+                shard.evictions += 1
+
+            shard.entries[key] = (value, expires_at)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def clear(self):
+        """Remove todas as entradas (mantém as estatísticas)."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Retorna estatísticas do cache.
+
+        Returns:
+            Dict com size, capacity, hits, misses, evictions e hit_rate
+        """
+        hits = sum(shard.hits for shard in self._shards)
+        misses = sum(shard.misses for shard in self._shards)
+        lookups = hits + misses
+
+        return {
+            "size": len(self),
+            "capacity": self.max_size,
+            "hits": hits,
+            "misses": misses,
+            "evictions": sum(shard.evictions for shard in self._shards),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
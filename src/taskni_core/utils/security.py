@@ -11,6 +11,32 @@ Inclui sanitização de inputs para prevenir:
 import re
 from typing import Any
 
+# Palavras-chave de prompt injection, compiladas uma única vez numa só
+# alternação (um scan por passada em vez de um re.sub por padrão).
+# Usa word boundaries para não afetar palavras normais
+_PROMPT_INJECTION_RE = re.compile(
+    "|".join(
+        [
+            r"\bignore\s+(?:all\s+)?(?:previous\s+)?instructions?\b",
+            r"\bdisregard\s+(?:all\s+)?(?:previous\s+)?instructions?\b",
+            r"\bforget\s+(?:all\s+)?(?:previous\s+)?instructions?\b",
+            r"\boverride\s+instructions?\b",
+            r"\bsystem\s*:\s*",  # Tentativa de injetar system message
+            r"\bassistant\s*:\s*",  # Tentativa de injetar assistant message
+            r"\buser\s*:\s*",  # Tentativa de injetar user message
+            r"\bprompt\s*:\s*",
+            r"\b(?:you\s+are|you\'re)\s+(?:now|currently)\b",  # "you are now..."
+            r"\bact\s+as\b",  # "act as..."
+            r"\bpretend\s+(?:to\s+be|you\s+are)\b",
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+_MULTI_NEWLINE_RE = re.compile(r"\n{3,}")
+_HORIZONTAL_SPACE_RE = re.compile(r"[ \t]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def sanitize_prompt_input(text: str, max_length: int = 200, allow_multiline: bool = False) -> str:
     """
@@ -52,26 +78,14 @@ def sanitize_prompt_input(text: str, max_length: int = 200, allow_multiline: boo
         text = " ".join(text.split())
     else:
         # Permite newlines mas remove múltiplos consecutivos
-        text = re.sub(r"\n{3,}", "\n\n", text)
+        text = _MULTI_NEWLINE_RE.sub("\n\n", text)
 
     # 3. Remove palavras-chave perigosas de prompt injection
-    # Usa word boundaries para não afetar palavras normais
-    dangerous_patterns = [
-        r"\bignore\s+(all\s+)?(previous\s+)?instructions?\b",
-        r"\bdisregard\s+(all\s+)?(previous\s+)?instructions?\b",
-        r"\bforget\s+(all\s+)?(previous\s+)?instructions?\b",
-        r"\boverride\s+instructions?\b",
-        r"\bsystem\s*:\s*",  # Tentativa de injetar system message
-        r"\bassistant\s*:\s*",  # Tentativa de injetar assistant message
-        r"\buser\s*:\s*",  # Tentativa de injetar user message
-        r"\bprompt\s*:\s*",
-        r"\b(you\s+are|you\'re)\s+(now|currently)\b",  # "you are now..."
-        r"\bact\s+as\b",  # "act as..."
-        r"\bpretend\s+(to\s+be|you\s+are)\b",
-    ]
-
-    for pattern in dangerous_patterns:
-        text = re.sub(pattern, " ", text, flags=re.IGNORECASE)
+    # Repete enquanto houver remoções: tirar um trecho pode juntar outro
+    # padrão (ex: "act system: as" -> "act as")
+    text, removed = _PROMPT_INJECTION_RE.subn(" ", text)
+    while removed:
+        text, removed = _PROMPT_INJECTION_RE.subn(" ", text)
 
     # 4. Remove caracteres perigosos específicos
     dangerous_chars = [
@@ -84,10 +98,10 @@ def sanitize_prompt_input(text: str, max_length: int = 200, allow_multiline: boo
     # 5. Normaliza espaços múltiplos (mas preserva newlines se allow_multiline)
     if allow_multiline:
         # Normaliza espaços horizontais mas preserva newlines
-        text = re.sub(r"[ \t]+", " ", text)
+        text = _HORIZONTAL_SPACE_RE.sub(" ", text)
     else:
         # Remove todos os tipos de espaços múltiplos
-        text = re.sub(r"\s+", " ", text)
+        text = _WHITESPACE_RE.sub(" ", text)
 
     # 6. Remove espaços nas pontas
     text = text.strip()
@@ -0,0 +1,61 @@
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+# Sem telemetria do ChromaDB (tenta acessar a rede a cada coleção criada)
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+
+def _vector(text: str) -> list[float]:
+    digest = hashlib.sha256(text.encode()).digest()
+    return [byte / 255 for byte in digest[:8]]
+
+
+class PrefixEmbeddings(Embeddings):
+    """
+    Embeddings determinísticos que, como o OllamaEmbeddings, usam prefixos
+    diferentes para consultas e documentos.
+    """
+
+    def __init__(self):
+        self.document_calls: list[list[str]] = []
+        self.query_calls: list[str] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.document_calls.append(list(texts))
+        return [_vector(f"passage: {text}") for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.query_calls.append(text)
+        return _vector(f"query: {text}")
+
+
+@pytest.fixture
+def embeddings():
+    return PrefixEmbeddings()
+
+
+@pytest.fixture
+def ingestion(tmp_path, embeddings):
+    """DocumentIngestion numa coleção temporária, com PrefixEmbeddings."""
+    from taskni_core.rag.ingest import DocumentIngestion
+
+    with patch.object(DocumentIngestion, "_get_embeddings", return_value=embeddings):
+        yield DocumentIngestion(
+            persist_directory=str(tmp_path / "chroma"),
+            collection_name="test_docs",
+            chunk_size=200,
+            chunk_overlap=0,
+        )
+
+
+@pytest.fixture
+def pipeline(ingestion, monkeypatch):
+    """Faz get_ingestion_pipeline (usado pelos jobs de ingestão) devolver `ingestion`."""
+    from taskni_core.rag import ingest
+
+    monkeypatch.setattr(ingest, "get_ingestion_pipeline", lambda: ingestion)
+    return ingestion
@@ -0,0 +1,112 @@
+import pytest
+from langchain_core.messages import AIMessage
+
+from taskni_core.agents.advanced.followup_agent import FollowupAgent
+from taskni_core.agents.registry import AgentRegistry
+
+
+class FakeLLM:
+    """LLM que sempre responde o mesmo texto (sem rede)."""
+
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.calls = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        return AIMessage(content=self.reply)
+
+
+class InvokeOnlyAgent:
+    """Agente sem run_stream nem astream: só ainvoke."""
+
+    async def ainvoke(self, input_state):
+        return {"messages": [AIMessage(content=f"eco: {input_state['messages'][0]['content']}")]}
+
+
+def _followup_context(**custom):
+    return {"metadata": {"custom": custom}}
+
+
+@pytest.fixture
+def followup_agent():
+    agent = FollowupAgent(message_cache_size=0)
+    agent.llm = agent.llm_large = FakeLLM("Olá João! Sentimos sua falta.")
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_followup_agent_streams(followup_agent):
+    registry = AgentRegistry()
+    registry.register(followup_agent, agent_id=followup_agent.id)
+
+    streamer = registry.get_streamer(followup_agent.id)
+    chunks = [
+        chunk
+        async for chunk in streamer(
+            "Obrigado pelo atendimento!", _followup_context(patient_name="João", days_inactive=45)
+        )
+    ]
+
+    assert "".join(chunks) == "Olá João! Sentimos sua falta."
+
+
+@pytest.mark.asyncio
+async def test_followup_agent_reuses_cached_message():
+    agent = FollowupAgent(message_cache_size=10)
+    agent.llm = agent.llm_large = llm = FakeLLM("Olá João! Sentimos sua falta.")
+    registry = AgentRegistry()
+    registry.register(agent, agent_id=agent.id)
+    streamer = registry.get_streamer(agent.id)
+    context = _followup_context(patient_name="João", days_inactive=45)
+
+    for _ in range(2):
+        chunks = [chunk async for chunk in streamer("Obrigado!", context)]
+        assert "".join(chunks) == "Olá João! Sentimos sua falta."
+
+    assert llm.calls == 1
+
+
+def test_followup_agent_stream_rejects_missing_patient_data(followup_agent):
+    registry = AgentRegistry()
+    registry.register(followup_agent, agent_id=followup_agent.id)
+
+    streamer = registry.get_streamer(followup_agent.id)
+    # Validado na chamada, antes de o stream começar
+    with pytest.raises(ValueError, match="days_inactive, patient_name"):
+        streamer("oi", {})
+
+
+@pytest.mark.asyncio
+async def test_agent_without_streaming_yields_invoker_reply():
+    registry = AgentRegistry()
+    registry.register(InvokeOnlyAgent(), agent_id="invoke-only")
+
+    chunks = [chunk async for chunk in registry.get_streamer("invoke-only")("oi", {})]
+
+    assert chunks == ["eco: oi"]
+
+
+def test_get_streamer_unknown_agent():
+    with pytest.raises(ValueError, match="não encontrado"):
+        AgentRegistry().get_streamer("nope")
+
+
+def test_get_invoker_disabled_agent():
+    registry = AgentRegistry()
+    registry.register(InvokeOnlyAgent(), agent_id="invoke-only", enabled=False)
+
+    with pytest.raises(ValueError, match="desabilitado"):
+        registry.get_invoker("invoke-only")
+    with pytest.raises(ValueError, match="desabilitado"):
+        registry.get_streamer("invoke-only")
+
+
+@pytest.mark.asyncio
+async def test_invoke_dispatches_to_langgraph_agent():
+    registry = AgentRegistry()
+    registry.register(InvokeOnlyAgent(), agent_id="invoke-only")
+
+    assert await registry.invoke("invoke-only", "oi", {}) == "eco: oi"
+    with pytest.raises(ValueError, match="não encontrado"):
+        await registry.invoke("nope", "oi", {})
@@ -0,0 +1,62 @@
+import itertools
+
+import pytest
+
+from taskni_core.rag import embedding_cache
+from taskni_core.rag.embedding_cache import CachedEmbeddings
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """Relógio que avança a cada leitura (ordem LRU determinística)."""
+    ticks = itertools.count()
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(ticks)))
+
+
+def _cache(tmp_path, embeddings, **kwargs):
+    return CachedEmbeddings(embeddings, str(tmp_path / "emb_cache.db"), **kwargs)
+
+
+def test_cached_vectors_skip_the_provider(tmp_path, embeddings):
+    cache = _cache(tmp_path, embeddings)
+
+    first = cache.embed_documents(["a", "b", "a"])
+    second = cache.embed_documents(["b", "a"])
+    cache.embed_query("a")
+    cache.embed_query("a")
+
+    # Vetores guardados em float32
+    assert second[0] == pytest.approx(first[1], rel=1e-6)
+    assert second[1] == pytest.approx(first[0], rel=1e-6)
+
+    assert embeddings.document_calls == [["a", "b"]]
+    assert embeddings.query_calls == ["a"]
+
+
+def test_query_entries_are_evicted_lru(tmp_path, embeddings):
+    cache = _cache(tmp_path, embeddings, max_query_entries=2)
+
+    cache.embed_query("q1")
+    cache.embed_query("q2")
+    cache.embed_query("q1")  # q2 passa a ser a menos usada
+    cache.embed_query("q3")
+    embeddings.query_calls.clear()
+
+    cache.embed_query("q1")
+    cache.embed_query("q3")
+    assert embeddings.query_calls == []
+
+    cache.embed_query("q2")
+    assert embeddings.query_calls == ["q2"]
+
+
+def test_document_entries_are_not_capped(tmp_path, embeddings):
+    cache = _cache(tmp_path, embeddings, max_query_entries=1)
+
+    cache.embed_documents(["a", "b", "c"])
+    cache.embed_query("q1")
+    cache.embed_query("q2")
+    embeddings.document_calls.clear()
+
+    cache.embed_documents(["a", "b", "c"])
+    assert embeddings.document_calls == []
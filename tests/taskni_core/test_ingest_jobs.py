@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+import pytest_asyncio
+
+from taskni_core.rag.ingest_jobs import JOB_ID_METADATA_KEY, IngestionJobQueue
+
+TEXT = "O horário de atendimento é das 8h às 18h. Aceitamos os convênios Unimed e Bradesco."
+
+
+@pytest_asyncio.fixture
+async def queue(pipeline):
+    job_queue = IngestionJobQueue(workers=1)
+    job_queue.start()
+    yield job_queue
+    await job_queue.stop()
+
+
+async def _wait_for(job, *statuses):
+    while job.status not in statuses:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_job_goes_from_queued_to_running_to_done(queue, pipeline, monkeypatch):
+    release = threading.Event()
+    ingest_text_direct = pipeline.ingest_text_direct
+
+    def blocked_ingest(**kwargs):
+        release.wait(timeout=5)
+        return ingest_text_direct(**kwargs)
+
+    monkeypatch.setattr(pipeline, "ingest_text_direct", blocked_ingest)
+
+    job = queue.submit_text(TEXT, metadata={"category": "faq"})
+    assert job.status == "queued"
+
+    await asyncio.wait_for(_wait_for(job, "running"), timeout=5)
+    release.set()
+    await asyncio.wait_for(_wait_for(job, "done", "failed"), timeout=5)
+
+    assert job.status == "done"
+    assert job.error is None
+    assert job.chunks_count == pipeline.count_documents({JOB_ID_METADATA_KEY: job.id}) > 0
+    assert job.text is None  # Payload descartado ao terminar
+    assert queue.get(job.id) is job
+
+
+@pytest.mark.asyncio
+async def test_failed_job_removes_partial_vectors(queue, pipeline, monkeypatch):
+    ingest_chunks = pipeline.ingest_chunks
+
+    def ingest_half_then_fail(texts, **kwargs):
+        ingest_chunks(texts=texts[: len(texts) // 2], **kwargs)
+        raise RuntimeError("embeddings fora do ar")
+
+    monkeypatch.setattr(pipeline, "ingest_chunks", ingest_half_then_fail)
+
+    job = queue.submit_chunks(["chunk 1", "chunk 2", "chunk 3", "chunk 4"])
+    await asyncio.wait_for(_wait_for(job, "done", "failed"), timeout=5)
+
+    assert job.status == "failed"
+    assert job.error == "Erro ao ingerir documento"
+    assert job.chunks_count is None
+    assert pipeline.count_documents({JOB_ID_METADATA_KEY: job.id}) == 0
+
+
+@pytest.mark.asyncio
+async def test_duplicate_content_is_not_reingested(queue, pipeline):
+    first = queue.submit_text(TEXT, content_hash="abc")
+    second = queue.submit_text(TEXT, content_hash="abc")
+    await asyncio.wait_for(_wait_for(second, "done", "failed"), timeout=5)
+
+    assert first.status == second.status == "done"
+    assert not first.duplicate
+    assert second.duplicate
+    assert second.chunks_count == first.chunks_count
+    assert pipeline.count_documents({JOB_ID_METADATA_KEY: second.id}) == 0
+
+
+def test_submit_requires_started_queue():
+    with pytest.raises(RuntimeError, match="não iniciada"):
+        IngestionJobQueue().submit_text(TEXT)
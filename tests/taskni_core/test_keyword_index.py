@@ -0,0 +1,88 @@
+from langchain_core.documents import Document
+
+from taskni_core.rag.keyword_index import KeywordIndex, reciprocal_rank_fusion
+
+
+def _docs(*texts):
+    return [Document(page_content=text) for text in texts]
+
+
+def test_search_ranks_by_bm25(ingestion):
+    ingestion.ingest_chunks(
+        [
+            "Aceitamos os convênios Unimed e Bradesco.",
+            "O horário de atendimento é das 8h às 18h.",
+            "A consulta de retorno é gratuita em até 30 dias.",
+        ]
+    )
+    index = KeywordIndex(ingestion)
+
+    docs = index.search("quais convênios vocês aceitam", k=3)
+
+    assert [doc.page_content for doc in docs] == ["Aceitamos os convênios Unimed e Bradesco."]
+
+
+def test_index_is_rebuilt_when_collection_changes(ingestion):
+    ingestion.ingest_chunks(["O horário de atendimento é das 8h às 18h."])
+    index = KeywordIndex(ingestion)
+    assert index.search("botox") == []
+
+    ingestion.ingest_chunks(["Fazemos aplicação de botox às sextas."])
+
+    assert [doc.page_content for doc in index.search("botox")] == [
+        "Fazemos aplicação de botox às sextas."
+    ]
+
+
+def test_search_uses_a_single_snapshot(ingestion):
+    ingestion.ingest_chunks(["O horário de atendimento é das 8h às 18h."])
+    index = KeywordIndex(ingestion)
+    old = index._ensure_built()
+
+    ingestion.ingest_chunks(["Aceitamos o convênio Unimed.", "Estacionamento gratuito."])
+    new = index._ensure_built()
+
+    # A reconstrução publica um snapshot novo; o antigo continua íntegro
+    assert new is not old
+    assert len(old.docs) == len(old.norm) == 1
+    assert len(new.docs) == len(new.norm) == 3
+    assert index._ensure_built() is new
+
+
+def test_rrf_ranks_documents_found_by_both_searches_first():
+    dense = _docs("a", "b", "c")
+    sparse = _docs("c", "a")
+
+    # a: 1/61 + 1/62, c: 1/63 + 1/61, b: 1/62
+    fused = reciprocal_rank_fusion([dense, sparse], k=3)
+
+    assert [doc.page_content for doc in fused] == ["a", "c", "b"]
+
+
+def test_rrf_keeps_first_metadata_and_truncates_to_k():
+    dense = [Document(page_content="a", metadata={"rank": "dense"}), *_docs("b")]
+    sparse = [Document(page_content="a", metadata={"rank": "sparse"}), *_docs("c")]
+
+    fused = reciprocal_rank_fusion([dense, sparse], k=1)
+
+    assert fused == [dense[0]]
+
+
+def test_hybrid_fusion_promotes_exact_keyword_match(ingestion):
+    ingestion.ingest_chunks(
+        [
+            "O horário de atendimento é das 8h às 18h.",
+            "A clínica fica na Rua das Flores, 100.",
+            "Aplicação de toxina botulínica às sextas.",
+        ]
+    )
+    question = "vocês fazem toxina botulínica?"
+
+    dense = ingestion.search(question, k=3)
+    sparse = KeywordIndex(ingestion).search(question, k=3)
+    fused = reciprocal_rank_fusion([dense, sparse], k=3)
+
+    # Só a busca densa não garante o termo exato; o BM25 puxa o documento pro topo
+    assert [doc.page_content for doc in sparse] == ["Aplicação de toxina botulínica às sextas."]
+    assert fused[0].page_content == "Aplicação de toxina botulínica às sextas."
+    assert {doc.page_content for doc in fused} == {doc.page_content for doc in dense}
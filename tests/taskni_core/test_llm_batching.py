@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from taskni_core.core.llm_batching import BatchedLLMClient, get_shared_batched_llm
+from taskni_core.core.llm_provider import get_shared_llm
+
+
+class FakeMultiProviderLLM:
+    """
+    Imita o MultiProviderLLM: responde "resposta: <pergunta>" e falha nas
+    perguntas em `failing` (no batch e, se `fail_on_retry`, também no ainvoke).
+    """
+
+    def __init__(self, failing=(), fail_on_retry=False, batch_error=None):
+        self.failing = set(failing)
+        self.fail_on_retry = fail_on_retry
+        self.batch_error = batch_error
+        self.batches: list[list[str]] = []
+        self.single_calls: list[str] = []
+
+    @staticmethod
+    def _question(messages):
+        return messages[-1]["content"]
+
+    async def ainvoke_batch(self, inputs, max_concurrency=10, **kwargs):
+        self.batches.append([self._question(messages) for messages in inputs])
+        if self.batch_error is not None:
+            raise self.batch_error
+        return [
+            ValueError(f"falhou: {question}")
+            if question in self.failing
+            else f"resposta: {question}"
+            for question in map(self._question, inputs)
+        ]
+
+    async def ainvoke(self, messages, **kwargs):
+        question = self._question(messages)
+        self.single_calls.append(question)
+        if self.fail_on_retry and question in self.failing:
+            raise ValueError(f"falhou de novo: {question}")
+        return f"resposta: {question}"
+
+
+def _messages(question, system="Você é um assistente."):
+    return [{"role": "system", "content": system}, {"role": "user", "content": question}]
+
+
+async def _invoke_all(client, questions, system="Você é um assistente."):
+    return await asyncio.gather(
+        *(client.ainvoke(_messages(question, system)) for question in questions),
+        return_exceptions=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_each_caller_gets_its_own_result():
+    llm = FakeMultiProviderLLM()
+    client = BatchedLLMClient(llm, batch_window_ms=5)
+
+    results = await _invoke_all(client, ["a", "b", "c"])
+
+    assert results == ["resposta: a", "resposta: b", "resposta: c"]
+    assert llm.batches == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_dispatched_before_the_window():
+    llm = FakeMultiProviderLLM()
+    # Janela longa: só o max_batch dispara o despacho a tempo
+    client = BatchedLLMClient(llm, batch_window_ms=10_000, max_batch=2)
+
+    results = await asyncio.wait_for(_invoke_all(client, ["a", "b"]), timeout=1)
+
+    assert results == ["resposta: a", "resposta: b"]
+
+
+@pytest.mark.asyncio
+async def test_failed_item_is_retried_alone():
+    llm = FakeMultiProviderLLM(failing={"b"})
+    client = BatchedLLMClient(llm, batch_window_ms=5)
+
+    results = await _invoke_all(client, ["a", "b", "c"])
+
+    assert results == ["resposta: a", "resposta: b", "resposta: c"]
+    assert llm.single_calls == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_exception_is_delivered_only_to_its_caller():
+    llm = FakeMultiProviderLLM(failing={"b"}, fail_on_retry=True)
+    client = BatchedLLMClient(llm, batch_window_ms=5)
+
+    results = await _invoke_all(client, ["a", "b", "c"])
+
+    assert results[0] == "resposta: a"
+    assert isinstance(results[1], ValueError)
+    assert str(results[1]) == "falhou de novo: b"
+    assert results[2] == "resposta: c"
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_per_item():
+    llm = FakeMultiProviderLLM(batch_error=RuntimeError("provider fora do ar"))
+    client = BatchedLLMClient(llm, batch_window_ms=5)
+
+    results = await _invoke_all(client, ["a", "b"])
+
+    assert results == ["resposta: a", "resposta: b"]
+    assert sorted(llm.single_calls) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_keyed_on_system_prompt():
+    llm = FakeMultiProviderLLM()
+    client = BatchedLLMClient(llm, batch_window_ms=5)
+
+    results = await asyncio.gather(
+        client.ainvoke(_messages("a", system="prompt 1")),
+        client.ainvoke(_messages("b", system="prompt 2")),
+        client.ainvoke(_messages("c", system="prompt 1")),
+    )
+
+    assert results == ["resposta: a", "resposta: b", "resposta: c"]
+    assert llm.batches == [["a", "c"]]
+    assert llm.single_calls == ["b"]
+
+
+def test_agents_share_one_batched_client_per_llm():
+    from taskni_core.agents.advanced.followup_agent import FollowupAgent
+
+    first, second = FollowupAgent(), FollowupAgent()
+
+    # Mesma janela de batching para todas as instâncias
+    assert first.llm is second.llm is get_shared_batched_llm(enable_streaming=False)
+    assert first.llm.llm is get_shared_llm(enable_streaming=False)
+    assert first.llm_large is second.llm_large
+    assert first.llm_large is get_shared_batched_llm(enable_streaming=False, model_tier="large")
@@ -0,0 +1,69 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from taskni_core.core.llm_provider import MultiProviderLLM
+
+
+class SlowChat:
+    """Chat model que demora `delay` segundos para responder."""
+
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self.delay = delay
+        self.calls = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return AIMessage(content=f"{self.name}: resposta")
+
+    async def astream(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        yield AIMessageChunk(content=f"{self.name}: resposta")
+
+
+def _llm(*chats, hedge_delay=0.05):
+    providers = [
+        {"name": chat.name, "model": None, "priority": i, "fast": True, "llm": chat}
+        for i, chat in enumerate(chats, 1)
+    ]
+    with patch.object(MultiProviderLLM, "_initialize_providers", return_value=providers):
+        return MultiProviderLLM(hedge_delay=hedge_delay)
+
+
+MESSAGES = [{"role": "user", "content": "oi"}]
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_does_not_hedge_slow_generations():
+    primary, secondary = SlowChat("Groq", delay=0.2), SlowChat("OpenAI", delay=0)
+
+    response = await _llm(primary, secondary).ainvoke(MESSAGES)
+
+    assert response.content == "Groq: resposta"
+    assert secondary.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_astream_hedges_slow_first_chunk():
+    primary, secondary = SlowChat("Groq", delay=1), SlowChat("OpenAI", delay=0)
+
+    chunks = [chunk async for chunk in _llm(primary, secondary).astream(MESSAGES)]
+
+    assert chunks == ["OpenAI: resposta"]
+    assert primary.calls == secondary.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_astream_without_hedge_delay_waits_for_primary():
+    primary, secondary = SlowChat("Groq", delay=0.1), SlowChat("OpenAI", delay=0)
+
+    llm = _llm(primary, secondary, hedge_delay=None)
+    chunks = [chunk async for chunk in llm.astream(MESSAGES)]
+
+    assert chunks == ["Groq: resposta"]
+    assert secondary.calls == 0
@@ -0,0 +1,49 @@
+import pytest
+from langchain_core.documents import Document
+
+
+def test_embed_queries_matches_embed_query(ingestion, embeddings):
+    queries = ["Qual o horário?", "Aceitam convênio?"]
+
+    assert ingestion.embed_queries(queries) == [ingestion.embed_query(q) for q in queries]
+    assert ingestion.embed_queries([queries[0]]) == [embeddings.embed_query(queries[0])]
+    # Consultas nunca passam pelo embedding de documentos
+    assert embeddings.document_calls == []
+
+
+def test_duplicate_chunks_keep_scalar_metadata(ingestion):
+    footer = "Clínica Exemplo - todos os direitos reservados"
+    chunks = [
+        Document(page_content=footer, metadata={"page": 0, "source": "faq.pdf"}),
+        Document(page_content="Horário: 8h às 18h", metadata={"page": 1, "source": "faq.pdf"}),
+        Document(page_content=footer, metadata={"page": 3, "source": "faq.pdf"}),
+        Document(page_content=footer, metadata={"page": 7, "source": "faq.pdf"}),
+    ]
+
+    assert ingestion._add_documents(chunks, batch_size=64) == 2
+
+    data = ingestion.vectorstore._collection.get(where={"page": 0}, include=["metadatas"])
+    assert data["metadatas"] == [{"page": 0, "source": "faq.pdf", "dup_page": "[0, 3, 7]"}]
+
+
+@pytest.mark.asyncio
+async def test_async_ingestion_logs_every_stage_error(ingestion, embeddings, tmp_path, caplog):
+    paths = []
+    for name in ("a.txt", "b.txt"):
+        path = tmp_path / name
+        path.write_text(f"Conteúdo do arquivo {name}")
+        paths.append(str(path))
+
+    async def fail(texts):
+        raise RuntimeError("embeddings fora do ar")
+
+    embeddings.aembed_documents = fail
+
+    with pytest.raises(RuntimeError, match="fora do ar") as excinfo:
+        await ingestion.ingest_files_async(paths, batch_size=1)
+
+    group = excinfo.value.__cause__
+    assert isinstance(group, ExceptionGroup)
+    logged = [r for r in caplog.records if r.getMessage().startswith("Erro ")]
+    assert len(logged) == len(group.exceptions)
+    assert ingestion.vectorstore._collection.count() == 0
@@ -0,0 +1,84 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from slowapi import _rate_limit_exceeded_handler  # type: ignore
+from slowapi.errors import RateLimitExceeded  # type: ignore
+
+from taskni_core.agents.advanced.followup_agent import FollowupAgent
+from taskni_core.agents.registry import AgentRegistry
+from taskni_core.api import routes_agents
+from taskni_core.api.routes_agents import MAX_BATCH_SIZE, limiter, router
+
+
+class EchoNameLLM:
+    """LLM sem rede: responde com a linha do nome do paciente no prompt."""
+
+    async def ainvoke(self, messages, **kwargs):
+        name = next(
+            line for line in messages[-1]["content"].splitlines() if line.startswith("Nome")
+        )
+        return AIMessage(content=f"Olá! ({name})")
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.include_router(router, prefix="/agents")
+
+    limiter.reset()
+    yield TestClient(app)
+    limiter.reset()
+
+
+def _payload(message="oi"):
+    return {"agent_id": "inexistente", "message": message}
+
+
+def test_batch_items_count_against_invoke_limit(client):
+    # Cada mensagem do lote consome uma invocação do limite compartilhado
+    response = client.post("/agents/invoke/batch", json=[_payload()] * MAX_BATCH_SIZE)
+    assert response.status_code == 404
+
+    response = client.post("/agents/invoke", json=_payload())
+    assert response.status_code == 429
+
+
+def test_oversized_batch_is_rejected_without_consuming_limit(client):
+    response = client.post("/agents/invoke/batch", json=[_payload()] * (MAX_BATCH_SIZE + 1))
+    assert response.status_code == 400
+
+    response = client.post("/agents/invoke", json=_payload())
+    assert response.status_code == 404
+
+
+def test_invoke_validates_body(client):
+    response = client.post("/agents/invoke", json={"agent_id": "inexistente"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "message"]
+
+
+def test_batch_invokes_followup_agent(client, monkeypatch):
+    agent = FollowupAgent(message_cache_size=0)
+    agent.llm = agent.llm_large = EchoNameLLM()
+    registry = AgentRegistry()
+    registry.register(agent, agent_id=agent.id)
+    monkeypatch.setattr(routes_agents, "agent_registry", registry)
+
+    payloads = [
+        {
+            "agent_id": agent.id,
+            "message": "Obrigado!",
+            "metadata": {"custom": {"patient_name": name, "days_inactive": 45}},
+        }
+        for name in ("Ana", "Bruno")
+    ]
+    response = client.post("/agents/invoke/batch", json=payloads)
+
+    assert response.status_code == 200
+    replies = [item["reply"] for item in response.json()]
+    assert "Ana" in replies[0]
+    assert "Bruno" in replies[1]
@@ -0,0 +1,105 @@
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from slowapi import _rate_limit_exceeded_handler  # type: ignore
+from slowapi.errors import RateLimitExceeded  # type: ignore
+
+from taskni_core.api import routes_rag
+from taskni_core.rag.ingest_jobs import IngestionJobQueue
+
+FAQ = "Aceitamos os convênios Unimed e Bradesco. O horário é das 8h às 18h."
+
+
+@pytest.fixture
+def client(pipeline, monkeypatch):
+    job_queue = IngestionJobQueue(workers=1)
+    monkeypatch.setattr(routes_rag, "ingest_job_queue", job_queue)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        job_queue.start()
+        yield
+        await job_queue.stop()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.limiter = routes_rag.limiter
+    app.state.pipeline = pipeline
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.include_router(routes_rag.router, prefix="/rag")
+
+    routes_rag.limiter.reset()
+    with TestClient(app) as test_client:
+        yield test_client
+    routes_rag.limiter.reset()
+
+
+def _wait_for_job(client, job_id):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        job = client.get(f"/rag/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} não terminou")
+
+
+def test_ingest_text_is_queued_then_duplicate(client):
+    response = client.post("/rag/ingest/text", json={"text": FAQ})
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+
+    job = _wait_for_job(client, body["job_id"])
+    assert job["status"] == "done"
+    assert job["chunks_count"] > 0
+
+    response = client.post("/rag/ingest/text", json={"text": FAQ})
+    assert response.status_code == 200
+    assert response.json()["status"] == "duplicate"
+    assert response.json()["job_id"] is None
+    assert response.json()["chunks_count"] == job["chunks_count"]
+
+
+def test_ingest_chunks_is_queued(client):
+    response = client.post("/rag/ingest/text", json={"chunks": ["chunk 1", " ", "chunk 2"]})
+    assert response.status_code == 202
+
+    job = _wait_for_job(client, response.json()["job_id"])
+    assert job["chunks_count"] == 2
+
+
+def test_ingest_text_rejects_empty_text(client):
+    response = client.post("/rag/ingest/text", json={"text": "   "})
+    assert response.status_code == 400
+
+
+def test_upload_is_queued_then_duplicate(client):
+    files = {"file": ("faq.txt", FAQ.encode(), "text/plain")}
+
+    response = client.post("/rag/upload", files=files)
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+    assert body["filename"] == "faq.txt"
+    assert body["file_size"] == len(FAQ.encode())
+
+    job = _wait_for_job(client, body["job_id"])
+    assert job["status"] == "done"
+    assert job["source"] == "faq.txt"
+
+    response = client.post("/rag/upload", files=files)
+    assert response.status_code == 200
+    assert response.json()["status"] == "duplicate"
+    assert response.json()["chunks_count"] == job["chunks_count"]
+
+
+def test_upload_rejects_unsupported_extension(client):
+    response = client.post("/rag/upload", files={"file": ("faq.exe", b"MZ", "text/plain")})
+    assert response.status_code == 400
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/rag/jobs/inexistente").status_code == 404
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from taskni_core.rag.text_splitter import FastRecursiveSplitter
+
+SEPARATORS = ["\n\n", "\n", " ", ""]
+WORDS = ["consulta", "retorno", "convênio", "botox", "8h", "R$", "a", "horário", "atendimento"]
+
+
+def _random_text(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 120)):
+        if rng.random() < 0.05:
+            # Palavras maiores que o chunk forçam a divisão por caractere
+            parts.append("x" * rng.randint(20, 300))
+        else:
+            parts.append(rng.choice(WORDS))
+        parts.append(rng.choice([" ", " ", " ", "\n", "\n\n", "  ", ""]))
+    return "".join(parts)
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_recursive_character_splitter(seed):
+    rng = random.Random(seed)
+    chunk_size = rng.randint(5, 200)
+    chunk_overlap = rng.randint(0, chunk_size - 1)
+    kwargs = {
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "separators": SEPARATORS,
+        "keep_separator": rng.choice([True, False]),
+        "strip_whitespace": rng.choice([True, False]),
+    }
+    text = _random_text(rng)
+
+    expected = RecursiveCharacterTextSplitter(**kwargs).split_text(text)
+
+    assert FastRecursiveSplitter(**kwargs).split_text(text) == expected
+
+
+def test_create_documents_copies_metadata():
+    splitter = FastRecursiveSplitter(chunk_size=10, chunk_overlap=0)
+    metadata = {"source": "faq.txt"}
+
+    docs = splitter.create_documents(["uma frase bem mais longa que dez"], [metadata])
+
+    assert len(docs) > 1
+    assert all(doc.metadata == metadata for doc in docs)
+    assert docs[0].metadata is not docs[1].metadata
+    assert docs[0].metadata is not metadata